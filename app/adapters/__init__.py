@@ -1 +1,79 @@
 # Adapters package for external data sources
+import asyncio
+import contextvars
+import importlib
+import inspect
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+from ..config import settings
+from ..metrics import ADAPTER_CALL_SECONDS, ADAPTER_ERRORS
+from ..profiling import checkpoint
+
+AdapterResult = Optional[Dict[str, Any]]
+
+# Sources fetched for every brief; each is the adapter module of the same name in this package.
+INGEST_SOURCES = ("county", "listing", "hoa")
+
+
+def load_adapter(source_name: str, attr: str = "fetch") -> Callable:
+    """The adapter module's `fetch` (or `afetch`), importing the module on first use.
+
+    Startup never imports the adapters (or opens their fixture files); the
+    first ingest or refresh in a worker does.
+    """
+    return getattr(importlib.import_module(f"{__name__}.{source_name}"), attr)
+
+
+def fetch_source(source_name: str, adapter_func: Callable[[str], AdapterResult], normalized_address: str) -> AdapterResult:
+    """Call an adapter, recording its latency and any error under `source_name`."""
+    checkpoint()
+    with ADAPTER_CALL_SECONDS.time(adapter=source_name):
+        try:
+            if settings.MOCK_ADAPTER_LATENCY_MS:
+                time.sleep(settings.MOCK_ADAPTER_LATENCY_MS / 1000)
+            return adapter_func(normalized_address)
+        except Exception:
+            ADAPTER_ERRORS.inc(adapter=source_name)
+            raise
+
+
+# Shared pool for deadline-bound ingests; stragglers keep running here after the response.
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def adapter_pool() -> ThreadPoolExecutor:
+    """The process-wide adapter pool, created by the first deadline-bound ingest."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=settings.ADAPTER_POOL_SIZE, thread_name_prefix="adapter")
+    return _pool
+
+
+def submit_source(source_name: str, adapter_func: Callable[[str], AdapterResult], normalized_address: str) -> "Future[AdapterResult]":
+    """fetch_source on the adapter pool, with the caller's context (deadline, request stats)."""
+    context = contextvars.copy_context()
+    return adapter_pool().submit(context.run, fetch_source, source_name, adapter_func, normalized_address)
+
+
+async def afetch_source(
+    source_name: str,
+    adapter_func: Callable[[str], Union[AdapterResult, Awaitable[AdapterResult]]],
+    normalized_address: str,
+) -> AdapterResult:
+    """Async fetch_source: awaits async adapters without tying up a thread."""
+    with ADAPTER_CALL_SECONDS.time(adapter=source_name):
+        try:
+            if settings.MOCK_ADAPTER_LATENCY_MS:
+                await asyncio.sleep(settings.MOCK_ADAPTER_LATENCY_MS / 1000)
+            result = adapter_func(normalized_address)
+            if inspect.isawaitable(result):
+                result = await result
+            return result
+        except Exception:
+            ADAPTER_ERRORS.inc(adapter=source_name)
+            raise
@@ -0,0 +1,276 @@
+# app/adapters/fixtures.py
+"""
+Data-file-backed adapter fixtures for load and performance tests.
+
+When ADAPTER_FIXTURE_PATH is set, the county, listing, HOA and neighborhood
+adapters answer from a generated fixture file instead of their built-in
+three-address samples. The file is memory-mapped once per process. Lookups
+hash the normalized address into an open-addressing slot table and read
+the payload straight from the mapping, so a lookup costs a few probes and
+one json.loads, whatever the number of addresses. The page cache is shared
+between workers.
+
+Layout (little-endian):
+
+    header   magic "HKFX", version u16, source count u16, slot count u64, record count u64
+    sources  per source: name length u16, UTF-8 name
+    slots    slot count x (key hash u64, record offset u64); hash 0 marks an empty slot
+    records  key length u16, normalized address, then per source: payload length u32, JSON payload
+
+Generate a dataset with controlled conflicts between county and listing data:
+
+    python -m app.adapters.fixtures generate fixtures.hkfx --count 2000000 --conflict-rate 0.2
+    python -m app.adapters.fixtures get fixtures.hkfx "1200 Birch Lane"
+"""
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import random
+import struct
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..config import settings
+from ..utils import normalize_address
+
+MAGIC = b"HKFX"
+VERSION = 1
+SOURCES = ("county", "listing", "hoa", "neighborhood")
+HEADER = struct.Struct("<4sHHQQ")
+SLOT = struct.Struct("<QQ")
+U16 = struct.Struct("<H")
+U32 = struct.Struct("<I")
+# A conflicting listing overstates the county roll's square footage by more than the 5% that
+# merge_source_data flags, and may also disagree on one of these fields, which the merge does not flag.
+SQUARE_FEET_CONFLICT = (1.06, 1.15)
+DISCREPANCY_FIELDS = ("bedrooms", "bathrooms", "year_built")
+
+
+def key_hash(normalized_address: str) -> int:
+    digest = hashlib.blake2b(normalized_address.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1  # 0 marks an empty slot
+
+
+class FixtureStore:
+    """Read-only view of a fixture file; safe to share between threads."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, source_count, self.slot_count, self.record_count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} fixture file")
+        offset = HEADER.size
+        self.sources: List[str] = []
+        for _ in range(source_count):
+            (length,) = U16.unpack_from(self._mm, offset)
+            self.sources.append(bytes(self._mm[offset + 2:offset + 2 + length]).decode())
+            offset += 2 + length
+        self._source_index = {name: i for i, name in enumerate(self.sources)}
+        self._slots_at = offset
+        self._mask = self.slot_count - 1
+
+    def _record(self, normalized_address: str) -> Optional[int]:
+        """Offset of the address's record, or None."""
+        h = key_hash(normalized_address)
+        key = normalized_address.encode()
+        i = h & self._mask
+        while True:
+            slot_hash, record_at = SLOT.unpack_from(self._mm, self._slots_at + i * SLOT.size)
+            if slot_hash == 0:
+                return None
+            if slot_hash == h:
+                (length,) = U16.unpack_from(self._mm, record_at)
+                if self._mm[record_at + 2:record_at + 2 + length] == key:
+                    return record_at + 2 + length
+            i = (i + 1) & self._mask
+
+    def get(self, source_name: str, normalized_address: str) -> Optional[Dict[str, Any]]:
+        source = self._source_index.get(source_name)
+        offset = self._record(normalized_address)
+        if source is None or offset is None:
+            return None
+        for _ in range(source):
+            (length,) = U32.unpack_from(self._mm, offset)
+            offset += 4 + length
+        (length,) = U32.unpack_from(self._mm, offset)
+        if not length:
+            return None
+        return json.loads(self._mm[offset + 4:offset + 4 + length])
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+_store: Optional[FixtureStore] = None
+_store_lock = threading.Lock()
+
+
+def fixture_store() -> Optional[FixtureStore]:
+    """The process-wide store for ADAPTER_FIXTURE_PATH, opened on first use; None when unset."""
+    global _store
+    path = settings.ADAPTER_FIXTURE_PATH
+    if not path:
+        return None
+    if _store is None or _store.path != path:
+        with _store_lock:
+            if _store is None or _store.path != path:
+                _store = FixtureStore(path)
+    return _store
+
+
+# Generation
+
+STREETS = (
+    "Main", "Oak", "Pine", "Maple", "Cedar", "Elm", "Birch", "Willow", "Walnut", "Spruce", "Aspen", "Sycamore",
+    "Hickory", "Magnolia", "Juniper", "Laurel", "Cypress", "Redwood", "Chestnut", "Poplar", "Hawthorn", "Alder",
+    "Sequoia", "Palm", "Lake", "Hill", "River", "Park", "Sunset", "Highland", "Meadow", "Ridge", "Valley", "Forest",
+    "Harbor", "Canyon", "Mesa", "Vista", "Summit", "Garden", "Orchard", "Prairie", "Bay", "Brook", "Spring",
+    "Mission", "Pacific", "Coronado", "Del Mar", "La Jolla",
+)
+SUFFIXES = ("Street", "Avenue", "Drive", "Road", "Lane", "Court", "Boulevard", "Place")
+HOUSE_NUMBERS = 9999
+MAX_ADDRESSES = HOUSE_NUMBERS * len(STREETS) * len(SUFFIXES)
+PROPERTY_TYPES = ("Single Family", "Single Family", "Single Family", "Condo", "Townhouse", "Multi Family")
+
+
+def synthetic_address(i: int) -> str:
+    """The i-th generated address; unique for i < MAX_ADDRESSES."""
+    number, rest = i % HOUSE_NUMBERS + 1, i // HOUSE_NUMBERS
+    street, suffix = STREETS[rest % len(STREETS)], SUFFIXES[rest // len(STREETS) % len(SUFFIXES)]
+    return f"{number} {street} {suffix}"
+
+
+def _synthetic_sources(rng: random.Random, address: str, listing_rate: float, hoa_rate: float,
+                       conflict_rate: float) -> Tuple[Dict[str, Optional[Dict[str, Any]]], bool]:
+    """One property's payload per source, and whether its listing conflicts with the county roll."""
+    property_type = rng.choice(PROPERTY_TYPES)
+    bedrooms = rng.randint(1, 6)
+    square_feet = rng.randrange(600, 5000, 10)
+    year_built = rng.randint(1900, 2024)
+    assessed = square_feet * rng.randint(150, 450)
+    county = {
+        "address": address, "square_feet": square_feet, "bedrooms": bedrooms,
+        "bathrooms": max(1, bedrooms - rng.randint(0, 2)), "year_built": year_built,
+        "lot_size": f"{rng.randint(5, 80) / 100:.2f} acres", "property_type": property_type,
+        "tax_assessed_value": assessed, "tax_year": 2024,
+        "last_sale_date": f"{rng.randint(2000, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "last_sale_price": int(assessed * rng.uniform(0.8, 1.1)),
+    }
+    sources: Dict[str, Optional[Dict[str, Any]]] = {"county": county, "listing": None, "hoa": None}
+    conflicted = False
+    if rng.random() < listing_rate:
+        listing = {field: county[field] for field in ("address", "square_feet", "bedrooms", "bathrooms",
+                                                       "year_built", "lot_size", "property_type")}
+        if rng.random() < conflict_rate:
+            conflicted = True
+            listing["square_feet"] = int(county["square_feet"] * rng.uniform(*SQUARE_FEET_CONFLICT))
+            for field in rng.sample(DISCREPANCY_FIELDS, rng.randint(0, 1)):
+                if field == "bathrooms":
+                    listing[field] = county[field] + 0.5
+                elif field == "year_built":
+                    listing[field] = county[field] + rng.choice((-2, -1, 1, 2))
+                else:
+                    listing[field] = county[field] + 1
+        listing.update({
+            "listing_price": int(assessed * rng.uniform(1.0, 1.3)), "days_on_market": rng.randint(1, 180),
+            "listing_date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "mls_number": f"MLS{rng.randint(100000, 999999)}",
+        })
+        sources["listing"] = listing
+    if property_type != "Single Family" or rng.random() < hoa_rate:
+        sources["hoa"] = {
+            "address": address, "hoa_name": f"{address.split(' ', 1)[1]} Association",
+            "hoa_fee": rng.randrange(50, 800, 5), "hoa_fee_frequency": "monthly",
+            "amenities": rng.sample(["Pool", "Fitness Center", "Clubhouse", "Parking Garage", "Playground"], 2),
+            "special_assessments": [],
+        }
+    sources["neighborhood"] = {
+        "school_score": rng.randint(1, 10), "walkscore": rng.randint(10, 99),
+        "crime_index": rng.choice(("low", "moderate", "high")), "median_commute_mins": rng.randint(10, 60),
+    }
+    return sources, conflicted
+
+
+def generate(path: str, count: int, seed: int = 0, listing_rate: float = 0.6, hoa_rate: float = 0.3,
+             conflict_rate: float = 0.15) -> Dict[str, int]:
+    """Write `count` synthetic properties to `path`. Memory use is the slot table, not the data."""
+    if count > MAX_ADDRESSES:
+        raise ValueError(f"at most {MAX_ADDRESSES} distinct addresses can be generated")
+    rng = random.Random(seed)
+    slot_count = 1 << max(4, (count * 2 - 1).bit_length())  # load factor <= 0.5
+    slots = bytearray(slot_count * SLOT.size)
+    mask = slot_count - 1
+    stats = {"properties": count, "listing": 0, "hoa": 0, "conflicts": 0}
+
+    names = b"".join(U16.pack(len(s.encode())) + s.encode() for s in SOURCES)
+    slots_at = HEADER.size + len(names)
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(SOURCES), slot_count, count))
+        f.write(names)
+        f.write(slots)  # placeholder, rewritten below
+        offset = slots_at + len(slots)
+        for i in range(count):
+            address = synthetic_address(i)
+            normalized = normalize_address(address)
+            sources, conflicted = _synthetic_sources(rng, address, listing_rate, hoa_rate, conflict_rate)
+            stats["listing"] += sources["listing"] is not None
+            stats["hoa"] += sources["hoa"] is not None
+            stats["conflicts"] += conflicted
+
+            key = normalized.encode()
+            record = [U16.pack(len(key)), key]
+            for name in SOURCES:
+                payload = json.dumps(sources[name], separators=(",", ":")).encode() if sources.get(name) else b""
+                record += [U32.pack(len(payload)), payload]
+            record = b"".join(record)
+
+            h = key_hash(normalized)
+            j = h & mask
+            while SLOT.unpack_from(slots, j * SLOT.size)[0]:
+                j = (j + 1) & mask
+            SLOT.pack_into(slots, j * SLOT.size, h, offset)
+            f.write(record)
+            offset += len(record)
+        f.seek(slots_at)
+        f.write(slots)
+    os.replace(tmp, path)
+    return stats
+
+
+def iter_addresses(count: int) -> Iterator[str]:
+    """The raw addresses of a generated file with `count` properties, in generation order."""
+    return (synthetic_address(i) for i in range(count))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate or inspect adapter fixture files.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    gen = sub.add_parser("generate", help="write synthetic properties")
+    gen.add_argument("path")
+    gen.add_argument("--count", type=int, default=1_000_000)
+    gen.add_argument("--seed", type=int, default=0)
+    gen.add_argument("--listing-rate", type=float, default=0.6, help="fraction of properties with a listing")
+    gen.add_argument("--hoa-rate", type=float, default=0.3, help="fraction of single-family homes with an HOA")
+    gen.add_argument("--conflict-rate", type=float, default=0.15,
+                     help="fraction of listings that disagree with the county roll on 1-2 fields")
+    get = sub.add_parser("get", help="print one address's payloads")
+    get.add_argument("path")
+    get.add_argument("address")
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        stats = generate(args.path, args.count, args.seed, args.listing_rate, args.hoa_rate, args.conflict_rate)
+        print(json.dumps(stats))
+    else:
+        store = FixtureStore(args.path)
+        normalized = normalize_address(args.address)
+        print(json.dumps({name: store.get(name, normalized) for name in store.sources}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,22 @@
 # app/adapters/neighborhood.py
 # Simple, static enrichment by normalized address; real impl would call external providers.
+from .fixtures import fixture_store
 
+# Keyed like the other adapters, by normalize_address() of the street address.
 SAMPLE = {
-    "123 main st, san diego, ca": {
+    "123 main street": {
         "school_score": 8,
         "walkscore": 72,
         "crime_index": "low",
         "median_commute_mins": 24,
     },
-    "456 oak ave, san diego, ca": {
+    "456 oak avenue": {
         "school_score": 7,
         "walkscore": 65,
         "crime_index": "moderate",
         "median_commute_mins": 27,
     },
-    "789 pine dr, san diego, ca": {
+    "789 pine drive": {
         "school_score": 9,
         "walkscore": 80,
         "crime_index": "low",
@@ -23,4 +25,7 @@ SAMPLE = {
 }
 
 def fetch(normalized_address: str) -> dict | None:
+    store = fixture_store()
+    if store is not None:
+        return store.get("neighborhood", normalized_address)
     return SAMPLE.get(normalized_address)
@@ -0,0 +1,200 @@
+# app/admission.py
+"""
+Admission control for the expensive write/LLM routes.
+
+Each request to a limited route class (ingest, refresh, ai_summary) must take
+a token from the bucket for its (route class, client) pair and a concurrency
+slot for its route class. A request that gets neither is answered at once:
+429 when the client is over its rate, and 503 when the route class is
+saturated. Both carry `Retry-After`, so nothing queues behind the threadpool,
+the SQLite writer or the LLM. Clients are identified by `X-API-Key` when it
+is one of ADMISSION_API_KEYS, otherwise by peer address: unchecked keys would
+let a caller mint a fresh bucket per request (and evict everyone else's).
+Behind a reverse proxy every peer is the proxy, so ADMISSION_TRUSTED_PROXIES
+lists the proxies whose X-Forwarded-For is believed.
+"""
+import ipaddress
+import math
+import re
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from starlette.responses import JSONResponse
+
+from .config import settings
+from .metrics import ADMISSION_REQUESTS, ADMISSION_IN_FLIGHT
+
+ROUTE_CLASSES = (
+    ("ingest", re.compile(r"^/properties/ingest$")),
+    ("refresh", re.compile(r"^/properties/[^/]+/refresh$")),
+    ("ai_summary", re.compile(r"^/properties/[^/]+/ai_summary$")),
+)
+
+# Idle buckets are evicted oldest-first beyond this many (route class, client) pairs.
+MAX_BUCKETS = 10_000
+
+
+def route_class(method: str, path: str) -> Optional[str]:
+    if method != "POST":
+        return None
+    for name, pattern in ROUTE_CLASSES:
+        if pattern.match(path):
+            return name
+    return None
+
+
+def limits(name: str) -> Tuple[float, int]:
+    """(requests per minute, max concurrent) for a route class, from Settings."""
+    key = name.upper()
+    return getattr(settings, f"RATE_LIMIT_{key}_PER_MIN"), getattr(settings, f"MAX_CONCURRENT_{key}")
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def take(self, now: float) -> float:
+        """Take one token. Returns 0 on success, else seconds until one is available."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class AdmissionController:
+    """Buckets and in-flight counts; only touched from the event loop, so no locking."""
+
+    def __init__(self):
+        self.buckets: "OrderedDict[Tuple[str, str], TokenBucket]" = OrderedDict()
+        self.in_flight: Dict[str, int] = {}
+
+    def check_rate(self, name: str, client: str, now: Optional[float] = None) -> float:
+        per_min, _ = limits(name)
+        if per_min <= 0:
+            return 0.0
+        now = time.monotonic() if now is None else now
+        key = (name, client)
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(per_min / 60, max(settings.RATE_LIMIT_BURST, 1), now)
+            if len(self.buckets) > MAX_BUCKETS:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(key)
+        return bucket.take(now)
+
+    def acquire(self, name: str) -> bool:
+        _, cap = limits(name)
+        if cap > 0 and self.in_flight.get(name, 0) >= cap:
+            return False
+        self.in_flight[name] = self.in_flight.get(name, 0) + 1
+        ADMISSION_IN_FLIGHT.inc(route_class=name)
+        return True
+
+    def release(self, name: str) -> None:
+        self.in_flight[name] -= 1
+        ADMISSION_IN_FLIGHT.dec(route_class=name)
+
+
+controller = AdmissionController()
+
+
+@lru_cache(maxsize=4)
+def _known_keys(configured: str) -> frozenset:
+    return frozenset(key.strip() for key in configured.split(",") if key.strip())
+
+
+@lru_cache(maxsize=4)
+def _trusted_proxies(configured: str) -> Tuple:
+    return tuple(ipaddress.ip_network(net.strip(), strict=False) for net in configured.split(",") if net.strip())
+
+
+def _is_trusted(address: str, trusted: Tuple) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in net for net in trusted)
+
+
+def client_ip(scope) -> str:
+    """The peer address, or behind ADMISSION_TRUSTED_PROXIES the nearest untrusted X-Forwarded-For hop.
+
+    X-Forwarded-For is read right to left and only while each hop is a
+    trusted proxy, so a client cannot pick its bucket by sending the header
+    itself.
+    """
+    client = scope.get("client")
+    peer = client[0] if client else "unknown"
+    trusted = _trusted_proxies(settings.ADMISSION_TRUSTED_PROXIES)
+    if not trusted or not _is_trusted(peer, trusted):
+        return peer
+    hops = [
+        hop.strip()
+        for name, value in scope["headers"] if name == b"x-forwarded-for"
+        for hop in value.decode("latin-1").split(",")
+    ]
+    for hop in reversed(hops):
+        if not _is_trusted(hop, trusted):
+            return hop
+        peer = hop
+    return peer
+
+
+def client_key(scope) -> str:
+    known = _known_keys(settings.ADMISSION_API_KEYS)
+    if known:
+        for name, value in scope["headers"]:
+            if name == b"x-api-key" and value.decode("latin-1") in known:
+                return "key:" + value.decode("latin-1")
+    return "ip:" + client_ip(scope)
+
+
+def _reject(status: int, detail: str, retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        {"detail": detail},
+        status_code=status,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+class AdmissionMiddleware:
+    """Rejects over-limit requests to the limited route classes before any work is done."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        name = route_class(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if name is None or not settings.ADMISSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        # Concurrency first, so a 503 does not spend the client's rate budget
+        if not controller.acquire(name):
+            ADMISSION_REQUESTS.inc(route_class=name, result="overloaded")
+            await _reject(503, f"too many concurrent {name} requests", settings.ADMISSION_RETRY_AFTER_S)(scope, receive, send)
+            return
+        wait = controller.check_rate(name, client_key(scope))
+        if wait:
+            controller.release(name)
+            ADMISSION_REQUESTS.inc(route_class=name, result="rate_limited")
+            await _reject(429, "rate limit exceeded", wait)(scope, receive, send)
+            return
+
+        ADMISSION_REQUESTS.inc(route_class=name, result="admitted")
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            controller.release(name)
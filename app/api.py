@@ -1,30 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Request, Response
+from concurrent.futures import Future, wait
 from typing import Optional, Dict, Any
-from sqlmodel import SQLModel
+from sqlmodel import Session
 from .schemas import (
     ItemCreate, ItemRead, PropertyCreate, PropertyRead, SourceDatumRead, 
     BriefRead, ContributionCreate, ContributionRead, AISummaryRequest
 )
-from .models import Item
-from .deps import get_session, engine
-from .crud import (
-    list_items, get_item, create_item, update_item, delete_item,
-    get_property_by_address, create_or_update_property, get_property,
-    upsert_source_datum, get_source_data, create_or_update_brief, get_brief,
-    create_contribution, get_contributions
-)
-from .utils import normalize_address, merge_source_data, calculate_completeness_score, call_llm_topics
-from .adapters.county import get_county_data
-from .adapters.listing import get_listing_data
-from .adapters.hoa import get_hoa_data
-import json
+from .deps import get_session
+from .crud import list_items, get_item, create_item, update_item, delete_item
+from .config import settings
+from . import properties, sharding
+from .properties import FIELD_LIST
+from .utils import normalize_address, call_llm_topics
+from .adapters import INGEST_SOURCES, load_adapter, submit_source
+from .deadline import deadline_scope, ingest_deadline, remaining as deadline_remaining
+from .profiling import profiled, profiled_job
+from .singleflight import coalesce
+import logging
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-@router.on_event("startup")
-def init_db():
-    SQLModel.metadata.create_all(engine)
-
 @router.get("/health")
 def health() -> Dict[str, Any]:
     return {"status": "ok"}
@@ -32,13 +30,23 @@ def health() -> Dict[str, Any]:
 @router.get("/items", response_model=dict)
 def list_items_api(
     q: Optional[str] = None,
-    page: int = Query(1, ge=1),
+    sort: str = Query("relevance", pattern="^(relevance|recent)$"),
+    cursor: Optional[str] = None,
     limit: int = Query(10, ge=1, le=100),
+    count: bool = False,
     session=Depends(get_session),
 ):
-    rows, total = list_items(session, q, page, limit)
+    """Items matching `q` (full-text; the last word matches as a prefix), or all items newest first.
+
+    Pass `meta.next_cursor` back as `cursor` for the next page. `meta.total`
+    is only computed with count=true.
+    """
+    try:
+        rows, next_cursor, total = list_items(session, q, limit, cursor, sort, count)
+    except ValueError as exc:
+        raise HTTPException(400, str(exc))
     data = [ItemRead.model_validate(r).model_dump() for r in rows]
-    return {"data": data, "meta": {"page": page, "limit": limit, "total": total}}
+    return {"data": data, "meta": {"limit": limit, "next_cursor": next_cursor, "total": total}}
 
 @router.get("/items/{item_id}", response_model=ItemRead)
 def get_item_api(item_id: int, session=Depends(get_session)):
@@ -67,76 +75,96 @@ def delete_item_api(item_id: int, session=Depends(get_session)):
     delete_item(session, item)
     return
 
-# Property Brief endpoints
+# Property Brief endpoints; the logic shared with ASYNC_MODE lives in app/properties.py
 
 @router.post("/properties/ingest", response_model=PropertyRead, status_code=201)
-def ingest_property(payload: PropertyCreate, session=Depends(get_session)):
+@profiled
+def ingest_property(
+    payload: PropertyCreate,
+    background: BackgroundTasks,
+    x_deadline_ms: Optional[float] = Header(None),
+    session=Depends(get_session)
+):
     """
     Ingest property data from all sources and create/update brief.
+    
+    Adapters that miss the deadline (X-Deadline-Ms or INGEST_DEADLINE_MS) are
+    listed in `pending_sources` and merged in by a background job when they finish.
     """
     # Normalize address
     normalized_addr = normalize_address(payload.address)
     
-    # Upsert property
-    property = create_or_update_property(session, normalized_addr, payload.address)
-    
-    # Fetch data from all adapters
-    sources = {}
-    adapters = [
-        ("county", get_county_data),
-        ("listing", get_listing_data), 
-        ("hoa", get_hoa_data)
-    ]
-    
-    for source_name, adapter_func in adapters:
-        data = adapter_func(normalized_addr)
-        if data:
-            sources[source_name] = data
-            # Upsert source datum (update if exists, create if not)
-            upsert_source_datum(session, property.id, source_name, data)
-    
-    # Merge data and create brief
-    if sources:
-        merged_data = merge_source_data(sources)
-        completeness_score = calculate_completeness_score(merged_data)
-        create_or_update_brief(session, property.id, merged_data, completeness_score)
-    
-    return PropertyRead.model_validate(property)
+    if sharding.enabled():
+        # The catalog assigns the id; everything else happens on the address's shard
+        property_id, shard = sharding.assign_property(normalized_addr)
+        with Session(sharding.engine_for_shard(shard)) as shard_session:
+            return _coalesced_ingest(shard_session, normalized_addr, payload.address, background, x_deadline_ms, property_id)
+    return _coalesced_ingest(session, normalized_addr, payload.address, background, x_deadline_ms)
+
+def _coalesced_ingest(session, normalized_addr: str, raw_address: str, background: BackgroundTasks,
+                      x_deadline_ms: Optional[float], property_id: Optional[int] = None) -> PropertyRead:
+    # Concurrent ingests of the same address share one fetch, merge and write
+    with deadline_scope(ingest_deadline(x_deadline_ms)):
+        return coalesce(
+            session, f"address:{normalized_addr}",
+            lambda: _ingest(session, normalized_addr, raw_address, background, property_id),
+            lambda: properties.ingested(session, normalized_addr),
+        )
+
+def _ingest(session, normalized_addr: str, raw_address: str, background: BackgroundTasks,
+            property_id: Optional[int] = None) -> PropertyRead:
+    # Fetch data from all adapters in parallel, waiting no longer than the deadline
+    futures = {name: submit_source(name, load_adapter(name), normalized_addr) for name in INGEST_SOURCES}
+    wait(futures.values(), timeout=deadline_remaining())
+    pending = {name: future for name, future in futures.items() if not future.done()}
+    fetched = {name: future.result() for name, future in futures.items() if name not in pending}
+    
+    result = properties.store_ingest(session, normalized_addr, raw_address, fetched, pending, property_id)
+    if pending:
+        background.add_task(_finish_ingest, result.id, pending)
+    return result
+
+@profiled_job("ingest-stragglers")
+def _finish_ingest(property_id: int, pending: Dict[str, Future]):
+    """Wait for the adapters that missed the ingest deadline, then store them (properties.finish_ingest)."""
+    delivered = {}
+    for source_name, future in pending.items():
+        try:
+            delivered[source_name] = future.result(timeout=settings.ADAPTER_TIMEOUT_S)
+        except Exception:
+            logger.warning("adapter %s failed after ingest deadline for property %s", source_name, property_id, exc_info=True)
+    with sharding.session_for_property(property_id) as session:
+        properties.finish_ingest(session, property_id, delivered)
 
 @router.get("/properties/{property_id}/sources", response_model=list[SourceDatumRead])
-def get_property_sources(property_id: int, session=Depends(get_session)):
-    """Get all source data for a property."""
-    property = get_property(session, property_id)
-    if not property:
-        raise HTTPException(404, "Property not found")
-    
-    source_data = get_source_data(session, property_id)
-    result = []
-    for datum in source_data:
-        # Parse JSON data before validation
-        datum_dict = datum.model_dump()
-        datum_dict['data'] = json.loads(datum.data)
-        parsed_data = SourceDatumRead.model_validate(datum_dict)
-        result.append(parsed_data)
-    
-    return result
+@profiled
+def get_property_sources(
+    property_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, pattern=FIELD_LIST),
+    exclude: Optional[str] = Query(None, pattern=FIELD_LIST),
+    session=Depends(get_session)
+):
+    """Get all source data for a property, optionally projected with fields= or exclude=."""
+    return properties.property_sources(session, property_id, request, response, fields, exclude)
 
 @router.get("/properties/{property_id}/brief", response_model=BriefRead)
-def get_property_brief(property_id: int, session=Depends(get_session)):
-    """Get the property brief."""
-    property = get_property(session, property_id)
-    if not property:
-        raise HTTPException(404, "Property not found")
-    
-    brief = get_brief(session, property_id)
-    if not brief:
-        raise HTTPException(404, "Brief not found for this property")
-    
-    # Parse JSON data before validation
-    brief_dict = brief.model_dump()
-    brief_dict['data'] = json.loads(brief.data)
-    result = BriefRead.model_validate(brief_dict)
-    return result
+@profiled
+def get_property_brief(
+    property_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, pattern=FIELD_LIST),
+    exclude: Optional[str] = Query(None, pattern=FIELD_LIST),
+    as_of: Optional[datetime] = None,
+    session=Depends(get_session)
+):
+    """Get the property brief, optionally projected with fields= or exclude= (e.g. exclude=_metadata).
+
+    With as_of, the brief's fields as they stood at that moment, rebuilt from its history.
+    """
+    return properties.property_brief(session, property_id, request, response, fields, exclude, as_of)
 
 @router.post("/properties/{property_id}/contributions", response_model=ContributionRead, status_code=201)
 def create_property_contribution(
@@ -145,133 +173,29 @@ def create_property_contribution(
     session=Depends(get_session)
 ):
     """Create a contribution for a property."""
-    property = get_property(session, property_id)
-    if not property:
-        raise HTTPException(404, "Property not found")
-    
-    contribution = create_contribution(
-        session, property_id, payload.field, payload.proposed_value, 
-        payload.reason, payload.contributor
-    )
-    return ContributionRead.model_validate(contribution)
+    return properties.add_contribution(session, property_id, payload)
 
 @router.get("/properties/{property_id}/contributions", response_model=list[ContributionRead])
-def get_property_contributions(property_id: int, session=Depends(get_session)):
-    """Get all contributions for a property."""
-    property = get_property(session, property_id)
-    if not property:
-        raise HTTPException(404, "Property not found")
-    
-    contributions = get_contributions(session, property_id)
-    return [ContributionRead.model_validate(c) for c in contributions]
+def get_property_contributions(
+    property_id: int,
+    status: Optional[str] = Query(None, pattern="^(pending|accepted|rejected)$"),
+    limit: int = Query(50, ge=1, le=200),
+    session=Depends(get_session)
+):
+    """Get the newest contributions for a property; see /contributions/summary for per-field counts."""
+    return properties.list_contributions(session, property_id, status, limit)
 
 @router.post("/properties/{property_id}/ai_summary")
+@profiled
 def get_ai_summary(
     property_id: int,
     payload: AISummaryRequest,
     session=Depends(get_session)
 ):
     """Generate AI summary for property using call_llm_topics function."""
-    property = get_property(session, property_id)
-    if not property:
-        raise HTTPException(404, "Property not found")
-    
-    brief = get_brief(session, property_id)
-    if not brief:
-        raise HTTPException(404, "Brief not found for this property")
-    
-    brief_data = json.loads(brief.data)
-    
-    # Get contributions for this property
-    contributions = get_contributions(session, property_id)
-    
-    # Build the prompt with brief data and contributions
-    prompt_parts = ["Property Brief Data:"]
-    prompt_parts.append(json.dumps(brief_data, indent=2))
-    
-    if contributions:
-        prompt_parts.append("\nUser Contributions:")
-        for contrib in contributions:
-            prompt_parts.append(f"- Field: {contrib.field}, Proposed Value: {contrib.proposed_value}, Reason: {contrib.reason}, Contributor: {contrib.contributor}")
-    
-    prompt = payload.prompt_override or "\n".join(prompt_parts)
-    
+    brief, contributions, prompt = properties.summary_inputs(session, property_id, payload.prompt_override)
     try:
-        # Use the call_llm_topics function
         summary = call_llm_topics(prompt)
-        
-        return {
-            "summary": summary,
-            "source": "openai",
-            "completeness_score": brief.completeness_score
-        }
-        
-    except requests.exceptions.RequestException as e:
-        # Network/HTTP related errors
-        error_details = {
-            "error_type": "request_exception",
-            "error_message": str(e),
-            "status_code": getattr(e.response, 'status_code', None) if hasattr(e, 'response') else None,
-            "response_text": getattr(e.response, 'text', None) if hasattr(e, 'response') else None
-        }
-        
-        return _generate_fallback_summary(brief_data, contributions, error_details)
-        
-    except KeyError as e:
-        # Missing key in response
-        error_details = {
-            "error_type": "key_error",
-            "error_message": f"Missing key in OpenAI response: {str(e)}",
-            "expected_keys": ["choices", "message", "content"]
-        }
-        
-        return _generate_fallback_summary(brief_data, contributions, error_details)
-        
-    except json.JSONDecodeError as e:
-        # JSON parsing error
-        error_details = {
-            "error_type": "json_decode_error",
-            "error_message": f"Failed to parse OpenAI response JSON: {str(e)}"
-        }
-        
-        return _generate_fallback_summary(brief_data, contributions, error_details)
-        
     except Exception as e:
-        # Any other unexpected errors
-        error_details = {
-            "error_type": "unexpected_error",
-            "error_message": str(e),
-            "error_class": type(e).__name__
-        }
-        
-        return _generate_fallback_summary(brief_data, contributions, error_details)
-
-def _generate_fallback_summary(brief_data: dict, contributions: list, error_details: dict) -> dict:
-    """Generate rule-based fallback summary with error details"""
-    summary_parts = []
-    
-    if brief_data.get('address'):
-        summary_parts.append(f"This {brief_data.get('property_type', 'property')} at {brief_data['address']}")
-    
-    if brief_data.get('square_feet') and brief_data.get('bedrooms') and brief_data.get('bathrooms'):
-        summary_parts.append(f"features {brief_data['square_feet']} sq ft with {brief_data['bedrooms']} bedrooms and {brief_data['bathrooms']} bathrooms")
-    
-    if brief_data.get('year_built'):
-        summary_parts.append(f"built in {brief_data['year_built']}")
-    
-    if brief_data.get('hoa_fee'):
-        summary_parts.append(f"with ${brief_data['hoa_fee']} monthly HOA fee")
-    
-    # Add contributions if any
-    if contributions:
-        contrib_text = "User contributions: " + ", ".join([f"{c.field}={c.proposed_value}" for c in contributions])
-        summary_parts.append(contrib_text)
-    
-    summary = ". ".join(summary_parts) + "."
-    
-    return {
-        "summary": summary,
-        "source": "rule_based_fallback",
-        "error_details": error_details,
-        "completeness_score": brief.completeness_score
-    }
+        return properties.summary_response(brief, contributions, None, e)
+    return properties.summary_response(brief, contributions, summary)
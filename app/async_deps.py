@@ -0,0 +1,21 @@
+# app/async_deps.py
+"""
+Async engine and session dependency for ASYNC_MODE (requires aiosqlite).
+"""
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .config import settings
+from .deps import instrument_engine
+
+def async_database_url(url: str) -> str:
+    """Map a sync SQLite URL onto the aiosqlite driver."""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    return url
+
+async_engine = create_async_engine(settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL), echo=False)
+instrument_engine(async_engine.sync_engine)
+
+async def get_async_session():
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
@@ -0,0 +1,95 @@
+# app/brief.py
+"""
+Brief (re)materialization from the stored SourceDatum rows.
+
+Every merge stamps the brief with `sources_as_of`, the newest source row it
+saw. Reads compare that with the newest stored source (crud.is_stale) and
+re-merge stale briefs; see app/materialize.py for LAZY_BRIEFS.
+"""
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlmodel import select
+from .models import Brief, Property, SourceDatum
+from .crud import get_source_data, create_or_update_brief, bulk_upsert_briefs, upsert_source_datum, get_brief, get_property
+from .utils import merge_source_data, calculate_completeness_score
+from .adapters import INGEST_SOURCES, fetch_source, load_adapter
+
+
+def merge_sources_for_property(session, property_id: int) -> Tuple[Optional[Brief], int, List[Dict[str, Any]]]:
+    """Merge the latest stored source payloads into the property's brief.
+
+    Returns (brief, completeness, conflicts); brief is None when the property
+    has no source data yet.
+    """
+    stored = get_source_data(session, property_id)
+    sources = {datum.source_name: json.loads(datum.data) for datum in stored}
+    if not sources:
+        return None, 0, []
+
+    address = None
+    if not any("address" in payload for payload in sources.values()):
+        address = get_property(session, property_id).raw_address
+    merged_data = merge_source_data(sources, address)
+    completeness_score = calculate_completeness_score(merged_data)
+    brief = create_or_update_brief(
+        session, property_id, merged_data, completeness_score,
+        sources_as_of=max(datum.created_at for datum in stored),
+    )
+    return brief, completeness_score, merged_data["_metadata"]["conflicts"]
+
+
+def merge_properties(session, property_ids: List[int]) -> int:
+    """Re-merge many properties in the caller's transaction (no commit).
+
+    Source rows for all ids are loaded in one query. Returns the number of
+    briefs written.
+    """
+    sources_by_property: Dict[int, Dict[str, Dict[str, Any]]] = {}
+    sources_as_of: Dict[int, datetime] = {}
+    addresses: Dict[int, str] = {}
+    stmt = (
+        select(SourceDatum.property_id, SourceDatum.source_name, SourceDatum.data, SourceDatum.created_at,
+               Property.raw_address)
+        .join(Property, Property.id == SourceDatum.property_id)
+        .where(SourceDatum.property_id.in_(property_ids))
+    )
+    for property_id, source_name, data, created_at, raw_address in session.exec(stmt):
+        sources_by_property.setdefault(property_id, {})[source_name] = json.loads(data)
+        sources_as_of[property_id] = max(created_at, sources_as_of.get(property_id, created_at))
+        addresses[property_id] = raw_address
+
+    briefs = {}
+    for property_id, sources in sources_by_property.items():
+        merged_data = merge_source_data(sources, addresses[property_id])
+        briefs[property_id] = (merged_data, calculate_completeness_score(merged_data))
+    bulk_upsert_briefs(session, briefs, sources_as_of)
+    return len(briefs)
+
+
+def refresh_property_sources(
+    session, property_id: int, normalized_address: str, materialize: bool = True
+) -> Optional[Tuple[int, List[Dict[str, Any]]]]:
+    """Re-fetch every adapter for a property and re-merge its brief.
+
+    Returns (completeness, conflicts). With materialize=False only the
+    sources are stored, leaving the brief stale for the next read or the
+    compactor, and the result is None. Callers run this through
+    app.singleflight.coalesce keyed on the property id.
+    """
+    for name in INGEST_SOURCES:
+        payload = fetch_source(name, load_adapter(name), normalized_address)
+        if payload:
+            upsert_source_datum(session, property_id, name, payload)
+    if not materialize:
+        return None
+    _, completeness, conflicts = merge_sources_for_property(session, property_id)
+    return completeness, conflicts
+
+
+def brief_status(session, property_id: int) -> Optional[Tuple[int, List[Dict[str, Any]]]]:
+    """(completeness, conflicts) of the stored brief, or None if there is none."""
+    brief = get_brief(session, property_id)
+    if not brief:
+        return None
+    return brief.completeness_score, json.loads(brief.data)["_metadata"]["conflicts"]
@@ -0,0 +1,34 @@
+# app/cards.py
+"""
+Display artifacts derived from a brief when it is written, not per request.
+
+Every brief write stores the listing card (Brief.card, served in bulk by
+GET /properties/cards) and the rule-based summary text (Brief.fallback_summary,
+used when the LLM call in POST /properties/{id}/ai_summary fails) next to the
+brief, so neither is rebuilt until the brief changes.
+"""
+import json
+from typing import Any, Dict
+
+CARD_FIELDS = ("address", "bedrooms", "bathrooms", "square_feet", "hoa_fee")
+
+
+def build_card(property_id: int, data: Dict[str, Any], completeness_score: int, dispute_count: int) -> str:
+    """The card as stored: a JSON object ready to be spliced into a response."""
+    card = {"property_id": property_id, **{field: data.get(field) for field in CARD_FIELDS}}
+    card.update(price=data.get("listing_price"), completeness_score=completeness_score, dispute_count=dispute_count)
+    return json.dumps(card, separators=(",", ":"))
+
+
+def fallback_text(data: Dict[str, Any]) -> str:
+    """The brief's part of the rule-based summary; contributions are appended per request."""
+    parts = []
+    if data.get('address'):
+        parts.append(f"This {data.get('property_type', 'property')} at {data['address']}")
+    if data.get('square_feet') and data.get('bedrooms') and data.get('bathrooms'):
+        parts.append(f"features {data['square_feet']} sq ft with {data['bedrooms']} bedrooms and {data['bathrooms']} bathrooms")
+    if data.get('year_built'):
+        parts.append(f"built in {data['year_built']}")
+    if data.get('hoa_fee'):
+        parts.append(f"with ${data['hoa_fee']} monthly HOA fee")
+    return ". ".join(parts)
@@ -0,0 +1,194 @@
+# app/compression.py
+"""
+Response compression negotiated from Accept-Encoding.
+
+Brotli is preferred when the optional `brotli` package is installed and the
+client accepts it. gzip is the fallback. Responses smaller than
+COMPRESSION_MIN_SIZE are sent as-is, since their headers would cost more
+than the saving.
+
+The middleware is written against the ASGI send interface alone, so it does
+not depend on any framework internals. A compressed body is a different
+representation, so its strong ETag is made weak. conditional.not_modified
+compares tags weakly, so revalidation still matches. Every response that
+could have been compressed carries `Vary: Accept-Encoding`, including 304s.
+"""
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from .config import settings
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+EXCLUDED_CONTENT_TYPES = (
+    "application/gzip", "application/x-gzip", "application/zip", "application/grpc", "text/event-stream",
+    "audio/*", "video/*", "image/avif", "image/gif", "image/jpeg", "image/png", "image/webp",
+    "font/woff", "font/woff2",
+    "application/vnd.apache.parquet",  # already compressed internally
+)
+# Bodies at least this large are compressed on the threadpool, not the event loop.
+THREAD_MINIMUM_SIZE = 128 * 1024
+
+
+def brotli_available() -> bool:
+    return brotli is not None
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """{'gzip': 1.0, 'br': 0.5, ...}; malformed q-values count as 0."""
+    accepted: Dict[str, float] = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def choose_encoding(header: str) -> Optional[str]:
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    br = accepted.get("br", wildcard) if brotli_available() else 0.0
+    gzip = accepted.get("gzip", wildcard)
+    if br > 0 and br >= gzip:
+        return "br"
+    if gzip > 0:
+        return "gzip"
+    return None
+
+
+def weak_etag(etag: str) -> str:
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+class _Encoder:
+    """Incremental br or gzip stream; process(..., final=True) ends it."""
+
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+        else:
+            self._br = None
+            self._gzip = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def _process(self, body: bytes, final: bool) -> bytes:
+        if self._br is not None:
+            return self._br.process(body) + (self._br.finish() if final else self._br.flush())
+        return self._gzip.compress(body) + self._gzip.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+    async def process(self, body: bytes, final: bool) -> bytes:
+        if len(body) >= THREAD_MINIMUM_SIZE:
+            return await run_in_threadpool(self._process, body, final)
+        return self._process(body, final)
+
+
+def _excluded(content_type: str) -> bool:
+    media_type = content_type.partition(";")[0].strip().lower()
+    return media_type in EXCLUDED_CONTENT_TYPES or media_type.partition("/")[0] + "/*" in EXCLUDED_CONTENT_TYPES
+
+
+def _set_header(headers: List[Tuple[bytes, bytes]], name: bytes, value: Optional[str]) -> None:
+    """Replace (or with value None, drop) every `name` header in a raw ASGI header list."""
+    headers[:] = [(k, v) for k, v in headers if k.lower() != name]
+    if value is not None:
+        headers.append((name, value.encode("latin-1")))
+
+
+def _add_vary(headers: List[Tuple[bytes, bytes]]) -> None:
+    vary = [v.decode("latin-1") for k, v in headers if k.lower() == b"vary"]
+    if not any("accept-encoding" in v.lower() or "*" in v for v in vary):
+        _set_header(headers, b"vary", ", ".join(vary + ["Accept-Encoding"]))
+
+
+class _Responder:
+    """Wraps one request's `send`: holds the start message until the first body decides the encoding."""
+
+    def __init__(self, send, encoding: Optional[str]):
+        self.send = send
+        self.encoding = encoding
+        self.start: Optional[dict] = None
+        self.passthrough = False
+        self.encoder: Optional[_Encoder] = None
+
+    async def __call__(self, message) -> None:
+        kind = message["type"]
+        if kind == "http.response.start":
+            headers = message["headers"] = list(message.get("headers", []))
+            names = {k.lower(): v for k, v in headers}
+            content_type = names.get(b"content-type", b"").decode("latin-1")
+            status = message["status"]
+            if b"content-encoding" in names or status == 206 or _excluded(content_type):
+                self.passthrough = True
+                await self.send(message)
+            elif status == 304:
+                # Describe the representation the client would have received, without a body to measure.
+                self.passthrough = True
+                _add_vary(headers)
+                if self.encoding and b"etag" in names:
+                    _set_header(headers, b"etag", weak_etag(names[b"etag"].decode("latin-1")))
+                await self.send(message)
+            else:
+                self.start = message
+            return
+        if kind != "http.response.body" or self.passthrough:
+            if self.start is not None:  # e.g. pathsend: sent untouched
+                await self.send(self.start)
+                self.start = None
+            await self.send(message)
+            return
+
+        body, more_body = message.get("body", b""), message.get("more_body", False)
+        if self.start is None:  # a later chunk of a compressed stream
+            if self.encoder is not None:
+                message["body"] = await self.encoder.process(body, final=not more_body)
+            await self.send(message)
+            return
+
+        start, self.start = self.start, None
+        headers = start["headers"]
+        _add_vary(headers)
+        if self.encoding is None or (len(body) < settings.COMPRESSION_MIN_SIZE and not more_body):
+            self.passthrough = True
+            await self.send(start)
+            await self.send(message)
+            return
+
+        self.encoder = _Encoder(self.encoding)
+        message["body"] = await self.encoder.process(body, final=not more_body)
+        _set_header(headers, b"content-encoding", self.encoding)
+        if more_body or start.get("trailers", False):
+            _set_header(headers, b"content-length", None)
+        else:
+            _set_header(headers, b"content-length", str(len(message["body"])))
+        etag = next((v.decode("latin-1") for k, v in headers if k.lower() == b"etag"), None)
+        if etag is not None:
+            _set_header(headers, b"etag", weak_etag(etag))
+        await self.send(start)
+        await self.send(message)
+
+
+class CompressionMiddleware:
+    """Compresses responses at or above COMPRESSION_MIN_SIZE with br or gzip."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.COMPRESSION_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        accept = next((v.decode("latin-1") for k, v in scope["headers"] if k == b"accept-encoding"), "")
+        await self.app(scope, receive, _Responder(send, choose_encoding(accept)))
@@ -0,0 +1,71 @@
+# app/conditional.py
+"""
+Conditional GET helpers (ETag / Last-Modified / 304).
+
+Validators come from cheap version lookups (Brief.version and updated_at,
+or the count and newest created_at of a property's SourceDatum rows), so a
+matching If-None-Match or If-Modified-Since is answered without loading or
+serializing the body.
+"""
+import zlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, List, Optional
+
+from fastapi import Request, Response
+
+
+def _utc(dt: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything is stored in UTC.
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+def projection_variant(fields: Optional[List[str]], exclude: Optional[List[str]]) -> str:
+    """ETag suffix distinguishing sparse-fieldset representations; empty for the full document."""
+    if not fields and not exclude:
+        return ""
+    key = f"f={','.join(fields or [])};x={','.join(exclude or [])}"
+    return f"-{zlib.crc32(key.encode()):08x}"
+
+
+def brief_etag(property_id: int, version: int, variant: str = "") -> str:
+    return f'"b{property_id}-{version}{variant}"'
+
+
+def sources_etag(property_id: int, count: int, newest: Optional[datetime], variant: str = "") -> str:
+    stamp = int(_utc(newest).timestamp() * 1_000_000) if newest else 0
+    return f'"s{property_id}-{count}-{stamp}{variant}"'
+
+
+def is_conditional(request: Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """RFC 9110 evaluation: If-None-Match wins over If-Modified-Since when both are sent."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have whole-second resolution.
+        return _utc(last_modified).replace(microsecond=0) <= _utc(since)
+    return False
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime]) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(_utc(last_modified), usegmt=True)
+    return headers
+
+
+def not_modified_response(etag: str, last_modified: Optional[datetime]) -> Response:
+    return Response(status_code=304, headers=validator_headers(etag, last_modified))
@@ -3,6 +3,56 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     DATABASE_URL: str = "sqlite:///./app.db"  # or "sqlite:///:memory:" for quick tests
     OPENAI_API_KEY: str = ""
+    SUMMARY_MAX_CONTRIBUTIONS: int = 10  # newest contributions considered for the ai_summary prompt
+    SUMMARY_INPUT_TOKENS: int = 600  # ai_summary prompt budget; contributions are dropped to fit
+    SUMMARY_MAX_OUTPUT_TOKENS: int = 400  # max_tokens for the summary completion
+    ASYNC_MODE: bool = False  # serve property endpoints from app/routers/async_api.py (aiosqlite + httpx)
+    ASYNC_DATABASE_URL: str = ""  # defaults to DATABASE_URL on the aiosqlite driver
+    MOCK_ADAPTER_LATENCY_MS: float = 0.0  # simulated provider latency for load tests
+    ADAPTER_FIXTURE_PATH: str = ""  # generated fixture file (app/adapters/fixtures.py) the mock adapters answer from
+    INGEST_DEADLINE_MS: float = 3000.0  # ingest answers with a partial brief after this; 0 waits for every adapter
+    ADAPTER_POOL_SIZE: int = 16  # threads running adapter calls for deadline-bound ingests
+    ADAPTER_TIMEOUT_S: float = 60.0  # longest a background job waits for a straggling adapter
+    METRICS_ENABLED: bool = True  # record latency histograms and counters served on /metrics
+    SLOW_QUERY_MS: float = 100.0  # log statements (with parameters) slower than this
+    N_PLUS_ONE_THRESHOLD: int = 5  # warn when one statement repeats this often in a request
+    QUERY_STATS_HEADERS: bool = True  # add X-DB-Query-Count / X-DB-Query-Time-Ms to responses
+    ADMIN_TOKEN: str = ""  # enables admin-only features (X-Admin-Token); empty disables them
+    PROFILE_SAMPLE_RATE: float = 0.0  # fraction of requests/jobs profiled with the stack sampler
+    PROFILE_DIR: str = "./profiles"
+    PROFILE_MAX_CONCURRENT: int = 1  # profiles beyond this run unprofiled
+    PROFILE_INTERVAL_MS: float = 5.0  # stack sampler period
+    PROFILE_MAX_SECONDS: float = 10.0  # the stack sampler stops after this long; cProfile at the next SQL statement or adapter call
+    ADMISSION_ENABLED: bool = True  # rate/concurrency limits on ingest, refresh and ai_summary
+    RATE_LIMIT_BURST: int = 10  # token bucket capacity per client and route class
+    RATE_LIMIT_INGEST_PER_MIN: float = 60.0  # per client (X-API-Key or IP); 0 disables
+    RATE_LIMIT_REFRESH_PER_MIN: float = 30.0
+    RATE_LIMIT_AI_SUMMARY_PER_MIN: float = 10.0
+    ADMISSION_API_KEYS: str = ""  # comma-separated X-API-Key values rate-limited per key; other callers per peer address
+    ADMISSION_TRUSTED_PROXIES: str = ""  # comma-separated proxy IPs/CIDRs whose X-Forwarded-For names the client; empty uses the peer
+    MAX_CONCURRENT_INGEST: int = 8  # across all clients; 0 disables
+    MAX_CONCURRENT_REFRESH: int = 4
+    MAX_CONCURRENT_AI_SUMMARY: int = 4
+    LEASE_TTL_S: float = 30.0  # single-flight lease lifetime; also the longest a worker waits on another's
+    LEASE_POLL_MS: float = 50.0  # how often a waiting worker re-checks another worker's lease
+    ADMISSION_RETRY_AFTER_S: float = 1.0  # Retry-After sent with 503 when a route class is saturated
+    COMPRESSION_ENABLED: bool = True  # br (with the brotli package) or gzip, per Accept-Encoding
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes; smaller responses are sent uncompressed
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # 0-11; low values keep CPU per response small
+    LAZY_BRIEFS: bool = False  # background source writes skip the merge; briefs are rebuilt on read or by the compactor
+    BRIEF_COMPACT_INTERVAL_S: float = 5.0  # how often the compactor merges stale, recently read briefs; 0 disables it
+    BRIEF_COMPACT_BATCH: int = 200  # most-read properties checked per compaction
+    SHARD_COUNT: int = 0  # >0 spreads properties over this many SQLite files; DATABASE_URL becomes the catalog
+    SHARD_URL_TEMPLATE: str = "sqlite:///./shards/shard{n}.db"  # {n} is the shard index
+    AUTO_MIGRATE: bool = True  # run app.migrate at worker startup; turn off once deploys run `python -m app.migrate`
+    SHARED_CACHE_PATH: str = ""  # host-wide brief/sources response cache file shared by all workers; empty disables it
+    SHARED_CACHE_MAX_ENTRIES: int = 100000  # oldest-written entries beyond this are evicted
+    WEBHOOK_MAX_BATCH: int = 5000  # most updates accepted in one POST /webhooks/source-batch
+    WEBHOOK_MAX_BYTES: int = 16 * 1024 * 1024  # largest source-batch body; larger ones get 413 before they are read
+    BRIEF_SNAPSHOT_EVERY: int = 20  # brief history stores every field once per this many changes, deltas in between
+    CARDS_MAX_IDS: int = 200  # most property ids accepted by one GET /properties/cards
+    SEARCH_RANK_WINDOW: int = 10000  # relevance search ranks the newest N matches, then lists older ones by id; 0 ranks all
     
     class Config:
         env_file = ".env"
@@ -1,32 +1,125 @@
+from datetime import datetime, timezone
 from typing import List, Optional, Tuple, Dict, Any
 from sqlmodel import select
-from .models import Item, Property, SourceDatum, Brief, Contribution
-from sqlalchemy import func
-from .utils import now_utc
+from .models import (
+    Item, Property, SourceDatum, Brief, BriefChange, BriefHistory, Contribution, ContributionStats, FieldIssue,
+    DisputeStats
+)
+from sqlalchemy import func, insert, update, bindparam, text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from .cards import build_card, fallback_text
+from .config import settings
+from .search import TITLE_WEIGHT, match_query
+from .sharedcache import touch
+from .utils import now_utc, SOURCE_PRIORITY
 import json
 
 
-def list_items(session, q: Optional[str], page: int, limit: int) -> Tuple[List[Item], int]:
+def list_items(
+    session, q: Optional[str], limit: int, cursor: Optional[str] = None, sort: str = "relevance", count: bool = False
+) -> Tuple[List[Item], Optional[str], Optional[int]]:
+    """One page of items: (rows, next_cursor, total).
+
+    Without `q`, items come newest first by (created_at, id). With `q` and
+    sort="recent", matches come newest first by id, the FTS rowid. With `q`
+    and sort="relevance", the newest SEARCH_RANK_WINDOW matches are ranked by
+    bm25 (title hits weigh more), and any older matches follow them newest
+    first. `cursor` is the previous page's next_cursor;
+    next_cursor is None on the last page. `total` is only counted when asked
+    for. Raises ValueError for a malformed cursor.
+    """
+    match = match_query(q)
+    if match is None:
+        return _recent_items(session, limit, cursor, count)
+    if sort == "relevance":
+        return _ranked_items(session, match, limit, cursor, count)
+    try:
+        before = int(cursor) if cursor else None
+    except ValueError:
+        raise ValueError("malformed cursor")
+    # rowid-ordered FTS scans stop after `limit` matches, however common the terms are
+    ids = [row[0] for row in session.connection().execute(
+        text("SELECT rowid FROM item_fts WHERE item_fts MATCH :q AND rowid < :before ORDER BY rowid DESC LIMIT :limit"),
+        {"q": match, "before": before if before is not None else 2 ** 63 - 1, "limit": limit},
+    )]
+    total = _match_count(session, match) if count else None
+    next_cursor = str(ids[-1]) if len(ids) == limit else None
+    return _items_in_order(session, ids), next_cursor, total
+
+def _recent_items(session, limit: int, cursor: Optional[str], count: bool):
+    # Cursor "created_at|id" of the last row; served from ix_item_created_id in both directions
     stmt = select(Item)
-    if q:
-        q_like = f"%{q.lower()}%"
-        # SQLite has no ILIKE; use lower(..) LIKE lower(..)
+    if cursor:
+        try:
+            created_at, before = cursor.rsplit("|", 1)
+            created_at, before = datetime.fromisoformat(created_at), int(before)
+        except ValueError:
+            raise ValueError("malformed cursor")
         stmt = stmt.where(
-            func.lower(Item.title).like(q_like) |
-            func.lower(Item.body).like(q_like)
+            (Item.created_at < created_at) | ((Item.created_at == created_at) & (Item.id < before))
         )
-    # total count via a subquery
-    total = session.exec(
-        select(func.count()).select_from(stmt.subquery())
-    ).one()
+    rows = session.exec(stmt.order_by(Item.created_at.desc(), Item.id.desc()).limit(limit)).all()
+    total = session.exec(select(func.count()).select_from(Item)).one() if count else None
+    next_cursor = f"{rows[-1].created_at.isoformat()}|{rows[-1].id}" if len(rows) == limit else None
+    return rows, next_cursor, total
 
-    rows = session.exec(
-        stmt.order_by(Item.created_at.desc())
-            .offset((page - 1) * limit)
-            .limit(limit)
-    ).all()
-    return rows, total
+def _ranked_items(session, match: str, limit: int, cursor: Optional[str], count: bool):
+    # Cursor "floor:score:id" while in the ranked window: the window's lowest rowid, then the last row's
+    # position in (score, id) order. Past the window, "floor:before" pages the older matches newest first.
+    before = None
+    if cursor:
+        try:
+            parts = cursor.split(":")
+            if len(parts) == 2:
+                floor, before = int(parts[0]), int(parts[1])
+            else:
+                floor, score, after = int(parts[0]), float(parts[1]), int(parts[2])
+        except (ValueError, IndexError):
+            raise ValueError("malformed cursor")
+    else:
+        floor, score, after = 0, float("-inf"), 0
+        if settings.SEARCH_RANK_WINDOW > 0:
+            floor = session.connection().execute(
+                text("SELECT rowid FROM item_fts WHERE item_fts MATCH :q ORDER BY rowid DESC LIMIT 1 OFFSET :n"),
+                {"q": match, "n": settings.SEARCH_RANK_WINDOW - 1},
+            ).scalar() or 0
+    ids, next_cursor = [], None
+    if before is None:
+        rows = session.connection().execute(
+            text(
+                "SELECT id, score FROM ("
+                " SELECT rowid AS id, bm25(item_fts, :title_weight, 1.0) AS score"
+                " FROM item_fts WHERE item_fts MATCH :q AND rowid >= :floor"
+                ") WHERE score > :score OR (score = :score AND id > :after) ORDER BY score, id LIMIT :limit"
+            ),
+            {"q": match, "title_weight": TITLE_WEIGHT, "floor": floor, "score": score, "after": after, "limit": limit},
+        ).all()
+        ids = [row[0] for row in rows]
+        if len(rows) == limit:
+            next_cursor = f"{floor}:{rows[-1][1]!r}:{rows[-1][0]}"
+        before = floor
+    if next_cursor is None and floor > 0:
+        # Matches older than the window are not ranked, but stay reachable after it
+        older = [row[0] for row in session.connection().execute(
+            text("SELECT rowid FROM item_fts WHERE item_fts MATCH :q AND rowid < :before ORDER BY rowid DESC LIMIT :limit"),
+            {"q": match, "before": before, "limit": limit - len(ids)},
+        )]
+        ids += older
+        if len(ids) == limit:
+            next_cursor = f"{floor}:{ids[-1]}"
+    total = _match_count(session, match) if count else None
+    return _items_in_order(session, ids), next_cursor, total
+
+def _match_count(session, match: str) -> int:
+    return session.connection().execute(
+        text("SELECT count(*) FROM item_fts WHERE item_fts MATCH :q"), {"q": match}
+    ).scalar()
 
+def _items_in_order(session, ids: List[int]) -> List[Item]:
+    if not ids:
+        return []
+    items = {item.id: item for item in session.exec(select(Item).where(Item.id.in_(ids)))}
+    return [items[i] for i in ids if i in items]
 
 def get_item(session, item_id: int) -> Optional[Item]:
     return session.get(Item, item_id)
@@ -45,43 +138,41 @@ def delete_item(session, item: Item) -> None:
     session.delete(item); session.commit()
 
 # Property CRUD operations
+def _refresh(session, obj) -> None:
+    # Sessions that keep objects loaded across commits (the ASYNC_MODE sessions in app/async_deps.py) need no reload
+    if session.expire_on_commit:
+        session.refresh(obj)
+
 def get_property_by_address(session, normalized_address: str) -> Optional[Property]:
     stmt = select(Property).where(Property.normalized_address == normalized_address)
     return session.exec(stmt).first()
 
-def create_or_update_property(session, normalized_address: str, raw_address: str) -> Property:
-    """Upsert property - create if not exists, update if exists."""
+def create_or_update_property(session, normalized_address: str, raw_address: str, property_id: Optional[int] = None) -> Property:
+    """Upsert property - create if not exists, update if exists. `property_id` is the catalog's id when sharded."""
     property = get_property_by_address(session, normalized_address)
     if property:
         property.raw_address = raw_address
         property.updated_at = now_utc()
     else:
-        property = Property(normalized_address=normalized_address, raw_address=raw_address)
+        property = Property(id=property_id, normalized_address=normalized_address, raw_address=raw_address)
         session.add(property)
     session.commit()
-    session.refresh(property)
+    _refresh(session, property)
     return property
 
 def get_property(session, property_id: int) -> Optional[Property]:
     return session.get(Property, property_id)
 
 # SourceDatum CRUD operations
-def upsert_source_datum(session, property_id: int, source_name: str, data: Dict[str, Any]) -> SourceDatum:
+def upsert_source_datum(session, property_id: int, source_name: str, data: Dict[str, Any], commit: bool = True) -> SourceDatum:
     """Upsert source datum - update if exists, create if not."""
-    stmt = select(SourceDatum).where(
-        SourceDatum.property_id == property_id,
-        SourceDatum.source_name == source_name
-    )
-    existing = session.exec(stmt).first()
+    existing = get_source_datum(session, property_id, source_name)
     
     if existing:
         # Update existing record
         existing.data = json.dumps(data)
         existing.created_at = now_utc()
-        session.add(existing)
-        session.commit()
-        session.refresh(existing)
-        return existing
+        source_datum = existing
     else:
         # Create new record
         source_datum = SourceDatum(
@@ -89,10 +180,61 @@ def upsert_source_datum(session, property_id: int, source_name: str, data: Dict[
             source_name=source_name,
             data=json.dumps(data)
         )
-        session.add(source_datum)
+    session.add(source_datum)
+    touch(session, property_id)
+    if commit:
         session.commit()
-        session.refresh(source_datum)
-        return source_datum
+        _refresh(session, source_datum)
+    else:
+        session.flush()
+    return source_datum
+
+def bulk_upsert_properties(
+    session, raw_addresses: Dict[str, str], property_ids: Optional[Dict[str, int]] = None
+) -> Dict[str, int]:
+    """Insert missing properties ({normalized: raw}) with one executemany; returns {normalized: id}. Does not commit.
+
+    `property_ids` maps normalized addresses to catalog-assigned ids when sharded.
+    """
+    if not raw_addresses:
+        return {}
+    now = now_utc()
+    session.exec(
+        sqlite_insert(Property.__table__).on_conflict_do_nothing(index_elements=["normalized_address"]),
+        params=[
+            {"normalized_address": normalized, "raw_address": raw, "created_at": now, "updated_at": now,
+             **({"id": property_ids[normalized]} if property_ids else {})}
+            for normalized, raw in raw_addresses.items()
+        ],
+    )
+    return dict(session.exec(
+        select(Property.normalized_address, Property.id).where(Property.normalized_address.in_(list(raw_addresses)))
+    ).all())
+
+def bulk_upsert_source_data(session, rows: List[Tuple[int, str, Dict[str, Any]]]) -> None:
+    """Upsert many (property_id, source_name, payload) rows with one executemany. Does not commit."""
+    if not rows:
+        return
+    now = now_utc()
+    stmt = sqlite_insert(SourceDatum.__table__)
+    session.exec(
+        stmt.on_conflict_do_update(
+            index_elements=["property_id", "source_name"],
+            set_={"data": stmt.excluded.data, "created_at": stmt.excluded.created_at},
+        ),
+        params=[
+            {"property_id": property_id, "source_name": source_name, "data": json.dumps(payload), "created_at": now}
+            for property_id, source_name, payload in rows
+        ],
+    )
+    touch(session, *{property_id for property_id, _, _ in rows})
+
+def get_source_datum(session, property_id: int, source_name: str) -> Optional[SourceDatum]:
+    stmt = select(SourceDatum).where(
+        SourceDatum.property_id == property_id,
+        SourceDatum.source_name == source_name
+    )
+    return session.exec(stmt).first()
 
 def create_source_datum(session, property_id: int, source_name: str, data: Dict[str, Any]) -> SourceDatum:
     """Legacy function - use upsert_source_datum instead."""
@@ -122,35 +264,447 @@ def get_source_data(session, property_id: int) -> List[SourceDatum]:
     
     return session.exec(stmt).all()
 
+def project_json(column, fields: Optional[List[str]] = None, exclude: Optional[List[str]] = None):
+    """SQL expression for the JSON document in `column` reduced to `fields`, or without `exclude`.
+
+    Runs in SQLite (json_extract/json_object, json_remove), so only the
+    projected document reaches Python. Requested fields that are missing come
+    back as null. Field names must already be validated as identifiers.
+    """
+    if fields:
+        args = []
+        for field in fields:
+            args += [field, func.json_extract(column, f"$.{field}")]
+        return func.json_object(*args)
+    if exclude:
+        return func.json_remove(column, *[f"$.{field}" for field in exclude])
+    return column
+
+def get_source_data_projected(session, property_id: int, fields: Optional[List[str]] = None, exclude: Optional[List[str]] = None):
+    """Rows of (id, property_id, source_name, data, created_at) with `data` projected as in project_json."""
+    stmt = (
+        select(SourceDatum.id, SourceDatum.property_id, SourceDatum.source_name,
+               project_json(SourceDatum.data, fields, exclude).label("data"), SourceDatum.created_at)
+        .where(SourceDatum.property_id == property_id)
+        .order_by(SourceDatum.source_name)
+    )
+    return session.exec(stmt).all()
+
+def get_sources_version(session, property_id: int) -> Tuple[int, Optional[datetime]]:
+    """(row count, newest created_at) of a property's source data; changes on every upsert."""
+    stmt = select(func.count(SourceDatum.id), func.max(SourceDatum.created_at)).where(
+        SourceDatum.property_id == property_id
+    )
+    return tuple(session.exec(stmt).one())
+
 # Brief CRUD operations
-def create_or_update_brief(session, property_id: int, data: Dict[str, Any], completeness_score: int) -> Brief:
-    """Upsert brief - create if not exists, update if exists."""
+def changed_fields(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> List[str]:
+    """Top-level brief fields that differ; every field for a new brief. `_metadata` is ignored."""
+    keys = set(new) | set(old or {})
+    keys.discard("_metadata")
+    if old is None:
+        return sorted(keys)
+    return sorted(k for k in keys if old.get(k) != new.get(k))
+
+def _facts(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {k: v for k, v in data.items() if k != "_metadata"}
+
+def brief_history_rows(
+    property_id: int, old: Optional[Dict[str, Any]], new: Dict[str, Any], changed: List[str], version: int,
+    history_deltas: Optional[int], created_at: datetime, old_version: int = 0, old_at: Optional[datetime] = None,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """BriefHistory rows for one brief change, and the brief's new history_deltas.
+
+    Each row stores the changed fields; every BRIEF_SNAPSHOT_EVERY-th row
+    (and a brief's first) also stores every field, so rebuilding any version
+    replays at most that many deltas. A brief written before history existed
+    first gets a snapshot of its old data, dated its last update.
+    """
+    rows = []
+    if history_deltas is None and old is not None:
+        facts = _facts(old)
+        rows.append({"property_id": property_id, "version": old_version, "delta": json.dumps({"set": facts}),
+                     "snapshot": json.dumps(facts), "created_at": old_at or created_at})
+        history_deltas = 0
+    delta: Dict[str, Any] = {"set": {k: new[k] for k in changed if k in new}}
+    unset = [k for k in changed if k not in new]
+    if unset:
+        delta["unset"] = unset
+    snapshot = history_deltas is None or history_deltas + 1 >= settings.BRIEF_SNAPSHOT_EVERY
+    rows.append({"property_id": property_id, "version": version, "delta": json.dumps(delta),
+                 "snapshot": json.dumps(_facts(new)) if snapshot else None, "created_at": created_at})
+    return rows, 0 if snapshot else history_deltas + 1
+
+def sources_changed_at():
+    """Newest SourceDatum.created_at of the brief's property, as a subquery correlated with Brief."""
+    return (
+        select(func.max(SourceDatum.created_at))
+        .where(SourceDatum.property_id == Brief.property_id)
+        .scalar_subquery()
+    )
+
+def is_stale(sources_as_of: Optional[datetime], changed_at: Optional[datetime]) -> bool:
+    """True when a source row is newer than what the brief was merged from (or the watermark is unknown)."""
+    return sources_as_of is None or (changed_at is not None and changed_at > sources_as_of)
+
+def create_or_update_brief(
+    session, property_id: int, data: Dict[str, Any], completeness_score: int, commit: bool = True,
+    sources_as_of: Optional[datetime] = None,
+) -> Brief:
+    """Upsert brief - create if not exists, update if exists.
+
+    Bulk callers pass commit=False and commit once for the whole batch.
+    `sources_as_of` is the newest source row merged into `data`; patches that
+    are not full merges leave it unset, so the next read re-merges.
+    """
     stmt = select(Brief).where(Brief.property_id == property_id)
     brief = session.exec(stmt).first()
     
+    old_data = json.loads(brief.data) if brief else None
+    changed = changed_fields(old_data, data)
+    if changed:
+        session.add(BriefChange(property_id=property_id, changed_fields=json.dumps(changed)))
+    
+    now = now_utc()
+    conflicts = field_conflicts(data)
     if brief:
+        history = brief_history_rows(property_id, old_data, data, changed, brief.version + 1, brief.history_deltas,
+                                     now, brief.version, brief.updated_at) if changed else None
         brief.data = json.dumps(data)
         brief.completeness_score = completeness_score
-        brief.updated_at = now_utc()
+        brief.version += 1
+        brief.updated_at = now
+        if sources_as_of is not None:
+            brief.sources_as_of = sources_as_of
     else:
+        history = brief_history_rows(property_id, None, data, changed, 1, None, now) if changed else None
         brief = Brief(
             property_id=property_id,
             data=json.dumps(data),
-            completeness_score=completeness_score
+            completeness_score=completeness_score,
+            sources_as_of=sources_as_of,
+            updated_at=now,
         )
         session.add(brief)
+    brief.card = build_card(property_id, data, completeness_score, len(conflicts))
+    brief.fallback_summary = fallback_text(data)
+    if history:
+        rows, brief.history_deltas = history
+        session.add_all(BriefHistory(**row) for row in rows)
     
-    session.commit()
-    session.refresh(brief)
+    if conflicts != field_conflicts(old_data):
+        session.flush()
+        sync_field_issues(session, brief.id, property_id, conflicts)
+    
+    touch(session, property_id)
+    
+    if commit:
+        session.commit()
+        _refresh(session, brief)
+    else:
+        session.flush()
     return brief
 
+def bulk_upsert_briefs(
+    session, briefs: Dict[int, Tuple[Dict[str, Any], int]], sources_as_of: Optional[Dict[int, datetime]] = None
+) -> None:
+    """Upsert many briefs ({property_id: (data, completeness_score)}) without committing.
+
+    Bulk counterpart of create_or_update_brief: one lookup query plus one
+    executemany INSERT and one executemany UPDATE, with no ORM objects.
+    """
+    sources_as_of = sources_as_of or {}
+    if not briefs:
+        return
+    touch(session, *briefs)
+    existing = {
+        row[0]: row[1:]
+        for row in session.exec(
+            select(Brief.property_id, Brief.id, Brief.data, Brief.version, Brief.history_deltas, Brief.updated_at)
+            .where(Brief.property_id.in_(list(briefs)))
+        )
+    }
+    now = now_utc()
+    inserts, updates, changes, history, issues = [], [], [], [], {}
+    for property_id, (data, completeness_score) in briefs.items():
+        brief_id, old_data, version, history_deltas, updated_at = existing.get(property_id, (None, None, 0, None, None))
+        old_data = json.loads(old_data) if old_data else None
+        changed = changed_fields(old_data, data)
+        conflicts = field_conflicts(data)
+        if conflicts != field_conflicts(old_data):
+            issues[property_id] = conflicts
+        if changed:
+            changes.append({"property_id": property_id, "changed_fields": json.dumps(changed), "created_at": now})
+            rows, history_deltas = brief_history_rows(
+                property_id, old_data, data, changed, version + 1, history_deltas, now, version, updated_at
+            )
+            history.extend(rows)
+        derived = {"card": build_card(property_id, data, completeness_score, len(conflicts)),
+                   "fallback_summary": fallback_text(data)}
+        if brief_id is not None:
+            updates.append({"b_id": brief_id, "data": json.dumps(data), "completeness_score": completeness_score,
+                            "updated_at": now, "sources_as_of": sources_as_of.get(property_id),
+                            "history_deltas": history_deltas, **derived})
+        else:
+            inserts.append({"property_id": property_id, "data": json.dumps(data),
+                            "completeness_score": completeness_score, "version": 1, "created_at": now, "updated_at": now,
+                            "sources_as_of": sources_as_of.get(property_id), "history_deltas": history_deltas, **derived})
+    table = Brief.__table__
+    if inserts:
+        session.exec(insert(table), params=inserts)
+    if updates:
+        session.exec(
+            update(table).where(table.c.id == bindparam("b_id")).values(
+                data=bindparam("data"), completeness_score=bindparam("completeness_score"),
+                version=table.c.version + 1, updated_at=bindparam("updated_at"),
+                sources_as_of=bindparam("sources_as_of"), history_deltas=bindparam("history_deltas"),
+                card=bindparam("card"), fallback_summary=bindparam("fallback_summary"),
+            ),
+            params=updates,
+        )
+    if changes:
+        session.exec(insert(BriefChange.__table__), params=changes)
+        session.exec(insert(BriefHistory.__table__), params=history)
+    if issues:
+        brief_ids = {property_id: existing[property_id][0] for property_id in issues if property_id in existing}
+        inserted = [property_id for property_id in issues if property_id not in brief_ids]
+        if inserted:
+            brief_ids.update(session.exec(
+                select(Brief.property_id, Brief.id).where(Brief.property_id.in_(inserted))
+            ).all())
+        for property_id, conflicts in issues.items():
+            sync_field_issues(session, brief_ids[property_id], property_id, conflicts)
+
+def naive_utc(dt: datetime) -> datetime:
+    """`dt` as the naive UTC datetime timestamps are stored as; naive input is taken to be UTC already."""
+    return dt.astimezone(timezone.utc).replace(tzinfo=None) if dt.tzinfo else dt
+
+def brief_as_of(session, property_id: int, as_of: datetime) -> Optional[Tuple[Dict[str, Any], int, datetime]]:
+    """(fields, version, changed_at) of the brief as it stood at `as_of`, or None before its history starts.
+
+    Starts from the newest snapshot at or before `as_of` and replays the
+    deltas after it, which are fewer than BRIEF_SNAPSHOT_EVERY.
+    """
+    as_of = naive_utc(as_of)
+    base = session.exec(
+        select(BriefHistory.id, BriefHistory.version, BriefHistory.snapshot, BriefHistory.created_at)
+        .where(BriefHistory.property_id == property_id, BriefHistory.snapshot.is_not(None),
+               BriefHistory.created_at <= as_of)
+        .order_by(BriefHistory.id.desc()).limit(1)
+    ).first()
+    if base is None:
+        return None
+    base_id, version, snapshot, changed_at = base
+    data = json.loads(snapshot)
+    # Rows are in write order, so the first one past as_of ends the replay
+    deltas = session.exec(
+        select(BriefHistory.version, BriefHistory.delta, BriefHistory.created_at)
+        .where(BriefHistory.property_id == property_id, BriefHistory.id > base_id)
+        .order_by(BriefHistory.id)
+        .execution_options(yield_per=settings.BRIEF_SNAPSHOT_EVERY)
+    )
+    for row_version, delta, created_at in deltas:
+        if created_at > as_of:
+            break
+        delta = json.loads(delta)
+        data.update(delta["set"])
+        for field in delta.get("unset", []):
+            data.pop(field, None)
+        version, changed_at = row_version, created_at
+    deltas.close()
+    return data, version, changed_at
+
+def list_brief_history(
+    session, property_id: int, field: Optional[str], after: int, limit: int
+) -> List[Tuple[int, int, Dict[str, Any], datetime]]:
+    """(id, version, delta, created_at) of the property's brief changes after `after`, oldest first.
+
+    With `field`, only changes to that field, with the delta narrowed to it.
+    """
+    stmt = select(BriefHistory.id, BriefHistory.version, BriefHistory.delta, BriefHistory.created_at).where(
+        BriefHistory.property_id == property_id, BriefHistory.id > after
+    )
+    if field is None:
+        return [(id, version, json.loads(delta), created_at)
+                for id, version, delta, created_at in session.exec(stmt.order_by(BriefHistory.id).limit(limit))]
+    # The LIKE prefilter can match values too; the decoded delta decides
+    stmt = stmt.where(BriefHistory.delta.contains(json.dumps(field), autoescape=True)).order_by(BriefHistory.id)
+    rows = session.exec(stmt.execution_options(yield_per=limit))
+    page = []
+    for id, version, delta, created_at in rows:
+        delta = json.loads(delta)
+        if field in delta["set"]:
+            page.append((id, version, {"set": {field: delta["set"][field]}}, created_at))
+        elif field in delta.get("unset", []):
+            page.append((id, version, {"set": {}, "unset": [field]}, created_at))
+        if len(page) == limit:
+            break
+    rows.close()
+    return page
+
+def get_cards(session, property_ids: List[int]) -> Tuple[Dict[int, str], List[int]]:
+    """({property_id: card JSON}, stale ids) for the ids that have a brief, in one query.
+
+    The stale ids (is_stale) are for the caller to re-merge and ask for again.
+    Briefs not rewritten since cards were added have none stored; theirs are
+    built here.
+    """
+    rows = session.exec(
+        select(Brief.property_id, Brief.card, Brief.sources_as_of, sources_changed_at())
+        .where(Brief.property_id.in_(property_ids))
+    ).all()
+    stale = [
+        property_id for property_id, _, as_of, changed_at in rows
+        if changed_at is not None and is_stale(as_of, changed_at)  # without source rows there is nothing to merge
+    ]
+    rows = [(property_id, card) for property_id, card, _, _ in rows]
+    cards = {property_id: card for property_id, card in rows if card is not None}
+    unbuilt = [property_id for property_id, card in rows if card is None]
+    if unbuilt:
+        for property_id, data, completeness_score in session.exec(
+            select(Brief.property_id, Brief.data, Brief.completeness_score).where(Brief.property_id.in_(unbuilt))
+        ):
+            data = json.loads(data)
+            cards[property_id] = build_card(property_id, data, completeness_score, len(field_conflicts(data)))
+    return cards, stale
+
+def field_conflicts(data: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """{field: {source: value}} for the conflicts recorded in a brief's _metadata."""
+    if not data:
+        return {}
+    return {c["field"]: c["values"] for c in data.get("_metadata", {}).get("conflicts", [])}
+
+def _issue_sources(values: Dict[str, Any]) -> str:
+    return "," + ",".join(sorted(values)) + ","
+
+def sync_field_issues(session, brief_id: int, property_id: int, conflicts: Dict[str, Dict[str, Any]]) -> None:
+    """Open, update and resolve the brief's FieldIssue rows to match `conflicts`. Does not commit.
+
+    Callers only invoke this when the brief's conflicts changed, so unchanged
+    merges cost nothing here.
+    """
+    rows = {row.field_name: row for row in session.exec(select(FieldIssue).where(FieldIssue.brief_id == brief_id))}
+    now = now_utc()
+    for field, values in conflicts.items():
+        sources = _issue_sources(values)
+        row = rows.get(field)
+        if row is None:
+            row = FieldIssue(brief_id=brief_id, property_id=property_id, field_name=field, conflicting_values="",
+                             confidence_scores="", created_at=now)
+            bump_dispute_stats(session, field, sources, open=1, total=1)
+        elif row.status != "open":
+            bump_dispute_stats(session, field, sources, open=1, total=1)
+        elif row.sources != sources:
+            bump_dispute_stats(session, field, row.sources, open=-1)
+            bump_dispute_stats(session, field, sources, open=1, total=1)
+        row.conflicting_values = json.dumps(values)
+        row.confidence_scores = json.dumps({source: SOURCE_PRIORITY.get(source, 0) for source in values})
+        row.sources = sources
+        row.status = "open"
+        row.updated_at = now
+        row.resolved_at = None
+        session.add(row)
+    for field, row in rows.items():
+        if field not in conflicts and row.status == "open":
+            row.status = "resolved"
+            row.updated_at = row.resolved_at = now
+            session.add(row)
+            bump_dispute_stats(session, field, row.sources, open=-1)
+
+def bump_dispute_stats(session, field: str, sources: str, **deltas: int) -> None:
+    """Adjust the (field, sources) dispute counters in one upsert; e.g. open=-1. Does not commit."""
+    table = DisputeStats.__table__
+    values = {"field_name": field, "sources": sources, "open": 0, "total": 0}
+    values.update(deltas)
+    session.exec(
+        sqlite_insert(table).values(**values).on_conflict_do_update(
+            index_elements=["field_name", "sources"],
+            set_={name: table.c[name] + delta for name, delta in deltas.items()},
+        )
+    )
+
+def list_field_issues(
+    session, field: Optional[str] = None, source: Optional[str] = None, status: str = "open",
+    after_id: int = 0, limit: int = 50,
+) -> List[FieldIssue]:
+    """FieldIssue rows with id > after_id, oldest first.
+
+    The (field_name, status, id) or, without a field, the (status, id) index
+    narrows the scan and yields id order, so it stops after `limit` matches.
+    The source is checked on those rows only: every issue involves at least
+    two of the few sources, so a per-source index would select most rows anyway.
+    """
+    stmt = select(FieldIssue).where(FieldIssue.status == status, FieldIssue.id > after_id)
+    if field:
+        stmt = stmt.where(FieldIssue.field_name == field)
+    if source:
+        stmt = stmt.where(FieldIssue.sources.contains(f",{source},"))
+    return session.exec(stmt.order_by(FieldIssue.id).limit(limit)).all()
+
+def get_dispute_stats(session, field: Optional[str] = None, source: Optional[str] = None) -> List[DisputeStats]:
+    """Counter rows, narrowed by the (field_name, sources) key first; one row per field and source set."""
+    stmt = select(DisputeStats)
+    if field:
+        stmt = stmt.where(DisputeStats.field_name == field)
+    if source:
+        stmt = stmt.where(DisputeStats.sources.contains(f",{source},"))
+    return session.exec(stmt.order_by(DisputeStats.field_name, DisputeStats.sources)).all()
+
 def get_brief(session, property_id: int) -> Optional[Brief]:
     stmt = select(Brief).where(Brief.property_id == property_id)
     return session.exec(stmt).first()
 
+def get_brief_projected(session, property_id: int, fields: Optional[List[str]] = None, exclude: Optional[List[str]] = None):
+    """The brief row with `data` projected as in project_json, or None.
+
+    Also selects `sources_as_of` and `sources_changed_at` for is_stale().
+    """
+    stmt = select(
+        Brief.id, Brief.property_id, project_json(Brief.data, fields, exclude).label("data"),
+        Brief.completeness_score, Brief.version, Brief.created_at, Brief.updated_at,
+        Brief.sources_as_of, sources_changed_at().label("sources_changed_at"),
+    ).where(Brief.property_id == property_id)
+    return session.exec(stmt).first()
+
+def get_brief_version(session, property_id: int) -> Optional[Tuple[int, datetime]]:
+    """(version, updated_at) of a property's brief without loading its data; None if missing or stale."""
+    stmt = select(Brief.version, Brief.updated_at).where(
+        Brief.property_id == property_id, Brief.sources_as_of >= sources_changed_at()
+    )
+    return session.exec(stmt).first()
+
+def list_brief_changes(session, after: int, limit: int) -> List[BriefChange]:
+    """Change log entries with seq > after, oldest first."""
+    stmt = select(BriefChange).where(BriefChange.seq > after).order_by(BriefChange.seq).limit(limit)
+    return session.exec(stmt).all()
+
 # Contribution CRUD operations
-def create_contribution(session, property_id: int, field: str, proposed_value: str, reason: str, contributor: str) -> Contribution:
+CONTRIBUTION_STATUSES = ("pending", "accepted", "rejected")
+
+def bump_contribution_stats(session, property_id: int, field: str, accepted_value: Optional[str] = None, **deltas: int) -> None:
+    """Adjust the per-field counters in one upsert; e.g. pending=-1, accepted=1. Does not commit."""
+    table = ContributionStats.__table__
+    now = now_utc()
+    values = {"property_id": property_id, "field": field, "last_contribution_at": now,
+              "pending": 0, "accepted": 0, "rejected": 0, "accepted_value": accepted_value}
+    values.update(deltas)
+    set_ = {name: table.c[name] + delta for name, delta in deltas.items()}
+    if accepted_value is not None:
+        set_["accepted_value"] = accepted_value
+    if "pending" in deltas and deltas["pending"] > 0:
+        set_["last_contribution_at"] = now
+    session.exec(
+        sqlite_insert(table).values(**values).on_conflict_do_update(
+            index_elements=["property_id", "field"], set_=set_
+        )
+    )
+
+def create_contribution(
+    session, property_id: int, field: str, proposed_value: str, reason: str, contributor: str,
+    contribution_id: Optional[int] = None,
+) -> Contribution:
     contribution = Contribution(
+        id=contribution_id,
         property_id=property_id,
         field=field,
         proposed_value=proposed_value,
@@ -158,10 +712,50 @@ def create_contribution(session, property_id: int, field: str, proposed_value: s
         contributor=contributor
     )
     session.add(contribution)
+    bump_contribution_stats(session, property_id, field, pending=1)
     session.commit()
-    session.refresh(contribution)
+    _refresh(session, contribution)
     return contribution
 
-def get_contributions(session, property_id: int) -> List[Contribution]:
+def get_contribution(session, contribution_id: int) -> Optional[Contribution]:
+    return session.get(Contribution, contribution_id)
+
+def get_contributions(
+    session,
+    property_id: int,
+    limit: Optional[int] = None,
+    statuses: Optional[List[str]] = None,
+) -> List[Contribution]:
+    """Newest contributions for a property, optionally filtered by status and capped at `limit`."""
     stmt = select(Contribution).where(Contribution.property_id == property_id)
-    return session.exec(stmt.order_by(Contribution.created_at.desc())).all()
+    if statuses:
+        stmt = stmt.where(Contribution.status.in_(statuses))
+    stmt = stmt.order_by(Contribution.created_at.desc(), Contribution.id.desc())
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return session.exec(stmt).all()
+
+def list_contributions_by_status(
+    session,
+    status: str,
+    after: Optional[Tuple[Any, int]] = None,
+    limit: int = 50,
+) -> List[Contribution]:
+    """Oldest-first page of contributions in `status`, starting after the (created_at, id) keyset cursor.
+
+    Served from ix_contribution_status_created, so cost depends on the page
+    size rather than on how many contributions exist.
+    """
+    stmt = select(Contribution).where(Contribution.status == status)
+    if after is not None:
+        created_at, contribution_id = after
+        stmt = stmt.where(
+            (Contribution.created_at > created_at) |
+            ((Contribution.created_at == created_at) & (Contribution.id > contribution_id))
+        )
+    stmt = stmt.order_by(Contribution.created_at, Contribution.id).limit(limit)
+    return session.exec(stmt).all()
+
+def get_contribution_stats(session, property_id: int) -> List[ContributionStats]:
+    stmt = select(ContributionStats).where(ContributionStats.property_id == property_id)
+    return session.exec(stmt.order_by(ContributionStats.field)).all()
@@ -0,0 +1,55 @@
+# app/deadline.py
+"""
+End-to-end request deadlines.
+
+A Deadline is created once per request, from the `X-Deadline-Ms` header or
+INGEST_DEADLINE_MS, and installed in a context variable. Adapter calls run
+with a copy of the request context, so they see it too. Work that honours a
+deadline asks `remaining()` how long it may still block; None means no
+deadline.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from .config import settings
+
+_current: ContextVar[Optional["Deadline"]] = ContextVar("deadline", default=None)
+
+
+class Deadline:
+    def __init__(self, budget_seconds: float):
+        self.budget_seconds = budget_seconds
+        self.expires_at = time.monotonic() + budget_seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+def ingest_deadline(header_ms: Optional[float]) -> Optional[Deadline]:
+    """The tighter of the client's X-Deadline-Ms and INGEST_DEADLINE_MS; None if neither is set."""
+    budgets = [ms for ms in (header_ms, settings.INGEST_DEADLINE_MS) if ms and ms > 0]
+    return Deadline(min(budgets) / 1000) if budgets else None
+
+
+def current() -> Optional[Deadline]:
+    return _current.get()
+
+
+def remaining() -> Optional[float]:
+    deadline = _current.get()
+    return deadline.remaining() if deadline else None
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]):
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
@@ -1,9 +1,40 @@
+import time
+from fastapi import Request
+from sqlalchemy import event
 from sqlmodel import create_engine, Session
 from .config import settings
+from .metrics import DB_QUERY_SECONDS
+from .querystats import record_query
+
+def instrument_engine(engine) -> None:
+    """Attach query timing (metrics, per-request stats, slow-query log) to an engine."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        DB_QUERY_SECONDS.observe(elapsed)
+        record_query(statement, parameters, elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context):
+        # A failed statement never reaches after_cursor_execute; drop its start time.
+        if context.connection is not None and context.connection.info.get("query_start"):
+            context.connection.info["query_start"].pop()
 
 engine = create_engine(settings.DATABASE_URL, echo=False)
+instrument_engine(engine)
 
-def get_session():
+def get_session(request: Request):
     # FastAPI expects a generator dependency that yields the session.
+    if settings.SHARD_COUNT > 0:
+        # Requests for one property (or contribution) run on the shard that holds it.
+        from .sharding import session_for_path
+        with session_for_path(request.path_params) as session:
+            yield session
+        return
     with Session(engine) as session:
         yield session
@@ -0,0 +1,56 @@
+# app/disputes.py
+"""
+Field dispute store maintenance.
+
+Brief writes keep FieldIssue and DisputeStats in step with each brief's
+conflicts (crud.sync_field_issues), but only when the conflicts change.
+Briefs written before the store existed need one backfill pass:
+
+    python -m app.disputes     # open issues for every brief's recorded conflicts
+"""
+import argparse
+import json
+import logging
+
+from sqlmodel import select
+
+from . import sharding
+from .crud import field_conflicts, sync_field_issues
+from .migrate import migrate
+from .models import Brief
+
+logger = logging.getLogger(__name__)
+
+
+def backfill(session, batch_size: int = 1000) -> int:
+    """Sync the issues of every brief, committing per batch. Returns the number of briefs with conflicts."""
+    total, after = 0, 0
+    while True:
+        rows = session.exec(
+            select(Brief.id, Brief.property_id, Brief.data).where(Brief.id > after).order_by(Brief.id).limit(batch_size)
+        ).all()
+        if not rows:
+            return total
+        for brief_id, property_id, data in rows:
+            conflicts = field_conflicts(json.loads(data))
+            if conflicts:
+                sync_field_issues(session, brief_id, property_id, conflicts)
+                total += 1
+        session.commit()
+        after = rows[-1][0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Open field issues for the conflicts already recorded in briefs.")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    migrate()
+    with sharding.all_shard_sessions() as sessions:
+        total = sum(backfill(session, args.batch_size) for session in sessions)
+    logger.info("done: %d briefs with conflicts", total)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+"""
+Streaming bulk export of briefs (with provenance) as NDJSON, CSV or Parquet.
+
+Rows are read through a server-side cursor (`yield_per` + `stream_results`)
+as plain column tuples, so no ORM identity map builds up and memory stays flat
+regardless of how many briefs are exported. NDJSON splices the stored brief
+JSON into each line without decoding it. Parquet needs pyarrow and is written
+one row group per batch. With SHARD_COUNT > 0 every shard is streamed and the
+streams are merged by property_id.
+
+    python -m app.export --format csv --min-completeness 80 -o briefs.csv
+"""
+import argparse
+import csv
+import heapq
+import io
+import json
+import sys
+from datetime import datetime
+from typing import Iterator, Optional, Tuple
+
+from sqlmodel import select
+
+from .crud import naive_utc
+from .models import Brief, Property
+from .sharding import all_shard_sessions
+
+FORMATS = ("ndjson", "csv", "parquet")
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+BATCH_SIZE = 1000
+
+# Brief fields flattened into CSV / Parquet columns; each also gets a `<field>_source` provenance column.
+FLAT_FIELDS = [
+    "address", "property_type", "bedrooms", "bathrooms", "square_feet", "year_built",
+    "lot_size", "listing_price", "hoa_fee", "tax_assessed_value",
+]
+NUMERIC_FIELDS = {"bedrooms", "bathrooms", "square_feet", "year_built", "listing_price", "hoa_fee", "tax_assessed_value"}
+FLAT_COLUMNS = (
+    ["property_id", "normalized_address", "completeness_score", "updated_at"]
+    + FLAT_FIELDS
+    + [f"{field}_source" for field in FLAT_FIELDS]
+    + ["conflicts", "sources_used"]
+)
+
+Row = Tuple[int, str, int, datetime, str]
+
+
+def iter_brief_rows(
+    session,
+    updated_since: Optional[datetime] = None,
+    min_completeness: Optional[int] = None,
+    batch_size: Optional[int] = None,
+) -> Iterator[Row]:
+    """Yield (property_id, normalized_address, completeness_score, updated_at, data_json) rows.
+
+    Rows are fetched `batch_size` (default BATCH_SIZE) at a time.
+    """
+    stmt = (
+        select(Brief.property_id, Property.normalized_address, Brief.completeness_score, Brief.updated_at, Brief.data)
+        .join(Property, Property.id == Brief.property_id)
+        .order_by(Brief.property_id)
+    )
+    if updated_since is not None:
+        stmt = stmt.where(Brief.updated_at >= naive_utc(updated_since))
+    if min_completeness is not None:
+        stmt = stmt.where(Brief.completeness_score >= min_completeness)
+    yield from session.exec(stmt.execution_options(yield_per=batch_size or BATCH_SIZE, stream_results=True))
+
+
+def _flatten(row: Row) -> dict:
+    property_id, normalized_address, completeness_score, updated_at, data_json = row
+    data = json.loads(data_json)
+    metadata = data.get("_metadata", {})
+    provenance = metadata.get("provenance", {})
+    flat = {
+        "property_id": property_id,
+        "normalized_address": normalized_address,
+        "completeness_score": completeness_score,
+        "updated_at": updated_at.isoformat(),
+        "conflicts": json.dumps(metadata.get("conflicts", [])),
+        "sources_used": ",".join(metadata.get("sources_used", [])),
+    }
+    for field in FLAT_FIELDS:
+        flat[field] = data.get(field)
+        flat[f"{field}_source"] = provenance.get(field)
+    return flat
+
+
+def iter_ndjson(rows: Iterator[Row]) -> Iterator[str]:
+    buffer = []
+    for property_id, normalized_address, completeness_score, updated_at, data_json in rows:
+        # The stored brief is already JSON; splice it in rather than decode and re-encode it.
+        buffer.append(
+            f'{{"property_id": {property_id}, "normalized_address": {json.dumps(normalized_address)}, '
+            f'"completeness_score": {completeness_score}, "updated_at": "{updated_at.isoformat()}", '
+            f'"brief": {data_json}}}\n'
+        )
+        if len(buffer) >= BATCH_SIZE:
+            yield "".join(buffer)
+            buffer.clear()
+    if buffer:
+        yield "".join(buffer)
+
+
+def iter_csv(rows: Iterator[Row]) -> Iterator[str]:
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=FLAT_COLUMNS)
+    writer.writeheader()
+    for i, row in enumerate(rows, 1):
+        writer.writerow(_flatten(row))
+        if i % BATCH_SIZE == 0:
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate()
+    yield out.getvalue()
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def iter_parquet(rows: Iterator[Row]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [("property_id", pa.int64()), ("normalized_address", pa.string()),
+         ("completeness_score", pa.int32()), ("updated_at", pa.string())]
+        + [(field, pa.float64() if field in NUMERIC_FIELDS else pa.string()) for field in FLAT_FIELDS]
+        + [(f"{field}_source", pa.string()) for field in FLAT_FIELDS]
+        + [("conflicts", pa.string()), ("sources_used", pa.string())]
+    )
+
+    def coerce(flat: dict) -> dict:
+        for field in FLAT_FIELDS:
+            value = flat[field]
+            if field in NUMERIC_FIELDS:
+                try:
+                    flat[field] = float(value) if value is not None else None
+                except (TypeError, ValueError):
+                    flat[field] = None
+            elif value is not None and not isinstance(value, str):
+                flat[field] = json.dumps(value)
+        return flat
+
+    sink = io.BytesIO()
+    writer = pq.ParquetWriter(sink, schema)
+    batch = []
+
+    def drain() -> bytes:
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
+
+    for row in rows:
+        batch.append(coerce(_flatten(row)))
+        if len(batch) >= BATCH_SIZE:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            batch.clear()
+            yield drain()
+    if batch:
+        writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+    writer.close()
+    yield drain()
+
+
+ENCODERS = {"ndjson": iter_ndjson, "csv": iter_csv, "parquet": iter_parquet}
+
+
+def stream_export(
+    format: str,
+    updated_since: Optional[datetime] = None,
+    min_completeness: Optional[int] = None,
+):
+    """Encode every matching brief in `format`, holding one session per shard open for the whole stream."""
+    with all_shard_sessions() as sessions:
+        streams = [iter_brief_rows(session, updated_since, min_completeness) for session in sessions]
+        yield from ENCODERS[format](heapq.merge(*streams, key=lambda row: row[0]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export briefs as NDJSON, CSV or Parquet.")
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("--updated-since", type=datetime.fromisoformat)
+    parser.add_argument("--min-completeness", type=int)
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.format == "parquet" and not parquet_available():
+        parser.error("parquet export requires pyarrow")
+
+    binary = args.format == "parquet"
+    if args.output:
+        out = open(args.output, "wb" if binary else "w", newline="" if not binary else None)
+    else:
+        out = sys.stdout.buffer if binary else sys.stdout
+    try:
+        for chunk in stream_export(args.format, args.updated_since, args.min_completeness):
+            out.write(chunk)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Offline bulk loader for raw source dumps (county rolls, MLS feeds, HOA lists).
+
+Reads a CSV or NDJSON dump chunk by chunk, normalizes addresses, upserts
+Property and SourceDatum rows with executemany inside one transaction per
+chunk, then re-merges only the properties the chunk touched. After each
+committed chunk the row count and byte offset are written to a checkpoint
+file, so a killed load seeks back to where it stopped:
+
+    python -m app.loader county county_roll.csv --checkpoint county_roll.ckpt
+    python -m app.loader listing mls_feed.ndjson --address-field full_address
+
+Memory is bounded by the chunk size, not the file size. With SHARD_COUNT > 0
+each chunk is split by home shard and written in one transaction per shard.
+With LAZY_BRIEFS the re-merge is skipped and briefs are rebuilt when read.
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlmodel import Session
+
+from . import sharding
+from .brief import merge_properties
+from .config import settings
+from .crud import bulk_upsert_properties, bulk_upsert_source_data
+from .deps import engine
+from .migrate import migrate
+from .utils import normalize_address, now_utc, parse_scalar
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def _lines(f, position: List[int]) -> Iterator[str]:
+    """Decoded lines of a binary file, keeping position[0] at the byte offset just past the last one."""
+    for line in f:
+        position[0] += len(line)
+        yield line.decode("utf-8")
+
+
+def read_records(path: str, fmt: str, offset: int = 0) -> Iterator[Tuple[Dict[str, Any], int]]:
+    """Yield (record, byte offset just past it), starting at `offset` (0, or an offset yielded earlier).
+
+    CSV resumes read the header, then seek past the rows already loaded. The
+    csv module never reads ahead of the row it returns, so offsets stay exact
+    even for quoted fields spanning lines.
+    """
+    with open(path, "rb") as f:
+        position = [0]
+        lines = _lines(f, position)
+        if fmt == "csv":
+            fieldnames = next(csv.reader(lines), [])
+            if offset:
+                f.seek(offset)
+                position[0] = offset
+            for row in csv.DictReader(lines, fieldnames=fieldnames):
+                yield {key: parse_scalar(value) for key, value in row.items()}, position[0]
+        else:
+            if offset:
+                f.seek(offset)
+                position[0] = offset
+            for line in lines:
+                if line.strip():
+                    yield json.loads(line), position[0]
+
+
+def read_checkpoint(path: Optional[str]) -> Tuple[int, int]:
+    """(rows done, byte offset to resume at); offset 0 for checkpoints written before offsets were recorded."""
+    if not path or not os.path.exists(path):
+        return 0, 0
+    with open(path) as f:
+        state = json.load(f)
+    return state["rows_done"], state.get("offset", 0)
+
+
+def write_checkpoint(path: Optional[str], rows_done: int, offset: int) -> None:
+    if not path:
+        return
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"rows_done": rows_done, "offset": offset, "written_at": now_utc().isoformat()}, f)
+    os.replace(tmp, path)
+
+
+def load_chunk(
+    session, source_name: str, records: List[Dict[str, Any]], address_field: str, merge: bool = True,
+    property_ids: Optional[Dict[str, int]] = None,
+) -> int:
+    """Upsert one chunk in the session's transaction. Returns the number of properties touched.
+
+    `property_ids` maps normalized addresses to catalog-assigned ids when sharded.
+    """
+    payloads: Dict[str, Dict[str, Any]] = {}
+    raw_addresses: Dict[str, str] = {}
+    for record in records:
+        raw = record.get(address_field)
+        normalized = normalize_address(str(raw)) if raw else ""
+        if not normalized:
+            continue
+        # Later rows for the same address win, as they would with sequential ingests.
+        # The address lives on Property (merges fall back to it), so payloads don't repeat it.
+        payloads[normalized] = {key: value for key, value in record.items() if key != address_field}
+        raw_addresses[normalized] = str(raw)
+    if not payloads:
+        return 0
+
+    ids = bulk_upsert_properties(session, raw_addresses, property_ids)
+    bulk_upsert_source_data(
+        session, [(ids[normalized], source_name, payload) for normalized, payload in payloads.items()]
+    )
+
+    if merge:
+        merge_properties(session, list(ids.values()))
+    return len(ids)
+
+
+def split_by_shard(records: List[Dict[str, Any]], address_field: str) -> List[Tuple[int, List[Dict[str, Any]], Dict[str, int]]]:
+    """[(shard, records, {normalized: property_id})] for one chunk, registering new addresses in the catalog."""
+    by_address: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for record in records:
+        raw = record.get(address_field)
+        normalized = normalize_address(str(raw)) if raw else ""
+        if normalized:
+            by_address[normalized].append(record)
+    groups: Dict[int, Tuple[List[Dict[str, Any]], Dict[str, int]]] = defaultdict(lambda: ([], {}))
+    for normalized, (property_id, shard) in sharding.assign_properties(by_address).items():
+        group_records, ids = groups[shard]
+        group_records.extend(by_address[normalized])
+        ids[normalized] = property_id
+    return [(shard, group_records, ids) for shard, (group_records, ids) in sorted(groups.items())]
+
+
+def load_file(
+    path: str,
+    source_name: str,
+    fmt: Optional[str] = None,
+    address_field: str = "address",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    checkpoint: Optional[str] = None,
+    merge: bool = True,
+) -> int:
+    """Load a dump, resuming from `checkpoint` if present. Returns total rows processed."""
+    fmt = fmt or ("ndjson" if path.endswith((".ndjson", ".jsonl")) else "csv")
+    merge = merge and not settings.LAZY_BRIEFS
+    rows_done, offset = read_checkpoint(checkpoint)
+    records = read_records(path, fmt, offset)
+    if rows_done:
+        logger.info("resuming %s after %d rows (byte %d)", path, rows_done, offset)
+        if not offset:
+            records = islice(records, rows_done, None)  # older checkpoint: skip by re-parsing
+
+    start = time.perf_counter()
+    while True:
+        batch = list(islice(records, chunk_size))
+        if not batch:
+            break
+        chunk = [record for record, _ in batch]
+        offset = batch[-1][1]
+        if sharding.enabled():
+            touched = 0
+            for shard, records_for_shard, ids in split_by_shard(chunk, address_field):
+                with Session(sharding.engine_for_shard(shard)) as session:
+                    touched += load_chunk(session, source_name, records_for_shard, address_field, merge, ids)
+                    session.commit()
+        else:
+            with Session(engine) as session:
+                touched = load_chunk(session, source_name, chunk, address_field, merge)
+                session.commit()
+        rows_done += len(chunk)
+        write_checkpoint(checkpoint, rows_done, offset)
+        logger.info("%d rows loaded (%d properties in last chunk, %.0f rows/s)",
+                    rows_done, touched, rows_done / max(time.perf_counter() - start, 1e-9))
+    return rows_done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk-load a raw source dump into SourceDatum and re-merge briefs.")
+    parser.add_argument("source_name", help="source the dump comes from, e.g. county, listing, hoa")
+    parser.add_argument("path", help="CSV or NDJSON file")
+    parser.add_argument("--format", choices=("csv", "ndjson"), help="default: from the file extension")
+    parser.add_argument("--address-field", default="address")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--checkpoint", help="progress file for restartable loads")
+    parser.add_argument("--no-merge", action="store_true", help="only load source rows; skip brief re-merges")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    migrate()
+    total = load_file(
+        args.path, args.source_name, args.format, args.address_field,
+        args.chunk_size, args.checkpoint, merge=not args.no_merge,
+    )
+    logger.info("done: %d rows", total)
+
+
+if __name__ == "__main__":
+    main()
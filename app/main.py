@@ -1,5 +1,61 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from .api import router as api
+from .config import settings
+from . import sharding
+from .materialize import start_compactor, stop_compactor
+from .querystats import QueryStatsMiddleware
+from .routers.refresh import router as refresh
+from .routers.webhooks import router as webhooks
+from .routers.export import router as export
+from .routers.contributions import router as contributions
+from .routers.changes import router as changes
+from .routers.disputes import router as disputes
+from .routers.history import router as history
+from .routers.cards import router as cards
 
-app = FastAPI(title="Homekey Exercise")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if sharding.enabled() and settings.ASYNC_MODE:
+        raise RuntimeError("SHARD_COUNT > 0 is not supported with ASYNC_MODE")
+    if settings.AUTO_MIGRATE:
+        from .migrate import migrate
+        migrate()
+    start_compactor()
+    yield
+    stop_compactor()
+
+app = FastAPI(title="Homekey Exercise", lifespan=lifespan)
+# Optional features are imported and mounted only when their settings enable them at startup.
+if settings.ADMIN_TOKEN or settings.PROFILE_SAMPLE_RATE:
+    from .profiling import ProfilingMiddleware
+    from .routers.admin import router as admin
+    app.add_middleware(ProfilingMiddleware)
+    app.include_router(admin)
+app.add_middleware(QueryStatsMiddleware)
+if settings.ADMISSION_ENABLED:
+    # Inside MetricsMiddleware, so rejected requests still show up in the latency histogram.
+    from .admission import AdmissionMiddleware
+    app.add_middleware(AdmissionMiddleware)
+if settings.METRICS_ENABLED:
+    from .metrics import MetricsMiddleware
+    from .routers.metrics import router as metrics
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics)
+if settings.COMPRESSION_ENABLED:
+    # Outermost, so it compresses the final body with every other middleware's headers in place.
+    from .compression import CompressionMiddleware
+    app.add_middleware(CompressionMiddleware)
+if settings.ASYNC_MODE:
+    # Registered first so its routes shadow the sync ones with the same paths.
+    from .routers.async_api import router as async_api
+    app.include_router(async_api)
 app.include_router(api)
+app.include_router(refresh)
+app.include_router(webhooks)
+app.include_router(export)
+app.include_router(contributions)
+app.include_router(changes)
+app.include_router(disputes)
+app.include_router(history)
+app.include_router(cards)
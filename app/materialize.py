@@ -0,0 +1,154 @@
+# app/materialize.py
+"""
+Lazy brief materialization (LAZY_BRIEFS).
+
+Source writes far outnumber brief reads for most properties. With
+LAZY_BRIEFS on, background source writes (webhook refreshes, adapters that
+missed an ingest deadline, bulk loads) store their SourceDatum rows and stop
+there. A brief is stale while a source row is newer than its `sources_as_of`
+watermark. GET /properties/{id}/brief re-merges a stale brief before
+answering. The compactor re-merges stale briefs among the most-read
+properties every BRIEF_COMPACT_INTERVAL_S, so popular properties are usually
+fresh by the time they are read.
+
+    python -m app.materialize     # re-merge every stale brief now
+"""
+import argparse
+import logging
+import threading
+from collections import Counter
+from typing import Iterable, List, Optional
+
+from sqlmodel import or_, select, func
+
+from . import sharding
+from .brief import merge_properties
+from .config import settings
+from .migrate import migrate
+from .metrics import BRIEF_MATERIALIZATIONS
+from .models import Brief, SourceDatum
+
+logger = logging.getLogger(__name__)
+
+MAX_TRACKED = 10000  # read counters kept; the coldest are dropped beyond this
+
+_reads: Counter = Counter()
+_reads_lock = threading.Lock()
+
+
+def record_read(property_id: int) -> None:
+    with _reads_lock:
+        _reads[property_id] += 1
+        if len(_reads) > MAX_TRACKED:
+            for cold, _ in _reads.most_common()[MAX_TRACKED // 2:]:
+                del _reads[cold]
+
+
+def hot_properties(n: int) -> List[int]:
+    """The n most-read properties since the last call; counts halve each call so old reads fade."""
+    with _reads_lock:
+        hot = [property_id for property_id, _ in _reads.most_common(n)]
+        for property_id in list(_reads):
+            _reads[property_id] //= 2
+            if not _reads[property_id]:
+                del _reads[property_id]
+    return hot
+
+
+def stale_properties(session, property_ids: Optional[Iterable[int]] = None, limit: Optional[int] = None) -> List[int]:
+    """Properties with source rows newer than their brief (or no brief yet)."""
+    changed = select(SourceDatum.property_id, func.max(SourceDatum.created_at).label("changed_at"))
+    if property_ids is not None:
+        changed = changed.where(SourceDatum.property_id.in_(list(property_ids)))
+    changed = changed.group_by(SourceDatum.property_id).subquery()
+    stmt = (
+        select(changed.c.property_id)
+        .outerjoin(Brief, Brief.property_id == changed.c.property_id)
+        .where(or_(Brief.sources_as_of.is_(None), changed.c.changed_at > Brief.sources_as_of))
+        .order_by(changed.c.property_id)
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return list(session.exec(stmt))
+
+
+def compact(session, property_ids: Optional[Iterable[int]] = None, batch_size: Optional[int] = None) -> int:
+    """Re-merge the stale briefs among `property_ids` (all when None), committing per batch."""
+    batch_size = batch_size or settings.BRIEF_COMPACT_BATCH
+    total = 0
+    while True:
+        stale = stale_properties(session, property_ids, batch_size)
+        if not stale:
+            return total
+        merge_properties(session, stale)
+        session.commit()
+        BRIEF_MATERIALIZATIONS.inc(len(stale), trigger="compactor")
+        total += len(stale)
+        if property_ids is not None:
+            return total
+
+
+class Compactor:
+    """Background thread merging stale briefs of recently read properties."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="brief-compactor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def run_once(self) -> int:
+        hot = hot_properties(settings.BRIEF_COMPACT_BATCH)
+        if not hot:
+            return 0
+        # Each shard only reports stale ids it holds
+        with sharding.all_shard_sessions() as sessions:
+            return sum(compact(session, hot) for session in sessions)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.run_once()
+            except Exception:
+                logger.exception("brief compaction failed")
+
+
+compactor: Optional[Compactor] = None
+
+
+def start_compactor() -> None:
+    global compactor
+    if settings.LAZY_BRIEFS and settings.BRIEF_COMPACT_INTERVAL_S > 0 and compactor is None:
+        compactor = Compactor(settings.BRIEF_COMPACT_INTERVAL_S)
+        compactor.start()
+
+
+def stop_compactor() -> None:
+    global compactor
+    if compactor is not None:
+        compactor.stop()
+        compactor = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-merge every stale brief from its stored sources.")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    migrate()
+    with sharding.all_shard_sessions() as sessions:
+        total = sum(compact(session, batch_size=args.batch_size) for session in sessions)
+    logger.info("done: %d briefs re-merged", total)
+
+
+if __name__ == "__main__":
+    main()
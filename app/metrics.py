@@ -0,0 +1,233 @@
+"""
+In-process metrics registry rendered in the Prometheus text exposition format.
+
+Counters and histograms are plain dicts keyed by label values and guarded by a
+single lock, so recording a sample costs a dict lookup and a bisect. Nothing is
+exported until `/metrics` is scraped.
+"""
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Dict, Iterable, List, Tuple
+
+from .config import settings
+
+# Latency buckets in seconds: sub-millisecond DB calls up to the 60s LLM timeout.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_lock = threading.Lock()
+REGISTRY: List["_Metric"] = []
+
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{k}="{_escape(v)}"' for k, v in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        REGISTRY.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if not settings.METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        with _lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with _lock:
+            items = list(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        if not settings.METRICS_ENABLED:
+            return
+        with _lock:
+            self._values[self._key(labels)] = value
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        if not settings.METRICS_ENABLED:
+            return
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with _lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0] * (len(self.buckets) + 2)
+            row[index] += 1
+            row[-1] += value
+
+    def time(self, **labels) -> "_Timer":
+        """Context manager observing the wall time of the enclosed block."""
+        return _Timer(self, labels)
+
+    def count(self, **labels) -> int:
+        row = self._values.get(self._key(labels))
+        return sum(row[:-1]) if row else 0
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with _lock:
+            items = [(key, list(row)) for key, row in self._values.items()]
+        for key, row in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, row):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            cumulative += row[len(self.buckets)]
+            inf_labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {row[-1]}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "start")
+
+    def __init__(self, histogram: Histogram, labels: Dict[str, str]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+def timed(histogram: Histogram, **labels):
+    """Decorator observing each call's duration on `histogram`."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with histogram.time(**labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# Metric definitions
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status")
+)
+ADAPTER_CALL_SECONDS = Histogram(
+    "adapter_call_duration_seconds", "Latency of source adapter calls.", ("adapter",)
+)
+ADAPTER_ERRORS = Counter("adapter_errors_total", "Source adapter calls that raised.", ("adapter",))
+ADAPTER_DEADLINE_MISSES = Counter(
+    "adapter_deadline_misses_total", "Adapter calls still running at the ingest deadline (finished in background).", ("adapter",)
+)
+MERGE_SECONDS = Histogram("merge_duration_seconds", "Time spent in merge_source_data.")
+COMPLETENESS_SECONDS = Histogram("completeness_duration_seconds", "Time spent in calculate_completeness_score.")
+LLM_REQUEST_SECONDS = Histogram("llm_request_duration_seconds", "Latency of LLM completion calls.", ("outcome",))
+LLM_TOKENS = Counter("llm_tokens_total", "Tokens reported by the LLM provider.", ("kind",))
+DB_QUERY_SECONDS = Histogram("db_query_duration_seconds", "Latency of individual SQL statements.")
+ADMISSION_REQUESTS = Counter(
+    "admission_requests_total", "Admission decisions by route class (admitted/rate_limited/overloaded).",
+    ("route_class", "result"),
+)
+ADMISSION_IN_FLIGHT = Gauge("admission_in_flight", "Admitted requests currently running per route class.", ("route_class",))
+SINGLEFLIGHT_CALLS = Counter(
+    "singleflight_calls_total", "Coalesced ingest/refresh calls (leader/shared/lease_wait).", ("result",)
+)
+BRIEF_MATERIALIZATIONS = Counter(
+    "brief_materializations_total", "Stale briefs re-merged from stored sources, by trigger (read/compactor).", ("trigger",)
+)
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups by cache and result (hit/miss).", ("cache", "result"))
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency per route template.
+
+    The route label comes from the matched route's path template (e.g.
+    `/properties/{property_id}/brief`) so label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status["code"],
+            )
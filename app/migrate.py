@@ -0,0 +1,78 @@
+# app/migrate.py
+"""
+Explicit schema setup, run once per deploy instead of on every worker start:
+
+    python -m app.migrate
+
+Brings the main database and every shard up to the models: creates missing
+tables and indexes (and the item search index, see app/search.py) and adds
+columns that models gained after their table was created. Workers run it at
+startup only while AUTO_MIGRATE is on, the default for development and tests.
+Constraints added to existing tables (e.g. FieldIssue's unique
+(brief_id, field_name)) are not retrofitted; SQLite cannot add them in place.
+"""
+import logging
+from typing import List
+
+from sqlalchemy import inspect
+from sqlmodel import SQLModel
+
+from . import sharding
+from .deps import engine
+
+logger = logging.getLogger(__name__)
+
+
+def _column_ddl(column, dialect) -> str:
+    ddl = f"ALTER TABLE {column.table.name} ADD COLUMN {column.name} {column.type.compile(dialect)}"
+    # Added columns stay nullable: SQLite only adds NOT NULL columns with a constant default
+    default = column.default
+    if default is not None and default.is_scalar:
+        value = default.arg
+        ddl += f" DEFAULT {int(value) if isinstance(value, (bool, int)) else repr(str(value))}"
+    return ddl
+
+
+def upgrade(target_engine) -> List[str]:
+    """Add missing columns and indexes to existing tables, then create missing tables. Returns what changed."""
+    changes = []
+    inspector = inspect(target_engine)
+    with target_engine.begin() as connection:
+        for table in SQLModel.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    connection.exec_driver_sql(_column_ddl(column, target_engine.dialect))
+                    changes.append(f"column {table.name}.{column.name}")
+            indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(connection)
+                    changes.append(f"index {index.name}")
+    tables = set(inspector.get_table_names())
+    SQLModel.metadata.create_all(target_engine)
+    changes += [f"table {name}" for name in sorted(set(inspect(target_engine).get_table_names()) - tables)]
+    return changes
+
+
+def migrate() -> List[str]:
+    """upgrade() the main database and, when sharded, every shard."""
+    changes = upgrade(engine)
+    if sharding.enabled():
+        for shard, shard_engine in enumerate(sharding.shard_engines()):
+            changes += [f"shard {shard}: {change}" for change in upgrade(shard_engine)]
+    return changes
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    changes = migrate()
+    for change in changes:
+        logger.info("added %s", change)
+    logger.info("done: %d schema changes", len(changes))
+
+
+if __name__ == "__main__":
+    main()
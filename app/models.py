@@ -1,6 +1,6 @@
 from datetime import datetime
 from typing import Optional, Dict, Any
-from sqlmodel import SQLModel, Field, Relationship, UniqueConstraint
+from sqlmodel import SQLModel, Field, Relationship, UniqueConstraint, Index
 import json
 
 class Item(SQLModel, table=True):
@@ -9,6 +9,9 @@ class Item(SQLModel, table=True):
     body: str = ""
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
+    # GET /items without q: ORDER BY created_at DESC, id DESC with a keyset cursor
+    __table_args__ = (Index("ix_item_created_id", "created_at", "id"),)
+
 class Property(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     normalized_address: str = Field(index=True, unique=True)
@@ -40,32 +43,128 @@ class SourceDatum(SQLModel, table=True):
 
 class Brief(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    property_id: int = Field(foreign_key="property.id")
+    property_id: int = Field(foreign_key="property.id", index=True)
     data: str  # JSON string containing the canonical brief
     completeness_score: int = Field(ge=0, le=100)  # 0-100 completeness percentage
+    version: int = Field(default=1)  # bumped on every write; the brief's ETag
+    sources_as_of: Optional[datetime] = None  # newest SourceDatum.created_at merged in; older than a source row means stale
+    history_deltas: Optional[int] = None  # BriefHistory rows since the last snapshot; None until history starts
+    card: Optional[str] = None  # JSON listing card (app/cards.py), rebuilt on every write
+    fallback_summary: Optional[str] = None  # rule-based summary text without contributions, rebuilt on every write
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, index=True)
     
     # Relationships
     property: Property = Relationship(back_populates="brief")
 
+class BriefChange(SQLModel, table=True):
+    """Append-only brief change log, written in the same transaction as the brief."""
+    __tablename__ = "briefchange"
+    
+    seq: Optional[int] = Field(default=None, primary_key=True)  # never reused (AUTOINCREMENT)
+    property_id: int = Field(foreign_key="property.id", index=True)
+    changed_fields: str  # JSON list of top-level brief fields that changed
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    __table_args__ = {"sqlite_autoincrement": True}
+
+class BriefHistory(SQLModel, table=True):
+    """Brief facts over time: each change's fields, plus every field every BRIEF_SNAPSHOT_EVERY changes."""
+    __tablename__ = "briefhistory"
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    property_id: int = Field(foreign_key="property.id")
+    version: int  # Brief.version this change produced
+    delta: str  # JSON {"set": {field: new value}, "unset": [removed fields]}; "unset" only when non-empty
+    snapshot: Optional[str] = None  # JSON of every field after this change (without _metadata)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    __table_args__ = (
+        Index("ix_briefhistory_property", "property_id", "id"),
+    )
+
+class Lease(SQLModel, table=True):
+    """Cross-worker single-flight lease (see app/singleflight.py); one row per in-flight key."""
+    key: str = Field(primary_key=True)  # e.g. "address:<normalized>", "property:<id>" or "property-sources:<id>"
+    owner: str  # host:pid:nonce of the worker holding it
+    expires_at: float  # unix time; an expired lease may be taken over
+
 class FieldIssue(SQLModel, table=True):
+    """One source disagreement per (brief, field), kept in step with the brief's conflicts on every write."""
     id: Optional[int] = Field(default=None, primary_key=True)
     brief_id: int = Field(foreign_key="brief.id")
+    property_id: Optional[int] = None
     field_name: str
     conflicting_values: str  # JSON string of conflicting values
     confidence_scores: str  # JSON string of confidence scores per source
+    sources: str = ""  # disagreeing sources, sorted and comma-wrapped: ",county,listing,"
+    status: str = Field(default="open")  # "open", "resolved"
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    resolved_at: Optional[datetime] = None
+
+    __table_args__ = (
+        UniqueConstraint("brief_id", "field_name", name="uq_fieldissue_brief_field"),
+        Index("ix_fieldissue_field_status", "field_name", "status", "id"),
+        # Listings without a field (e.g. by source only) walk one status in id order
+        Index("ix_fieldissue_status_id", "status", "id"),
+    )
+
+class DisputeStats(SQLModel, table=True):
+    """Per-field, per-source-set FieldIssue counters, maintained with the issues."""
+    __tablename__ = "disputestats"
+
+    field_name: str = Field(primary_key=True)
+    sources: str = Field(primary_key=True)  # same format as FieldIssue.sources
+    open: int = 0
+    total: int = 0  # issues ever opened (reopens count again)
 
 class Contribution(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
-    property_id: int = Field(foreign_key="property.id")
+    property_id: int = Field(foreign_key="property.id", index=True)
     field: str
     proposed_value: str
     reason: str
     contributor: str
     status: str = Field(default="pending")  # "pending", "accepted", "rejected"
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    reviewed_at: Optional[datetime] = None
     
     # Relationships
     property: Property = Relationship(back_populates="contributions")
+    
+    # Review queue: WHERE status = ? ORDER BY created_at, id with a keyset cursor
+    __table_args__ = (
+        Index("ix_contribution_status_created", "status", "created_at", "id"),
+    )
+
+class ContributionStats(SQLModel, table=True):
+    """Per-property, per-field contribution counters, maintained on create/accept/reject."""
+    __tablename__ = "contributionstats"
+    
+    property_id: int = Field(foreign_key="property.id", primary_key=True)
+    field: str = Field(primary_key=True)
+    pending: int = 0
+    accepted: int = 0
+    rejected: int = 0
+    accepted_value: Optional[str] = None  # most recently accepted proposed_value
+    last_contribution_at: datetime = Field(default_factory=datetime.utcnow)
+
+class PropertyShard(SQLModel, table=True):
+    """Shard catalog (SHARD_COUNT > 0, main database only): allocates global property ids."""
+    __tablename__ = "propertyshard"
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    normalized_address: str = Field(unique=True)
+    shard: int  # index into SHARD_URL_TEMPLATE
+    
+    __table_args__ = {"sqlite_autoincrement": True}
+
+class ContributionShard(SQLModel, table=True):
+    """Shard catalog: allocates global contribution ids so moderation can route by id."""
+    __tablename__ = "contributionshard"
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    property_id: int = Field(index=True)
+    
+    __table_args__ = {"sqlite_autoincrement": True}
@@ -0,0 +1,88 @@
+# app/moderation.py
+"""
+Contribution review: keyset-paginated queues and accept/reject operations.
+
+Accepting a contribution stores its value in the property's "contribution"
+source (highest merge priority, so later re-merges keep it) and re-merges the
+brief from its stored sources. The brief is then stamped with the new source
+row and is not stale, so the next read serves it as is. Per-field counters
+in ContributionStats are updated in the same transaction.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from sqlalchemy import update
+
+from .brief import merge_properties
+from .crud import bump_contribution_stats, get_source_datum, upsert_source_datum
+from .models import Contribution
+from .utils import parse_scalar, now_utc
+
+CONTRIBUTION_SOURCE = "contribution"
+
+
+class InvalidTransition(Exception):
+    """Raised when a contribution is not in a state that allows the requested review."""
+
+
+def encode_cursor(contribution: Contribution) -> str:
+    raw = f"{contribution.created_at.isoformat()}|{contribution.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor; raises ValueError on malformed input."""
+    try:
+        created_at, contribution_id = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(contribution_id)
+    except (UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"invalid cursor: {cursor}") from e
+
+
+def _review(session, contribution: Contribution, status: str) -> None:
+    """Move a pending contribution to `status` in the caller's transaction.
+
+    The transition is one conditional UPDATE, so of two concurrent reviews only
+    the first to write applies its effects; the other finds no pending row.
+    """
+    reviewed = session.exec(
+        update(Contribution)
+        .where(Contribution.id == contribution.id, Contribution.status == "pending")
+        .values(status=status, reviewed_at=now_utc())
+    )
+    if reviewed.rowcount == 0:
+        session.rollback()
+        session.refresh(contribution)
+        raise InvalidTransition(f"contribution {contribution.id} is already {contribution.status}")
+
+
+def accept_contribution(session, contribution: Contribution) -> Contribution:
+    """Accept a pending contribution and apply its value to the brief."""
+    _review(session, contribution, "accepted")
+    property_id, field = contribution.property_id, contribution.field
+    value = parse_scalar(contribution.proposed_value)
+
+    datum = get_source_datum(session, property_id, CONTRIBUTION_SOURCE)
+    payload = json.loads(datum.data) if datum else {}
+    payload[field] = value
+    upsert_source_datum(session, property_id, CONTRIBUTION_SOURCE, payload, commit=False)
+    merge_properties(session, [property_id])
+
+    bump_contribution_stats(session, property_id, field, accepted_value=contribution.proposed_value, pending=-1, accepted=1)
+    session.commit()
+    session.refresh(contribution)
+    return contribution
+
+
+def reject_contribution(session, contribution: Contribution) -> Contribution:
+    _review(session, contribution, "rejected")
+    bump_contribution_stats(session, contribution.property_id, contribution.field, pending=-1, rejected=1)
+    session.commit()
+    session.refresh(contribution)
+    return contribution
+
+
+def next_cursor(page, limit: int) -> Optional[str]:
+    return encode_cursor(page[-1]) if len(page) == limit else None
@@ -0,0 +1,239 @@
+"""
+Opt-in profiling of single requests and background jobs.
+
+A request is profiled when it carries `X-Profile: pstats|collapsed` together
+with a matching `X-Admin-Token`, or when it is picked by `PROFILE_SAMPLE_RATE`.
+Decorated endpoints then run under either cProfile (`pstats`, deterministic,
+admin-only) or a stack sampler (`collapsed`, flamegraph input). Results are
+written to `PROFILE_DIR` and the response carries `X-Profile-Id`.
+
+Overhead is capped: at most `PROFILE_MAX_CONCURRENT` profiles run at once
+(others run unprofiled), the sampler takes one stack every
+`PROFILE_INTERVAL_MS` and stops after `PROFILE_MAX_SECONDS`, and cProfile
+stops at the first SQL statement or adapter call (`checkpoint`) past that. With no admin
+token configured and a zero sample rate, the only cost is one context
+variable lookup per decorated call.
+"""
+import cProfile
+import hmac
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+MODES = ("pstats", "collapsed")
+
+_requested: ContextVar[Optional["ProfileRequest"]] = ContextVar("profile_request", default=None)
+_slots: Optional[threading.BoundedSemaphore] = None
+_slots_lock = threading.Lock()
+
+
+class ProfileRequest:
+    """What the middleware asked for, and the id of the stored result."""
+    __slots__ = ("mode", "profile_id")
+
+    def __init__(self, mode: str):
+        self.mode = mode
+        self.profile_id: Optional[str] = None
+
+
+def _acquire_slot() -> bool:
+    global _slots
+    if _slots is None:
+        with _slots_lock:
+            if _slots is None:
+                _slots = threading.BoundedSemaphore(max(settings.PROFILE_MAX_CONCURRENT, 1))
+    return _slots.acquire(blocking=False)
+
+
+def _sampled() -> bool:
+    return settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE
+
+
+def profile_path(profile_id: str, mode: str) -> str:
+    return os.path.join(settings.PROFILE_DIR, f"{profile_id}.{mode}")
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack into collapsed-stack counts."""
+
+    def __init__(self, target_ident: int):
+        super().__init__(daemon=True, name="profile-sampler")
+        self.target_ident = target_ident
+        self.counts: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        interval = settings.PROFILE_INTERVAL_MS / 1000
+        deadline = time.perf_counter() + settings.PROFILE_MAX_SECONDS
+        while not self._stop_event.wait(interval) and time.perf_counter() < deadline:
+            frame = sys._current_frames().get(self.target_ident)
+            if frame is None:
+                return
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            self.counts[";".join(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.counts.most_common())
+
+
+class _Capture:
+    """A running cProfile capture and the thread it profiles."""
+    __slots__ = ("profiler", "thread_ident", "deadline", "stopped")
+
+    def __init__(self, profiler: cProfile.Profile):
+        self.profiler = profiler
+        self.thread_ident = threading.get_ident()
+        self.deadline = time.perf_counter() + settings.PROFILE_MAX_SECONDS
+        self.stopped = False
+
+
+_capture: ContextVar[Optional[_Capture]] = ContextVar("profile_capture", default=None)
+
+
+def checkpoint() -> None:
+    """Stop the current thread's cProfile capture once it has run for PROFILE_MAX_SECONDS.
+
+    cProfile can only be disabled from the thread it profiles, so the bound is
+    checked here, at points profiled code reaches often (every SQL statement,
+    every adapter call), not from a watchdog thread. Outside a capture this is
+    one context variable lookup.
+    """
+    capture = _capture.get()
+    if (capture is None or capture.stopped or capture.thread_ident != threading.get_ident()
+            or time.perf_counter() < capture.deadline):
+        return
+    capture.profiler.disable()
+    capture.stopped = True
+
+
+@contextmanager
+def profile_block(mode: str, label: str):
+    """Profile the enclosed block on the current thread and store the result.
+
+    Yields the profile id, or None when the concurrency cap is reached.
+    """
+    if not _acquire_slot():
+        logger.info("profile of %s skipped: %d profiles already running", label, settings.PROFILE_MAX_CONCURRENT)
+        yield None
+        return
+
+    profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{label}-{uuid.uuid4().hex[:8]}"
+    try:
+        if mode == "pstats":
+            profiler = cProfile.Profile()
+            capture = _Capture(profiler)
+            token = _capture.set(capture)
+            profiler.enable()
+            try:
+                yield profile_id
+            finally:
+                profiler.disable()
+                _capture.reset(token)
+                if capture.stopped:
+                    logger.info("profile %s covers the first %ss only", profile_id, settings.PROFILE_MAX_SECONDS)
+                os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+                profiler.dump_stats(profile_path(profile_id, mode))
+        else:
+            sampler = StackSampler(threading.get_ident())
+            sampler.start()
+            try:
+                yield profile_id
+            finally:
+                sampler.stop()
+                os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+                with open(profile_path(profile_id, mode), "w") as f:
+                    f.write(sampler.collapsed())
+        logger.info("stored %s profile %s", mode, profile_id)
+    finally:
+        _slots.release()
+
+
+def profiled(func):
+    """Profile a sync endpoint when the current request asked for it."""
+    label = func.__name__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        request = _requested.get()
+        if request is None:
+            return func(*args, **kwargs)
+        with profile_block(request.mode, label) as profile_id:
+            request.profile_id = profile_id
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def profiled_job(name: str):
+    """Profile a background job if its originating request asked for it or it is sampled."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            request = _requested.get()
+            mode = request.mode if request is not None else ("collapsed" if _sampled() else None)
+            if mode is None:
+                return func(*args, **kwargs)
+            with profile_block(mode, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def is_admin(token: str) -> bool:
+    return bool(settings.ADMIN_TOKEN) and hmac.compare_digest(token or "", settings.ADMIN_TOKEN)
+
+
+class ProfilingMiddleware:
+    """Decides per request whether to profile and reports `X-Profile-Id`."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not (settings.ADMIN_TOKEN or settings.PROFILE_SAMPLE_RATE > 0):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        mode = headers.get(b"x-profile", b"").decode()
+        if mode not in MODES or not is_admin(headers.get(b"x-admin-token", b"").decode()):
+            mode = "collapsed" if _sampled() else None
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        request = ProfileRequest(mode)
+        token = _requested.set(request)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and request.profile_id:
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", request.profile_id.encode()),
+                    (b"x-profile-format", mode.encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _requested.reset(token)
@@ -0,0 +1,110 @@
+# app/prompts.py
+"""
+Compact, token-budgeted prompts for the ai_summary endpoint.
+
+The brief is written as one `field: value` line per populated field, not as
+indented JSON. `_metadata` is reduced to the sources used and a one-line
+note per conflict. Contributions are ranked and added until the input
+budget (SUMMARY_INPUT_TOKENS) runs out. The output budget
+(SUMMARY_MAX_OUTPUT_TOKENS) is set separately, in app/utils.py.
+
+Token counts are estimated at ~4 characters per token, which is close
+enough for budgeting English prose and numbers.
+"""
+import json
+from typing import Any, Dict, List, Optional, Sequence
+
+from .config import settings
+
+CHARS_PER_TOKEN = 4
+MAX_REASON_CHARS = 160
+# Accepted values are facts now; pending ones are claims to hedge.
+_STATUS_RANK = {"accepted": 0, "pending": 1}
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _format_value(value: Any) -> str:
+    if isinstance(value, list):
+        return "; ".join(_format_value(v) for v in value)
+    if isinstance(value, dict):
+        return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+    return str(value)
+
+
+def compact_brief(brief_data: Dict[str, Any]) -> List[str]:
+    """Brief fields as `field: value` lines, skipping empties, plus a short provenance summary."""
+    lines = [
+        f"{field}: {_format_value(value)}"
+        for field, value in sorted(brief_data.items())
+        if not field.startswith("_") and value not in (None, "", [], {})
+    ]
+    metadata = brief_data.get("_metadata") or {}
+    if metadata.get("sources_used"):
+        lines.append(f"sources: {', '.join(sorted(metadata['sources_used']))}")
+    for conflict in metadata.get("conflicts", []):
+        values = ", ".join(f"{source} {value}" for source, value in sorted(conflict.get("values", {}).items()))
+        lines.append(f"conflict {conflict.get('field')}: {values}")
+    return lines
+
+
+def rank_contributions(contributions: Sequence, conflicted_fields: Sequence[str] = ()) -> List:
+    """Accepted before pending, contributions on conflicted fields first, then newest first.
+
+    Repeats of the same field and value are dropped.
+    """
+    conflicted = set(conflicted_fields)
+    ranked = sorted(
+        contributions,
+        key=lambda c: (_STATUS_RANK.get(c.status, 2), c.field not in conflicted, -c.created_at.timestamp()),
+    )
+    seen, unique = set(), []
+    for c in ranked:
+        key = (c.field, c.proposed_value.strip().lower())
+        if key not in seen:
+            seen.add(key)
+            unique.append(c)
+    return unique
+
+
+def _contribution_line(c) -> str:
+    reason = c.reason if len(c.reason) <= MAX_REASON_CHARS else c.reason[:MAX_REASON_CHARS - 1] + "…"
+    return f"- [{c.status}] {c.field} = {c.proposed_value} ({reason})"
+
+
+def build_summary_prompt(brief_data: Dict[str, Any], contributions: Sequence = (), stats: Sequence = (),
+                         max_tokens: Optional[int] = None) -> str:
+    """The ai_summary user prompt, at most `max_tokens` (default SUMMARY_INPUT_TOKENS) where possible.
+
+    The brief itself is always included. Contribution lines and counts are
+    added in rank order while they fit.
+    """
+    max_tokens = settings.SUMMARY_INPUT_TOKENS if max_tokens is None else max_tokens
+    parts = ["Property:"] + compact_brief(brief_data)
+    used = estimate_tokens("\n".join(parts))
+
+    def add(line: str) -> bool:
+        nonlocal used
+        cost = estimate_tokens(line) + 1  # + newline
+        if used + cost > max_tokens:
+            return False
+        parts.append(line)
+        used += cost
+        return True
+
+    conflicted = [c.get("field") for c in (brief_data.get("_metadata") or {}).get("conflicts", [])]
+    ranked = rank_contributions(contributions, conflicted)
+    if ranked and add("User contributions (unverified unless accepted):"):
+        for c in ranked:
+            if not add(_contribution_line(c)):
+                break
+
+    contested = [s for s in stats if s.pending or s.rejected]
+    if contested and add("Contribution counts:"):
+        for s in sorted(contested, key=lambda s: -(s.pending + s.accepted + s.rejected)):
+            if not add(f"- {s.field}: {s.pending} pending, {s.accepted} accepted, {s.rejected} rejected"):
+                break
+
+    return "\n".join(parts)
@@ -0,0 +1,340 @@
+# app/properties.py
+"""
+Property endpoint logic shared by the sync routes (app/api.py) and the
+ASYNC_MODE routes (app/routers/async_api.py).
+
+Every function here takes a sync session. The sync routes call them directly.
+The async routes run them on the AsyncSession's sync session through
+`AsyncSession.run_sync`, so reads, writes, caching and conditional requests
+are implemented once. The routes keep only what differs between the two
+execution models: how adapters are fetched, how the LLM is called, and how
+concurrent ingests are coalesced.
+"""
+import json
+import logging
+from datetime import datetime
+from typing import Any, Collection, Dict, List, Optional
+
+from fastapi import HTTPException, Request, Response
+from pydantic_core import to_json
+
+from . import sharding, sharedcache
+from .brief import merge_sources_for_property
+from .cards import fallback_text
+from .conditional import (
+    brief_etag, sources_etag, projection_variant, is_conditional, not_modified, not_modified_response, validator_headers
+)
+from .config import settings
+from .crud import (
+    get_property_by_address, create_or_update_property, get_property, upsert_source_datum, get_source_data,
+    create_or_update_brief, get_brief, create_contribution, get_contributions, get_contribution_stats,
+    get_brief_version, get_sources_version, get_brief_projected, get_source_data_projected, is_stale, brief_as_of
+)
+from .materialize import record_read
+from .metrics import ADAPTER_DEADLINE_MISSES, BRIEF_MATERIALIZATIONS, CACHE_REQUESTS
+from .moderation import CONTRIBUTION_SOURCE
+from .prompts import build_summary_prompt
+from .schemas import PropertyRead, SourceDatumRead, BriefRead, ContributionCreate, ContributionRead
+from .utils import LLMRequestError, merge_source_data, calculate_completeness_score
+
+logger = logging.getLogger(__name__)
+
+# Sparse fieldsets: comma-separated top-level field names, e.g. fields=address,bedrooms,square_feet
+FIELD_LIST = r"^[A-Za-z0-9_]+(,[A-Za-z0-9_]+)*$"
+
+
+def get_property_or_404(session, property_id: int):
+    property = get_property(session, property_id)
+    if not property:
+        raise HTTPException(404, "Property not found")
+    return property
+
+
+# Ingest
+
+def store_ingest(session, normalized_addr: str, raw_address: str, fetched: Dict[str, Optional[Dict[str, Any]]],
+                 pending: Collection[str], property_id: Optional[int] = None) -> PropertyRead:
+    """Store one ingest's adapter payloads and merge the brief.
+
+    `fetched` holds the adapters that answered before the deadline, `pending`
+    names the ones still running; the caller stores those later with
+    finish_ingest().
+    """
+    # Upsert property
+    property = create_or_update_property(session, normalized_addr, raw_address, property_id)
+
+    sources = {}
+    for source_name, data in fetched.items():
+        if data:
+            sources[source_name] = data
+            # Upsert source datum (update if exists, create if not)
+            upsert_source_datum(session, property.id, source_name, data)
+
+    # Stored payloads stand in for sources that missed the deadline, and accepted
+    # contributions are stored as their own source and outrank the adapters
+    stored = get_source_data(session, property.id)
+    for datum in stored:
+        if datum.source_name in pending or datum.source_name == CONTRIBUTION_SOURCE:
+            sources[datum.source_name] = json.loads(datum.data)
+
+    # Merge data and create brief
+    if sources:
+        merged_data = merge_source_data(sources, property.raw_address)
+        if pending:
+            merged_data["_metadata"]["pending_sources"] = sorted(pending)
+        completeness_score = calculate_completeness_score(merged_data)
+        create_or_update_brief(
+            session, property.id, merged_data, completeness_score,
+            sources_as_of=max(datum.created_at for datum in stored),
+        )
+
+    for name in pending:
+        ADAPTER_DEADLINE_MISSES.inc(adapter=name)
+
+    result = PropertyRead.model_validate(property)
+    result.pending_sources = sorted(pending)
+    return result
+
+
+def finish_ingest(session, property_id: int, delivered: Dict[str, Optional[Dict[str, Any]]]) -> None:
+    """Store the payloads of adapters that missed the ingest deadline and re-merge the brief.
+
+    With LAZY_BRIEFS the re-merge is left to the next read, unless no adapter
+    delivered (the brief still needs its pending_sources marker cleared).
+    """
+    stored = False
+    for source_name, data in delivered.items():
+        if data:
+            upsert_source_datum(session, property_id, source_name, data)
+            stored = True
+    if not (stored and settings.LAZY_BRIEFS):
+        merge_sources_for_property(session, property_id)
+
+
+def ingested(session, normalized_addr: str) -> Optional[PropertyRead]:
+    """The property another worker just ingested, if it got as far as a brief."""
+    property = get_property_by_address(session, normalized_addr)
+    if property and get_brief(session, property.id):
+        return PropertyRead.model_validate(property)
+    return None
+
+
+# Reads
+
+def projection(fields: Optional[str], exclude: Optional[str]):
+    if fields and exclude:
+        raise HTTPException(400, "Use either fields or exclude, not both")
+    return (fields.split(",") if fields else None), (exclude.split(",") if exclude else None)
+
+
+def past_brief(brief, found, fields: Optional[List[str]], exclude: Optional[List[str]]) -> BriefRead:
+    """The brief as of a past moment (found by crud.brief_as_of): its fields then, without _metadata."""
+    if brief is None or found is None:
+        raise HTTPException(404, "No brief history at as_of for this property")
+    data, _, changed_at = found
+    completeness_score = calculate_completeness_score(data)
+    if fields:
+        data = {field: data.get(field) for field in fields}
+    elif exclude:
+        data = {k: v for k, v in data.items() if k not in exclude}
+    return BriefRead(id=brief.id, property_id=brief.property_id, data=data, completeness_score=completeness_score,
+                     created_at=brief.created_at, updated_at=changed_at)
+
+
+def cache_lookup(cache: str, key: str, property_id: int, request: Request):
+    """(response from a fresh shared-cache entry or None, version to tag a new entry with); see app/sharedcache.py."""
+    if not sharedcache.enabled():
+        return None, None
+    entry, version = sharedcache.lookup(key, property_id)
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if entry else "miss")
+    if entry is None:
+        return None, version
+    last_modified = datetime.fromisoformat(entry.last_modified) if entry.last_modified else None
+    if not_modified(request, entry.etag, last_modified):
+        return not_modified_response(entry.etag, last_modified), version
+    return Response(entry.body, media_type="application/json", headers=validator_headers(entry.etag, last_modified)), version
+
+
+def cache_store(key: str, property_id: int, version: int, result, etag: str, last_modified: Optional[datetime]) -> Response:
+    """Serialize `result` once, keep the bytes for every worker and send them."""
+    body = to_json(result)
+    sharedcache.put(key, property_id, version,
+                    sharedcache.Entry(body, etag, last_modified.isoformat() if last_modified else None))
+    return Response(body, media_type="application/json", headers=validator_headers(etag, last_modified))
+
+
+def property_sources(session, property_id: int, request: Request, response: Response,
+                     fields: Optional[str], exclude: Optional[str]):
+    """GET /properties/{id}/sources: the source payloads, or a 304 / cached response."""
+    fields, exclude = projection(fields, exclude)
+    variant = projection_variant(fields, exclude)
+    cache_key = f"sources:{property_id}{variant}"
+    cached, cache_version = cache_lookup("sources", cache_key, property_id, request)
+    if cached is not None:
+        return cached
+    if is_conditional(request):
+        count, newest = get_sources_version(session, property_id)
+        etag = sources_etag(property_id, count, newest, variant)
+        if count and not_modified(request, etag, newest):
+            return not_modified_response(etag, newest)
+
+    get_property_or_404(session, property_id)
+
+    source_data = get_source_data_projected(session, property_id, fields, exclude)
+    newest = max((datum.created_at for datum in source_data), default=None)
+    etag = sources_etag(property_id, len(source_data), newest, variant)
+    response.headers.update(validator_headers(etag, newest))
+    result = []
+    for datum in source_data:
+        # Parse JSON data before validation
+        datum_dict = dict(datum._mapping)
+        datum_dict['data'] = json.loads(datum.data)
+        result.append(SourceDatumRead.model_validate(datum_dict))
+
+    if cache_version is not None:
+        return cache_store(cache_key, property_id, cache_version, result, etag, newest)
+    return result
+
+
+def property_brief(session, property_id: int, request: Request, response: Response,
+                   fields: Optional[str], exclude: Optional[str], as_of: Optional[datetime]):
+    """GET /properties/{id}/brief: the brief (re-merged first if stale), a past version, or a 304 / cached response."""
+    fields, exclude = projection(fields, exclude)
+    if as_of is not None:
+        # Past versions bypass the shared cache and conditional requests
+        return past_brief(get_brief(session, property_id), brief_as_of(session, property_id, as_of), fields, exclude)
+    variant = projection_variant(fields, exclude)
+    cache_key = f"brief:{property_id}{variant}"
+    cached, cache_version = cache_lookup("brief", cache_key, property_id, request)
+    if cached is not None:
+        if settings.LAZY_BRIEFS:
+            record_read(property_id)
+        return cached
+    if is_conditional(request):
+        # A brief row implies the property exists, so a match needs only this lookup.
+        version = get_brief_version(session, property_id)
+        if version and not_modified(request, brief_etag(property_id, version[0], variant), version[1]):
+            return not_modified_response(brief_etag(property_id, version[0], variant), version[1])
+
+    get_property_or_404(session, property_id)
+
+    # Projection happens in SQLite, so only the requested part of the document is decoded
+    brief = get_brief_projected(session, property_id, fields, exclude)
+    if not brief or is_stale(brief.sources_as_of, brief.sources_changed_at):
+        # Sources changed since the last merge (LAZY_BRIEFS, or a load with --no-merge)
+        if merge_sources_for_property(session, property_id)[0] is not None:
+            BRIEF_MATERIALIZATIONS.inc(trigger="read")
+            brief = get_brief_projected(session, property_id, fields, exclude)
+    if not brief:
+        raise HTTPException(404, "Brief not found for this property")
+    if settings.LAZY_BRIEFS:
+        record_read(property_id)
+
+    etag = brief_etag(property_id, brief.version, variant)
+    response.headers.update(validator_headers(etag, brief.updated_at))
+
+    # Parse JSON data before validation
+    brief_dict = dict(brief._mapping)
+    brief_dict['data'] = json.loads(brief.data)
+    result = BriefRead.model_validate(brief_dict)
+    if cache_version is not None:
+        return cache_store(cache_key, property_id, cache_version, result, etag, brief.updated_at)
+    return result
+
+
+# Contributions
+
+def add_contribution(session, property_id: int, payload: ContributionCreate) -> ContributionRead:
+    get_property_or_404(session, property_id)
+    contribution = create_contribution(
+        session, property_id, payload.field, payload.proposed_value,
+        payload.reason, payload.contributor,
+        contribution_id=sharding.allocate_contribution_id(property_id) if sharding.enabled() else None,
+    )
+    return ContributionRead.model_validate(contribution)
+
+
+def list_contributions(session, property_id: int, status: Optional[str], limit: int) -> List[ContributionRead]:
+    get_property_or_404(session, property_id)
+    contributions = get_contributions(session, property_id, limit=limit, statuses=[status] if status else None)
+    return [ContributionRead.model_validate(c) for c in contributions]
+
+
+# AI summary
+
+def summary_inputs(session, property_id: int, prompt_override: Optional[str]):
+    """(brief, contributions, prompt) for POST /properties/{id}/ai_summary."""
+    get_property_or_404(session, property_id)
+    brief = get_brief(session, property_id)
+    if not brief:
+        raise HTTPException(404, "Brief not found for this property")
+
+    # Recent open/accepted contributions plus per-field counts, rather than every contribution
+    contributions = get_contributions(
+        session, property_id, limit=settings.SUMMARY_MAX_CONTRIBUTIONS, statuses=["pending", "accepted"]
+    )
+    stats = get_contribution_stats(session, property_id)
+    prompt = prompt_override or build_summary_prompt(json.loads(brief.data), contributions, stats)
+    return brief, contributions, prompt
+
+
+def summary_response(brief, contributions: list, summary: Optional[str], error: Optional[Exception] = None) -> dict:
+    """The LLM's summary, or the rule-based fallback with what went wrong when the call raised `error`."""
+    if error is None:
+        return {
+            "summary": summary,
+            "source": "openai",
+            "completeness_score": brief.completeness_score
+        }
+    return fallback_summary(brief, contributions, llm_error_details(error))
+
+
+def llm_error_details(e: Exception) -> dict:
+    """What went wrong in call_llm_topics/acall_llm_topics, for the fallback summary's error field."""
+    if isinstance(e, LLMRequestError):
+        # Network/HTTP related errors
+        return {
+            "error_type": "request_exception",
+            "error_message": str(e),
+            "status_code": e.status_code,
+            "response_text": e.response_text
+        }
+    if isinstance(e, KeyError):
+        # Missing key in response
+        return {
+            "error_type": "key_error",
+            "error_message": f"Missing key in OpenAI response: {str(e)}",
+            "expected_keys": ["choices", "message", "content"]
+        }
+    if isinstance(e, json.JSONDecodeError):
+        return {
+            "error_type": "json_decode_error",
+            "error_message": f"Failed to parse OpenAI response JSON: {str(e)}"
+        }
+    return {
+        "error_type": "unexpected_error",
+        "error_message": str(e),
+        "error_class": type(e).__name__
+    }
+
+
+def fallback_summary(brief, contributions: list, error_details: dict) -> dict:
+    """Rule-based fallback summary with error details: the brief's stored text plus contributions."""
+    text = brief.fallback_summary
+    if text is None:  # brief not rewritten since the text was stored with it
+        text = fallback_text(json.loads(brief.data))
+    summary_parts = [text] if text else []
+
+    # Add contributions if any
+    if contributions:
+        contrib_text = "User contributions: " + ", ".join([f"{c.field}={c.proposed_value}" for c in contributions])
+        summary_parts.append(contrib_text)
+
+    summary = ". ".join(summary_parts) + "."
+
+    return {
+        "summary": summary,
+        "source": "rule_based_fallback",
+        "error_details": error_details,
+        "completeness_score": brief.completeness_score
+    }
@@ -0,0 +1,125 @@
+"""
+Per-request SQL statistics fed by the engine event listeners in app/deps.py.
+
+Each HTTP request gets a QueryStats in a context variable (copied into the
+threadpool that runs sync endpoints), so the listeners can attribute every
+statement to the request that issued it. The middleware reports the totals in
+response headers and flags statements repeated often enough to look like an
+N+1 pattern. `capture_queries` / `assert_max_queries` collect statements
+process-wide, which is what tests driving the app through TestClient need.
+"""
+import logging
+import threading
+from collections import Counter as _StatementCounter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional
+
+from .config import settings
+from .profiling import checkpoint
+
+logger = logging.getLogger(__name__)
+
+_current: ContextVar[Optional["QueryStats"]] = ContextVar("query_stats", default=None)
+_collectors: List["QueryStats"] = []
+_collectors_lock = threading.Lock()
+
+
+class QueryStats:
+    __slots__ = ("count", "total_seconds", "statements", "_lock")
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.statements = _StatementCounter()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, seconds: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.statements[statement] += 1
+
+    def repeated(self, threshold: int):
+        """Statements executed at least `threshold` times, most frequent first."""
+        return [(stmt, n) for stmt, n in self.statements.most_common() if n >= threshold]
+
+
+def record_query(statement: str, parameters, seconds: float) -> None:
+    """Called by the engine listener after every statement."""
+    checkpoint()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+    if _collectors:
+        with _collectors_lock:
+            for collector in _collectors:
+                collector.record(statement, seconds)
+    if seconds * 1000 >= settings.SLOW_QUERY_MS:
+        logger.warning("slow query (%.1f ms): %s params=%r", seconds * 1000, statement, parameters)
+
+
+@contextmanager
+def capture_queries():
+    """Collect every statement run on the engine, from any thread, while active."""
+    stats = QueryStats()
+    with _collectors_lock:
+        _collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        with _collectors_lock:
+            _collectors.remove(stats)
+
+
+@contextmanager
+def assert_max_queries(max_queries: int):
+    """Fail if the enclosed block issues more than `max_queries` statements.
+
+        with assert_max_queries(3):
+            client.get("/properties/1/brief")
+    """
+    with capture_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        listing = "\n".join(f"  {n}x {stmt}" for stmt, n in stats.statements.most_common())
+        raise AssertionError(f"expected at most {max_queries} queries, got {stats.count}:\n{listing}")
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware reporting per-request query count and time.
+
+    Adds `X-DB-Query-Count` and `X-DB-Query-Time-Ms` response headers and logs
+    statements repeated `N_PLUS_ONE_THRESHOLD` or more times in one request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and settings.QUERY_STATS_HEADERS:
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(stats.count).encode()))
+                headers.append((b"x-db-query-time-ms", f"{stats.total_seconds * 1000:.2f}".encode()))
+                message["headers"] = headers
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            route = getattr(scope.get("route"), "path", scope.get("path"))
+            for statement, n in stats.repeated(settings.N_PLUS_ONE_THRESHOLD):
+                logger.warning("possible N+1 in %s %s: %d executions of %s", scope["method"], route, n, statement)
+            logger.debug(
+                "%s %s issued %d queries in %.2f ms",
+                scope["method"], route, stats.count, stats.total_seconds * 1000,
+            )
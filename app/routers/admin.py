@@ -0,0 +1,40 @@
+# app/routers/admin.py
+import os
+import re
+from fastapi import APIRouter, Header, HTTPException
+from fastapi.responses import FileResponse
+from ..config import settings
+from ..profiling import MODES, is_admin, profile_path
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+PROFILE_ID_RE = re.compile(r"^[\w-]+$")
+
+def _require_admin(token: str) -> None:
+    if not is_admin(token):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+@router.get("/profiles")
+def list_profiles(x_admin_token: str = Header("")):
+    """List stored profiles, newest first."""
+    _require_admin(x_admin_token)
+    if not os.path.isdir(settings.PROFILE_DIR):
+        return []
+    entries = []
+    for name in os.listdir(settings.PROFILE_DIR):
+        profile_id, _, mode = name.rpartition(".")
+        if mode in MODES:
+            entries.append({"id": profile_id, "format": mode, "bytes": os.path.getsize(os.path.join(settings.PROFILE_DIR, name))})
+    return sorted(entries, key=lambda e: e["id"], reverse=True)
+
+@router.get("/profiles/{profile_id}")
+def get_profile(profile_id: str, x_admin_token: str = Header("")):
+    """Download a stored profile: pstats binary or collapsed stacks for flamegraph.pl / speedscope."""
+    _require_admin(x_admin_token)
+    if not PROFILE_ID_RE.match(profile_id):
+        raise HTTPException(status_code=400, detail="Invalid profile id")
+    for mode in MODES:
+        path = profile_path(profile_id, mode)
+        if os.path.exists(path):
+            media_type = "application/octet-stream" if mode == "pstats" else "text/plain"
+            return FileResponse(path, media_type=media_type, filename=os.path.basename(path))
+    raise HTTPException(status_code=404, detail="Profile not found")
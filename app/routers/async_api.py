@@ -0,0 +1,132 @@
+# app/routers/async_api.py
+"""
+Async versions of the property endpoints, mounted in place of the sync ones
+when ASYNC_MODE is on. Paths, request and response schemas match app/api.py,
+and both call the same logic in app/properties.py; here it runs on the
+aiosqlite connection through AsyncSession.run_sync. Only the execution model
+differs: adapters are fetched concurrently and the LLM call awaits an
+httpx.AsyncClient, so an in-flight request holds no threadpool slot.
+"""
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Optional
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, Query, Request, Response
+from sqlmodel.ext.asyncio.session import AsyncSession
+from .. import properties
+from ..async_deps import async_engine, get_async_session
+from ..config import settings
+from ..properties import FIELD_LIST
+from ..schemas import (
+    PropertyCreate, PropertyRead, SourceDatumRead, BriefRead,
+    ContributionCreate, ContributionRead, AISummaryRequest
+)
+from ..utils import normalize_address, acall_llm_topics
+from ..adapters import INGEST_SOURCES, afetch_source, load_adapter
+from ..singleflight import acoalesce
+from ..deadline import deadline_scope, ingest_deadline, remaining as deadline_remaining
+
+# Same contract as the sync routes, so keep the sync versions in the OpenAPI schema.
+router = APIRouter(tags=["async"], include_in_schema=False)
+logger = logging.getLogger(__name__)
+
+@router.post("/properties/ingest", response_model=PropertyRead, status_code=201)
+async def ingest_property(
+    payload: PropertyCreate,
+    background: BackgroundTasks,
+    x_deadline_ms: Optional[float] = Header(None),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """
+    Ingest property data from all sources and create/update brief.
+    """
+    normalized_addr = normalize_address(payload.address)
+    with deadline_scope(ingest_deadline(x_deadline_ms)):
+        return await acoalesce(
+            session, f"address:{normalized_addr}",
+            lambda: _ingest(session, normalized_addr, payload.address, background),
+            lambda: session.run_sync(properties.ingested, normalized_addr),
+        )
+
+async def _ingest(session: AsyncSession, normalized_addr: str, raw_address: str, background: BackgroundTasks) -> PropertyRead:
+    # Fetch data from all adapters concurrently, waiting no longer than the deadline
+    tasks = {name: asyncio.ensure_future(afetch_source(name, load_adapter(name, "afetch"), normalized_addr))
+             for name in INGEST_SOURCES}
+    await asyncio.wait(tasks.values(), timeout=deadline_remaining())
+    pending = {name: task for name, task in tasks.items() if not task.done()}
+    fetched = {name: task.result() for name, task in tasks.items() if name not in pending}
+
+    result = await session.run_sync(properties.store_ingest, normalized_addr, raw_address, fetched, pending)
+    if pending:
+        background.add_task(_finish_ingest, result.id, pending)
+    return result
+
+async def _finish_ingest(property_id: int, pending: Dict[str, "asyncio.Task"]):
+    """Wait for the adapters that missed the ingest deadline, then store them (properties.finish_ingest)."""
+    done, _ = await asyncio.wait(pending.values(), timeout=settings.ADAPTER_TIMEOUT_S)
+    delivered = {}
+    for source_name, task in pending.items():
+        if task not in done or task.exception():
+            logger.warning("adapter %s failed after ingest deadline for property %s", source_name, property_id)
+            continue
+        delivered[source_name] = task.result()
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        await session.run_sync(properties.finish_ingest, property_id, delivered)
+
+@router.get("/properties/{property_id}/sources", response_model=list[SourceDatumRead])
+async def get_property_sources(
+    property_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, pattern=FIELD_LIST),
+    exclude: Optional[str] = Query(None, pattern=FIELD_LIST),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Get all source data for a property, optionally projected with fields= or exclude=."""
+    return await session.run_sync(properties.property_sources, property_id, request, response, fields, exclude)
+
+@router.get("/properties/{property_id}/brief", response_model=BriefRead)
+async def get_property_brief(
+    property_id: int,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, pattern=FIELD_LIST),
+    exclude: Optional[str] = Query(None, pattern=FIELD_LIST),
+    as_of: Optional[datetime] = None,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Get the property brief, optionally projected with fields= or exclude=, or as of a past moment."""
+    return await session.run_sync(properties.property_brief, property_id, request, response, fields, exclude, as_of)
+
+@router.post("/properties/{property_id}/contributions", response_model=ContributionRead, status_code=201)
+async def create_property_contribution(
+    property_id: int,
+    payload: ContributionCreate,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Create a contribution for a property."""
+    return await session.run_sync(properties.add_contribution, property_id, payload)
+
+@router.get("/properties/{property_id}/contributions", response_model=list[ContributionRead])
+async def get_property_contributions(
+    property_id: int,
+    status: Optional[str] = Query(None, pattern="^(pending|accepted|rejected)$"),
+    limit: int = Query(50, ge=1, le=200),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Get the newest contributions for a property."""
+    return await session.run_sync(properties.list_contributions, property_id, status, limit)
+
+@router.post("/properties/{property_id}/ai_summary")
+async def get_ai_summary(
+    property_id: int,
+    payload: AISummaryRequest,
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Generate AI summary for property using acall_llm_topics."""
+    brief, contributions, prompt = await session.run_sync(properties.summary_inputs, property_id, payload.prompt_override)
+    try:
+        summary = await acall_llm_topics(prompt)
+    except Exception as e:
+        return properties.summary_response(brief, contributions, None, e)
+    return properties.summary_response(brief, contributions, summary)
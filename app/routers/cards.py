@@ -0,0 +1,44 @@
+# app/routers/cards.py
+import json
+from collections import defaultdict
+from typing import Dict, List, Optional
+from fastapi import APIRouter, HTTPException, Query, Response
+from sqlmodel import Session
+from .. import sharding
+from ..brief import merge_properties
+from ..config import settings
+from ..crud import get_cards
+from ..metrics import BRIEF_MATERIALIZATIONS
+
+router = APIRouter(tags=["cards"])
+
+@router.get("/properties/cards")
+def property_cards(ids: str = Query(..., pattern=r"^\d+(,\d+)*$")):
+    """Listing cards for many properties (ids=1,2,3) in `ids` order; ids without a brief are in `missing`.
+
+    Cards are stored with their brief, so this is one query (per shard when
+    sharded) and the stored JSON goes into the response without decoding.
+    Stale briefs (LAZY_BRIEFS, or a load with --no-merge) are re-merged first,
+    as GET /properties/{id}/brief does.
+    """
+    property_ids = list(dict.fromkeys(int(i) for i in ids.split(",")))
+    if len(property_ids) > settings.CARDS_MAX_IDS:
+        raise HTTPException(400, f"at most {settings.CARDS_MAX_IDS} ids per request")
+    groups: Dict[Optional[int], List[int]] = {None: property_ids}
+    if sharding.enabled():
+        groups = defaultdict(list)
+        for property_id, shard in sharding.locate_properties(property_ids).items():
+            groups[shard].append(property_id)
+    cards: Dict[int, str] = {}
+    for shard, shard_ids in groups.items():
+        with Session(sharding.engine_for_shard(shard)) as session:
+            shard_cards, stale = get_cards(session, shard_ids)
+            if stale:
+                merge_properties(session, stale)
+                session.commit()
+                BRIEF_MATERIALIZATIONS.inc(len(stale), trigger="read")
+                shard_cards.update(get_cards(session, stale)[0])
+            cards.update(shard_cards)
+    body = '{"data":[' + ",".join(cards[i] for i in property_ids if i in cards) + "]"
+    body += ',"missing":' + json.dumps([i for i in property_ids if i not in cards]) + "}"
+    return Response(body, media_type="application/json")
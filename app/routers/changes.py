@@ -0,0 +1,59 @@
+# app/routers/changes.py
+import heapq
+import json
+from itertools import islice
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
+from ..config import settings
+from ..deps import get_session
+from ..crud import list_brief_changes
+from ..schemas import BriefChangeRead
+from ..sharding import all_shard_sessions, enabled as sharded
+
+router = APIRouter(tags=["changes"])
+
+def _read(c) -> dict:
+    return BriefChangeRead(
+        seq=c.seq, property_id=c.property_id,
+        changed_fields=json.loads(c.changed_fields), created_at=c.created_at
+    ).model_dump()
+
+@router.get("/briefs/changes")
+def brief_changes(
+    after: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, pattern=r"^\d+(,\d+)*$"),
+    limit: int = Query(100, ge=1, le=1000),
+    session: Session = Depends(get_session),
+):
+    """Brief changes with seq > after, oldest first.
+
+    Consumers store `next_after` and pass it back as `after`; an empty page
+    means they are up to date. When sharded, seq is per shard: consumers
+    store `next_cursor` (one position per shard) and pass it back as `cursor`.
+    """
+    if sharded():
+        return _sharded_changes(cursor, limit)
+    page = list_brief_changes(session, after, limit)
+    return {
+        "data": [_read(c) for c in page],
+        "next_after": page[-1].seq if page else after,
+    }
+
+def _sharded_changes(cursor: Optional[str], limit: int):
+    positions = [int(p) for p in cursor.split(",")] if cursor else [0] * settings.SHARD_COUNT
+    if len(positions) != settings.SHARD_COUNT:
+        raise HTTPException(400, f"cursor must have {settings.SHARD_COUNT} positions")
+    with all_shard_sessions() as sessions:
+        pages = [
+            [(shard, c) for c in list_brief_changes(s, positions[shard], limit)]
+            for shard, s in enumerate(sessions)
+        ]
+    # Each shard's entries are consumed in seq order, so the last one taken is that shard's new position
+    page = list(islice(heapq.merge(*pages, key=lambda entry: (entry[1].created_at, entry[0])), limit))
+    for shard, c in page:
+        positions[shard] = c.seq
+    return {
+        "data": [_read(c) for _, c in page],
+        "next_cursor": ",".join(map(str, positions)),
+    }
@@ -0,0 +1,72 @@
+# app/routers/contributions.py
+import heapq
+from itertools import islice
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from sqlmodel import Session
+from ..deps import get_session
+from ..crud import get_contribution, get_property, get_contribution_stats, list_contributions_by_status
+from ..moderation import (
+    InvalidTransition, accept_contribution, reject_contribution, decode_cursor, next_cursor
+)
+from ..profiling import is_admin
+from ..sharding import all_shard_sessions
+from ..schemas import ContributionRead, ContributionStatsRead
+
+router = APIRouter(tags=["contributions"])
+
+def _require_reviewer(token: str) -> None:
+    if not is_admin(token):
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+@router.get("/contributions")
+def list_contributions(
+    status: str = Query("pending", pattern="^(pending|accepted|rejected)$"),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+):
+    """Review queue across all properties, oldest first, with keyset pagination.
+
+    Each shard returns its own first `limit` rows after the cursor; merging
+    them and keeping `limit` gives the global page, since (created_at, id) is
+    a total order and contribution ids are global.
+    """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    with all_shard_sessions() as sessions:
+        pages = [list_contributions_by_status(s, status, after, limit) for s in sessions]
+        page = list(islice(heapq.merge(*pages, key=lambda c: (c.created_at, c.id)), limit))
+    return {
+        "data": [ContributionRead.model_validate(c).model_dump() for c in page],
+        "next_cursor": next_cursor(page, limit),
+    }
+
+def _review(contribution_id: int, session: Session, action):
+    contribution = get_contribution(session, contribution_id)
+    if not contribution:
+        raise HTTPException(status_code=404, detail="Contribution not found")
+    try:
+        return ContributionRead.model_validate(action(session, contribution))
+    except InvalidTransition as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+@router.post("/contributions/{contribution_id}/accept", response_model=ContributionRead)
+def accept(contribution_id: int, x_admin_token: str = Header(""), session: Session = Depends(get_session)):
+    """Accept a pending contribution and apply its value to the property's brief."""
+    _require_reviewer(x_admin_token)
+    return _review(contribution_id, session, accept_contribution)
+
+@router.post("/contributions/{contribution_id}/reject", response_model=ContributionRead)
+def reject(contribution_id: int, x_admin_token: str = Header(""), session: Session = Depends(get_session)):
+    """Reject a pending contribution."""
+    _require_reviewer(x_admin_token)
+    return _review(contribution_id, session, reject_contribution)
+
+@router.get("/properties/{property_id}/contributions/summary", response_model=list[ContributionStatsRead])
+def contribution_summary(property_id: int, session: Session = Depends(get_session)):
+    """Per-field contribution counts for a property."""
+    if not get_property(session, property_id):
+        raise HTTPException(404, "Property not found")
+    return [ContributionStatsRead.model_validate(s) for s in get_contribution_stats(session, property_id)]
@@ -0,0 +1,81 @@
+# app/routers/disputes.py
+import heapq
+import json
+from itertools import islice
+from typing import Dict, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
+from ..config import settings
+from ..deps import get_session
+from ..crud import get_dispute_stats, list_field_issues
+from ..schemas import DisputeStatsRead, FieldIssueRead
+from ..sharding import all_shard_sessions, enabled as sharded
+
+router = APIRouter(tags=["disputes"])
+
+def _sources(sources: str) -> list:
+    return [s for s in sources.split(",") if s]
+
+def _read(issue) -> dict:
+    return FieldIssueRead(
+        id=issue.id, property_id=issue.property_id, field_name=issue.field_name,
+        values=json.loads(issue.conflicting_values), sources=_sources(issue.sources), status=issue.status,
+        created_at=issue.created_at, updated_at=issue.updated_at, resolved_at=issue.resolved_at,
+    ).model_dump()
+
+@router.get("/disputes")
+def list_disputes(
+    field: Optional[str] = None,
+    source: Optional[str] = None,
+    status: str = Query("open", pattern="^(open|resolved)$"),
+    after: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, pattern=r"^\d+(,\d+)*$"),
+    limit: int = Query(50, ge=1, le=500),
+    session: Session = Depends(get_session),
+):
+    """Field-level source disagreements, oldest first, optionally for one field and/or source.
+
+    Pages are keyset-paginated: pass `next_after` back as `after`. When
+    sharded, issue ids are per shard: pass `next_cursor` back as `cursor`.
+    """
+    if sharded():
+        return _sharded_disputes(field, source, status, cursor, limit)
+    page = list_field_issues(session, field, source, status, after, limit)
+    return {
+        "data": [_read(issue) for issue in page],
+        "next_after": page[-1].id if page else after,
+    }
+
+def _sharded_disputes(field, source, status, cursor: Optional[str], limit: int):
+    positions = [int(p) for p in cursor.split(",")] if cursor else [0] * settings.SHARD_COUNT
+    if len(positions) != settings.SHARD_COUNT:
+        raise HTTPException(400, f"cursor must have {settings.SHARD_COUNT} positions")
+    with all_shard_sessions() as sessions:
+        pages = [
+            [(shard, issue) for issue in list_field_issues(s, field, source, status, positions[shard], limit)]
+            for shard, s in enumerate(sessions)
+        ]
+    page = list(islice(heapq.merge(*pages, key=lambda entry: (entry[1].created_at, entry[0])), limit))
+    for shard, issue in page:
+        positions[shard] = issue.id
+    return {
+        "data": [_read(issue) for _, issue in page],
+        "next_cursor": ",".join(map(str, positions)),
+    }
+
+@router.get("/disputes/counts")
+def dispute_counts(field: Optional[str] = None, source: Optional[str] = None):
+    """Open and all-time dispute counts per (field, disagreeing sources), read from the DisputeStats counters."""
+    totals: Dict[Tuple[str, str], list] = {}
+    with all_shard_sessions() as sessions:
+        for s in sessions:
+            for row in get_dispute_stats(s, field, source):
+                counts = totals.setdefault((row.field_name, row.sources), [0, 0])
+                counts[0] += row.open
+                counts[1] += row.total
+    return {
+        "data": [
+            DisputeStatsRead(field_name=f, sources=_sources(sources), open=o, total=t).model_dump()
+            for (f, sources), (o, t) in sorted(totals.items())
+        ]
+    }
@@ -0,0 +1,23 @@
+# app/routers/export.py
+from datetime import datetime
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from ..export import FORMATS, MEDIA_TYPES, parquet_available, stream_export
+
+router = APIRouter(tags=["export"])
+
+@router.get("/briefs/export")
+def export_briefs(
+    format: str = Query("ndjson", pattern="^(" + "|".join(FORMATS) + ")$"),
+    updated_since: Optional[datetime] = None,
+    min_completeness: Optional[int] = Query(None, ge=0, le=100),
+):
+    """Stream every matching brief with its provenance; memory use does not grow with the result size."""
+    if format == "parquet" and not parquet_available():
+        raise HTTPException(status_code=501, detail="Parquet export requires pyarrow")
+    return StreamingResponse(
+        stream_export(format, updated_since, min_completeness),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="briefs.{format}"'},
+    )
@@ -0,0 +1,34 @@
+# app/routers/history.py
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlmodel import Session
+from ..deps import get_session
+from ..crud import get_property, list_brief_history
+from ..schemas import BriefHistoryRead
+
+router = APIRouter(tags=["history"])
+
+@router.get("/properties/{property_id}/brief/history")
+def brief_history(
+    property_id: int,
+    field: Optional[str] = Query(None, pattern=r"^\w+$"),
+    after: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    session: Session = Depends(get_session),
+):
+    """The property's brief changes, oldest first, optionally only those to one field.
+
+    Pass `next_after` back as `after` for the next page. A brief's first
+    entry sets every field it had then.
+    """
+    if not get_property(session, property_id):
+        raise HTTPException(404, "Property not found")
+    page = list_brief_history(session, property_id, field, after, limit)
+    return {
+        "data": [
+            BriefHistoryRead(id=id, version=version, changes=delta["set"], removed=delta.get("unset", []),
+                             changed_at=created_at).model_dump()
+            for id, version, delta, created_at in page
+        ],
+        "next_after": page[-1][0] if page else after,
+    }
@@ -1,50 +1,165 @@
 # app/routers/webhooks.py
 import hmac, hashlib
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
-from sqlmodel import Session
-from ..deps import get_session, engine
+import json
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from pydantic import TypeAdapter, ValidationError
+from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
+from .. import sharding
+from ..adapters import INGEST_SOURCES
+from ..deps import engine
+from ..config import settings
+from ..crud import bulk_upsert_properties, bulk_upsert_source_data
 from ..models import Property
-from ..crud import upsert_source_datum
-from ..adapters.county import fetch as county_fetch
-from ..adapters.listing import fetch as listing_fetch
-from ..adapters.hoa import fetch as hoa_fetch
-from ..brief import merge_sources_for_property
+from ..brief import merge_properties, refresh_property_sources, brief_status
+from ..profiling import profiled_job
+from ..schemas import SourceUpdate
+from ..sharding import session_for_property
+from ..singleflight import coalesce
+from ..utils import normalize_address
 
 router = APIRouter(tags=["webhooks"])
 WEBHOOK_SECRET = b"dev-secret"  # document: replace with env var in prod
 
+_SOURCE_UPDATES = TypeAdapter(List[SourceUpdate])
+Sources = Dict[str, Dict[str, Any]]  # source_name -> payload
+
 def _verify_hmac(raw: bytes, sig_hex: str) -> bool:
     mac = hmac.new(WEBHOOK_SECRET, raw, hashlib.sha256).hexdigest()
     return hmac.compare_digest(mac, sig_hex or "")
 
+@profiled_job("webhook-refresh")
 def _refresh_in_background(property_id: int):
-    from sqlmodel import Session as _Session  # local import to avoid cycles
-    with _Session(engine) as s:
+    with session_for_property(property_id) as s:
         prop = s.get(Property, property_id)
         if not prop:
             return
         normalized = prop.normalized_address
-        for name, fetch in {"county": county_fetch, "listing": listing_fetch, "hoa": hoa_fetch}.items():
-            payload = fetch(normalized)
-            if payload:
-                upsert_source_datum(s, property_id, name, payload)
-        merge_sources_for_property(s, property_id)
+        if settings.LAZY_BRIEFS:
+            # Stores sources only and returns None, so it must not share a flight with
+            # POST /properties/{id}/refresh, whose callers need the merged (completeness, conflicts)
+            coalesce(
+                s, f"property-sources:{property_id}",
+                lambda: refresh_property_sources(s, property_id, normalized, materialize=False),
+                lambda: None,
+            )
+            return
+        coalesce(
+            s, f"property:{property_id}",
+            lambda: refresh_property_sources(s, property_id, normalized),
+            lambda: brief_status(s, property_id),
+        )
 
 @router.post("/webhooks/source-update")
-async def source_update(request: Request, background: BackgroundTasks, session: Session = Depends(get_session)):
+async def source_update(request: Request, background: BackgroundTasks):
     raw = await request.body()
     sig = request.headers.get("X-Signature", "")
     if not _verify_hmac(raw, sig):
         raise HTTPException(status_code=401, detail="Invalid signature")
 
     try:
-        data = await request.json()
-    except Exception:
+        data = json.loads(raw)
+    except ValueError:
         raise HTTPException(status_code=400, detail="Invalid JSON")
 
-    property_id = data.get("property_id")
+    property_id = data.get("property_id") if isinstance(data, dict) else None
     if not property_id:
         raise HTTPException(status_code=400, detail="Missing property_id")
 
     background.add_task(_refresh_in_background, int(property_id))
     return {"status": "accepted", "property_id": int(property_id)}
+
+async def _read_capped(request: Request, limit: int) -> bytes:
+    """The request body, or 413 as soon as it is known to exceed `limit` bytes (Content-Length or streamed)."""
+    too_large = HTTPException(status_code=413, detail=f"Body larger than {limit} bytes")
+    declared = request.headers.get("content-length", "")
+    if declared.isdigit() and int(declared) > limit:
+        raise too_large
+    chunks, size = [], 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > limit:
+            raise too_large
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+@router.post("/webhooks/source-batch")
+async def source_batch(request: Request):
+    """Apply pushed source payloads: a signed JSON array of {property_id or address, source_name, payload}.
+
+    Bodies over WEBHOOK_MAX_BYTES are refused before they are read; the rest
+    are verified and parsed once. Payloads are stored as-is, with no
+    adapter round trips, in one transaction (per shard when sharded), and only
+    the affected properties are re-merged. Unknown property ids are skipped
+    and reported. Addresses create their property if needed.
+    """
+    raw = await _read_capped(request, settings.WEBHOOK_MAX_BYTES)
+    if not _verify_hmac(raw, request.headers.get("X-Signature", "")):
+        raise HTTPException(status_code=401, detail="Invalid signature")
+    try:
+        updates = _SOURCE_UPDATES.validate_json(raw)
+    except ValidationError as exc:
+        raise HTTPException(status_code=422, detail=exc.errors(include_url=False, include_input=False)[:20])
+    if len(updates) > settings.WEBHOOK_MAX_BATCH:
+        raise HTTPException(status_code=413, detail=f"At most {settings.WEBHOOK_MAX_BATCH} updates per request")
+    unknown_sources = sorted({u.source_name for u in updates} - set(INGEST_SOURCES))
+    if unknown_sources:
+        raise HTTPException(status_code=422, detail=f"Unknown source_name: {', '.join(unknown_sources)}")
+    unaddressed = [i for i, u in enumerate(updates) if u.property_id is None and not normalize_address(u.address or "")]
+    if unaddressed:
+        raise HTTPException(status_code=422, detail=f"Updates without property_id or address: {unaddressed[:20]}")
+
+    applied, properties, unknown = await run_in_threadpool(_apply_updates, updates)
+    return {"status": "applied", "updates": applied, "properties": properties, "unknown_property_ids": unknown}
+
+def _apply_updates(updates: List[SourceUpdate]) -> Tuple[int, int, List[int]]:
+    """(rows upserted, properties affected, unknown property ids), committing per shard."""
+    by_id: Dict[int, Sources] = defaultdict(dict)
+    by_address: Dict[str, Sources] = defaultdict(dict)
+    raw_addresses: Dict[str, str] = {}
+    for update in updates:  # later updates for the same property and source win
+        if update.property_id is not None:
+            by_id[update.property_id][update.source_name] = update.payload
+        else:
+            normalized = normalize_address(update.address)
+            by_address[normalized][update.source_name] = update.payload
+            raw_addresses[normalized] = update.address
+
+    if not sharding.enabled():
+        with Session(engine) as session:
+            result = _apply(session, by_id, by_address, raw_addresses)
+            session.commit()
+        return result
+
+    groups: Dict[int, Tuple[Dict[int, Sources], Dict[str, Sources], Dict[str, int]]] = defaultdict(lambda: ({}, {}, {}))
+    for property_id, shard in sharding.locate_properties(by_id).items():
+        groups[shard][0][property_id] = by_id[property_id]
+    for normalized, (property_id, shard) in sharding.assign_properties(by_address).items():
+        groups[shard][1][normalized] = by_address[normalized]
+        groups[shard][2][normalized] = property_id
+    applied = properties = 0
+    known = set()
+    for shard, (shard_ids, shard_addresses, property_ids) in sorted(groups.items()):
+        with Session(sharding.engine_for_shard(shard)) as session:
+            rows, affected, missing = _apply(session, shard_ids, shard_addresses, raw_addresses, property_ids)
+            session.commit()
+        applied, properties = applied + rows, properties + affected
+        known.update(set(shard_ids) - set(missing))
+    return applied, properties, sorted(set(by_id) - known)
+
+def _apply(
+    session, by_id: Dict[int, Sources], by_address: Dict[str, Sources], raw_addresses: Dict[str, str],
+    property_ids: Optional[Dict[str, int]] = None,
+) -> Tuple[int, int, List[int]]:
+    known = set(session.exec(select(Property.id).where(Property.id.in_(list(by_id)))).all()) if by_id else set()
+    ids = bulk_upsert_properties(session, {normalized: raw_addresses[normalized] for normalized in by_address}, property_ids)
+    targets: Dict[int, Sources] = {property_id: dict(sources) for property_id, sources in by_id.items() if property_id in known}
+    for normalized, sources in by_address.items():
+        targets.setdefault(ids[normalized], {}).update(sources)
+    rows = [(property_id, name, payload) for property_id, sources in targets.items() for name, payload in sources.items()]
+    bulk_upsert_source_data(session, rows)
+    if not settings.LAZY_BRIEFS:
+        merge_properties(session, list(targets))
+    return len(rows), len(targets), sorted(set(by_id) - known)
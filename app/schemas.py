@@ -1,7 +1,7 @@
 from datetime import datetime
 from pydantic import BaseModel, Field
 from pydantic import ConfigDict  # <-- add this import
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 class ItemCreate(BaseModel):
     title: str = Field(min_length=1, max_length=200)
@@ -28,6 +28,7 @@ class PropertyRead(BaseModel):
     raw_address: str
     created_at: datetime
     updated_at: datetime
+    pending_sources: List[str] = []  # sources still being fetched after an ingest deadline
 
 class SourceDatumRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -48,6 +49,19 @@ class BriefRead(BaseModel):
     created_at: datetime
     updated_at: datetime
 
+class BriefChangeRead(BaseModel):
+    seq: int
+    property_id: int
+    changed_fields: List[str]
+    created_at: datetime
+
+class BriefHistoryRead(BaseModel):
+    id: int
+    version: int
+    changes: Dict[str, Any]  # new values of the fields this change set
+    removed: List[str]  # fields this change dropped
+    changed_at: datetime
+
 class ContributionCreate(BaseModel):
     field: str = Field(min_length=1, max_length=100)
     proposed_value: str = Field(min_length=1, max_length=1000)
@@ -65,6 +79,41 @@ class ContributionRead(BaseModel):
     contributor: str
     status: str
     created_at: datetime
+    reviewed_at: Optional[datetime] = None
+
+class ContributionStatsRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    
+    field: str
+    pending: int
+    accepted: int
+    rejected: int
+    accepted_value: Optional[str] = None
+    last_contribution_at: datetime
+
+class FieldIssueRead(BaseModel):
+    id: int
+    property_id: Optional[int] = None
+    field_name: str
+    values: Dict[str, Any]  # source -> value
+    sources: List[str]
+    status: str
+    created_at: datetime
+    updated_at: datetime
+    resolved_at: Optional[datetime] = None
+
+class DisputeStatsRead(BaseModel):
+    field_name: str
+    sources: List[str]
+    open: int
+    total: int
+
+class SourceUpdate(BaseModel):
+    """One pushed source payload; property_id wins when both it and address are given."""
+    property_id: Optional[int] = None
+    address: Optional[str] = Field(None, min_length=1, max_length=300)
+    source_name: str
+    payload: Dict[str, Any]
 
 class AISummaryRequest(BaseModel):
     prompt_override: Optional[str] = Field(None, max_length=1000)
@@ -0,0 +1,67 @@
+# app/search.py
+"""
+Full-text search over Item (title, body) with SQLite FTS5.
+
+`item_fts` is an external-content FTS5 index over the item table: it stores
+only the inverted index, and triggers on item keep it in step with every
+insert, update and delete, including raw SQL writes. It is created (and
+built from existing rows) whenever the schema is created, so databases that
+predate it pick it up on the next startup.
+"""
+import re
+from typing import Optional
+
+from sqlalchemy import event, text
+from sqlmodel import SQLModel
+
+ITEM_FTS_DDL = (
+    # prefix='2 3' indexes 2- and 3-character prefixes so short search-as-you-type terms stay cheap
+    """CREATE VIRTUAL TABLE IF NOT EXISTS item_fts USING fts5(
+        title, body, content='item', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS item_fts_ai AFTER INSERT ON item BEGIN
+        INSERT INTO item_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS item_fts_ad AFTER DELETE ON item BEGIN
+        INSERT INTO item_fts(item_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS item_fts_au AFTER UPDATE OF title, body ON item BEGIN
+        INSERT INTO item_fts(item_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO item_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END""",
+)
+
+TITLE_WEIGHT = 10.0  # bm25 weight of a title hit relative to a body hit
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def create_item_search(connection) -> None:
+    """Create item_fts and its triggers if missing, indexing any rows already in item."""
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'item_fts'")
+    ).first()
+    for statement in ITEM_FTS_DDL:
+        connection.execute(text(statement))
+    if not exists:
+        connection.execute(text("INSERT INTO item_fts(item_fts) VALUES ('rebuild')"))
+
+
+@event.listens_for(SQLModel.metadata, "after_create")
+def _after_create(target, connection, **kw) -> None:
+    create_item_search(connection)
+
+
+def match_query(q: Optional[str]) -> Optional[str]:
+    """Turn free text into an FTS5 query: every word must match, the last one as a prefix.
+
+    Words are quoted, so FTS5 operators and punctuation in user input are
+    treated as text. Returns None when `q` has no words.
+    """
+    words = _TOKEN.findall(q or "")
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
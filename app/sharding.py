@@ -0,0 +1,272 @@
+# app/sharding.py
+"""
+Sharded property storage (SHARD_COUNT > 0).
+
+Every property lives on one of SHARD_COUNT SQLite files (SHARD_URL_TEMPLATE),
+each with its own engine, so writes to different shards do not wait on one
+another. The main DATABASE_URL database becomes the catalog:
+
+- `propertyshard` hands out globally unique property ids. It records each
+  property's shard, chosen by a jump consistent hash of its normalized address.
+- `contributionshard` hands out contribution ids. Contribution ids are
+  global too, so moderation can route by id.
+
+Per-property requests resolve their shard with one catalog lookup and then
+run entirely on that shard (see deps.get_session). Cross-shard reads (the
+review queue, the change feed, exports) fan out and merge.
+
+After SHARD_COUNT changes, move properties to their new home shard:
+
+    python -m app.sharding rebalance [--dry-run]
+
+Jump hashing moves only the properties whose bucket changed, which is about
+1/N of them when a shard is added.
+"""
+import argparse
+import hashlib
+import json
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from .config import settings
+from .crud import bump_dispute_stats
+from .deps import engine as catalog_engine, instrument_engine
+from .models import (
+    Brief, BriefChange, BriefHistory, Contribution, ContributionShard, ContributionStats, FieldIssue, Property,
+    PropertyShard, SourceDatum,
+)
+
+logger = logging.getLogger(__name__)
+
+_engines: List = []
+
+
+def enabled() -> bool:
+    return settings.SHARD_COUNT > 0
+
+
+def jump_hash(key: int, buckets: int) -> int:
+    """Lamping & Veach jump consistent hash: stable bucket in [0, buckets)."""
+    b, j = -1, 0
+    while j < buckets:
+        b = j
+        key = (key * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        j = int((b + 1) * ((1 << 31) / ((key >> 33) + 1)))
+    return b
+
+
+def shard_for_address(normalized_address: str, shard_count: Optional[int] = None) -> int:
+    # blake2b rather than hash(): the bucket must be identical in every process.
+    key = int.from_bytes(hashlib.blake2b(normalized_address.encode(), digest_size=8).digest(), "big")
+    return jump_hash(key, shard_count or settings.SHARD_COUNT)
+
+
+def shard_engines() -> List:
+    if not _engines:
+        for n in range(settings.SHARD_COUNT):
+            shard = create_engine(settings.SHARD_URL_TEMPLATE.format(n=n), echo=False)
+            instrument_engine(shard)
+            _engines.append(shard)
+    return _engines
+
+
+def create_all() -> None:
+    SQLModel.metadata.create_all(catalog_engine)
+    for shard in shard_engines():
+        SQLModel.metadata.create_all(shard)
+
+
+# Catalog
+
+def assign_properties(addresses: Iterable[str]) -> Dict[str, Tuple[int, int]]:
+    """{normalized_address: (property_id, shard)}, registering new addresses on their hash shard."""
+    addresses = list(dict.fromkeys(addresses))
+    if not addresses:
+        return {}
+    with Session(catalog_engine) as catalog:
+        catalog.exec(
+            sqlite_insert(PropertyShard.__table__).on_conflict_do_nothing(index_elements=["normalized_address"]),
+            params=[{"normalized_address": a, "shard": shard_for_address(a)} for a in addresses],
+        )
+        rows = catalog.exec(
+            select(PropertyShard.normalized_address, PropertyShard.id, PropertyShard.shard)
+            .where(PropertyShard.normalized_address.in_(addresses))
+        ).all()
+        catalog.commit()
+    return {address: (property_id, shard) for address, property_id, shard in rows}
+
+
+def assign_property(normalized_address: str) -> Tuple[int, int]:
+    return assign_properties([normalized_address])[normalized_address]
+
+
+def locate_property(property_id: int) -> Optional[int]:
+    with Session(catalog_engine) as catalog:
+        return catalog.exec(select(PropertyShard.shard).where(PropertyShard.id == property_id)).first()
+
+
+def locate_properties(property_ids: Iterable[int]) -> Dict[int, int]:
+    """{property_id: shard} for the ids the catalog knows, in one query."""
+    with Session(catalog_engine) as catalog:
+        return dict(catalog.exec(
+            select(PropertyShard.id, PropertyShard.shard).where(PropertyShard.id.in_(list(property_ids)))
+        ).all())
+
+
+def allocate_contribution_id(property_id: int) -> int:
+    with Session(catalog_engine) as catalog:
+        row = ContributionShard(property_id=property_id)
+        catalog.add(row)
+        catalog.commit()
+        return row.id
+
+
+def locate_contribution(contribution_id: int) -> Optional[int]:
+    with Session(catalog_engine) as catalog:
+        stmt = (
+            select(PropertyShard.shard)
+            .join(ContributionShard, ContributionShard.property_id == PropertyShard.id)
+            .where(ContributionShard.id == contribution_id)
+        )
+        return catalog.exec(stmt).first()
+
+
+# Sessions
+
+def engine_for_shard(shard: Optional[int]):
+    """The shard's engine, or the catalog engine when unsharded or the shard is unknown."""
+    if not enabled() or shard is None:
+        return catalog_engine
+    return shard_engines()[shard]
+
+
+def session_for_property(property_id: int) -> Session:
+    """A new Session on the database holding `property_id` (the main one when unsharded)."""
+    return Session(engine_for_shard(locate_property(property_id) if enabled() else None))
+
+
+def session_for_path(path_params: Dict[str, str]) -> Session:
+    """Route a request by its property_id or contribution_id path parameter."""
+    if enabled():
+        if "property_id" in path_params:
+            return Session(engine_for_shard(locate_property(int(path_params["property_id"]))))
+        if "contribution_id" in path_params:
+            return Session(engine_for_shard(locate_contribution(int(path_params["contribution_id"]))))
+    return Session(catalog_engine)
+
+
+@contextmanager
+def all_shard_sessions():
+    """One Session per shard, or just the main one when unsharded, for fan-out reads."""
+    engines = shard_engines() if enabled() else [catalog_engine]
+    sessions = [Session(e) for e in engines]
+    try:
+        yield sessions
+    finally:
+        for session in sessions:
+            session.close()
+
+
+# Rebalancing
+
+def _rows(session: Session, model, column, value) -> List[dict]:
+    return [dict(r) for r in session.connection().execute(select(model.__table__).where(column == value)).mappings()]
+
+
+def move_property(property_id: int, from_shard: int, to_shard: int) -> None:
+    """Copy one property with its dependent rows to `to_shard`, repoint the catalog, then delete the original.
+
+    The target commits before the catalog flips, so a reader finds the
+    property on one shard or the other, never on neither. Property and
+    contribution ids are global and kept; other ids are per shard and reassigned.
+    """
+    engines = shard_engines()
+    with Session(engines[from_shard]) as source, Session(engines[to_shard]) as target:
+        prop = _rows(source, Property, Property.id, property_id)
+        if not prop:
+            return
+        target.exec(insert(Property.__table__), params=prop)
+        for model in (Contribution, ContributionStats):
+            rows = _rows(source, model, model.property_id, property_id)
+            if rows:
+                target.exec(insert(model.__table__), params=rows)
+        datums = [{k: v for k, v in row.items() if k != "id"} for row in _rows(source, SourceDatum, SourceDatum.property_id, property_id)]
+        if datums:
+            target.exec(insert(SourceDatum.__table__), params=datums)
+        # Inserted in id order, so the new ids keep the write order as_of replays rely on
+        history = [{k: v for k, v in row.items() if k != "id"}
+                   for row in sorted(_rows(source, BriefHistory, BriefHistory.property_id, property_id), key=lambda row: row["id"])]
+        if history:
+            target.exec(insert(BriefHistory.__table__), params=history)
+
+        old_briefs = _rows(source, Brief, Brief.property_id, property_id)
+        for row in old_briefs:
+            brief_id = target.exec(insert(Brief.__table__).values({k: v for k, v in row.items() if k != "id"})).inserted_primary_key[0]
+            issues = [
+                {**{k: v for k, v in issue.items() if k != "id"}, "brief_id": brief_id}
+                for issue in _rows(source, FieldIssue, FieldIssue.brief_id, row["id"])
+            ]
+            if issues:
+                target.exec(insert(FieldIssue.__table__), params=issues)
+            # Dispute counters are per shard too: move each issue's contribution along with it
+            for issue in issues:
+                is_open = int(issue["status"] == "open")
+                bump_dispute_stats(target, issue["field_name"], issue["sources"], open=is_open, total=1)
+                bump_dispute_stats(source, issue["field_name"], issue["sources"], open=-is_open, total=-1)
+            # Change-feed positions are per shard: announce the property on its new shard so consumers refetch it.
+            fields = sorted(k for k in json.loads(row["data"]) if k != "_metadata")
+            target.add(BriefChange(property_id=property_id, changed_fields=json.dumps(fields)))
+        target.commit()
+
+        with Session(catalog_engine) as catalog:
+            catalog.exec(update(PropertyShard.__table__).where(PropertyShard.id == property_id).values(shard=to_shard))
+            catalog.commit()
+
+        brief_ids = [row["id"] for row in old_briefs]
+        if brief_ids:
+            source.exec(delete(FieldIssue.__table__).where(FieldIssue.brief_id.in_(brief_ids)))
+        for model in (BriefChange, BriefHistory, Brief, SourceDatum, Contribution, ContributionStats):
+            source.exec(delete(model.__table__).where(model.property_id == property_id))
+        source.exec(delete(Property.__table__).where(Property.id == property_id))
+        source.commit()
+
+
+def rebalance(dry_run: bool = False) -> Dict[Tuple[int, int], int]:
+    """Move every property whose recorded shard differs from its hash shard. Returns {(from, to): count}."""
+    with Session(catalog_engine) as catalog:
+        placements = catalog.exec(select(PropertyShard.id, PropertyShard.normalized_address, PropertyShard.shard)).all()
+    moves: Dict[Tuple[int, int], int] = {}
+    for property_id, address, shard in placements:
+        target = shard_for_address(address)
+        if target == shard:
+            continue
+        moves[(shard, target)] = moves.get((shard, target), 0) + 1
+        if not dry_run:
+            move_property(property_id, shard, target)
+    return moves
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shard maintenance.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    reb = sub.add_parser("rebalance", help="move properties to the shard their address hashes to")
+    reb.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    if not enabled():
+        parser.error("SHARD_COUNT is 0; sharding is disabled")
+    create_all()
+    moves = rebalance(dry_run=args.dry_run)
+    for (src, dst), count in sorted(moves.items()):
+        logger.info("%s %d properties from shard %d to shard %d", "would move" if args.dry_run else "moved", count, src, dst)
+    logger.info("done: %d properties %s", sum(moves.values()), "to move" if args.dry_run else "moved")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# app/sharedcache.py
+"""
+Host-wide read cache shared by every worker process (SHARED_CACHE_PATH).
+
+GET /properties/{id}/brief and /sources store their serialized response body
+in a local SQLite file that all workers on the host open. Entries are
+tagged with the property's cache version. Brief and source writes bump that
+version once their transaction commits: crud marks the property on the
+session with touch(), and the after_commit hook below does the bump. So an
+entry is fresh exactly when its tag equals the current version. A reader
+checks that with one indexed lookup and sends the stored bytes without
+querying the database or re-parsing JSON.
+
+Readers take the version before reading the database. A reader that races
+a write can therefore only store an entry that is already outdated, never
+one that looks fresh. The file belongs to one database; delete it when the
+database is replaced.
+"""
+import logging
+import os
+import sqlite3
+import threading
+from typing import Iterable, NamedTuple, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS version (property_id INTEGER PRIMARY KEY, version INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS entry (
+    key TEXT PRIMARY KEY, property_id INTEGER NOT NULL, version INTEGER NOT NULL,
+    body BLOB NOT NULL, etag TEXT NOT NULL, last_modified TEXT
+);
+"""
+
+_TOUCHED = "sharedcache_touched"
+_EVICT_EVERY = 256  # puts between eviction passes
+
+_local = threading.local()
+_puts = 0
+
+
+class Entry(NamedTuple):
+    body: bytes
+    etag: str
+    last_modified: Optional[str]  # ISO timestamp
+
+
+def enabled() -> bool:
+    return bool(settings.SHARED_CACHE_PATH)
+
+
+def _conn() -> sqlite3.Connection:
+    # One connection per thread and path; settings can point elsewhere (tests)
+    path = settings.SHARED_CACHE_PATH
+    conn = getattr(_local, "conn", None)
+    if conn is None or _local.path != path:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = sqlite3.connect(path, timeout=5.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")  # a cache: losing the last commits on power loss is fine
+        conn.executescript(SCHEMA)
+        _local.conn, _local.path = conn, path
+    return conn
+
+
+def lookup(key: str, property_id: int) -> Tuple[Optional[Entry], int]:
+    """(entry if fresh else None, the property's current version), in one query."""
+    row = _conn().execute(
+        "SELECT coalesce(v.version, 0), e.version, e.body, e.etag, e.last_modified"
+        " FROM (SELECT ? AS property_id) p"
+        " LEFT JOIN version v ON v.property_id = p.property_id"
+        " LEFT JOIN entry e ON e.key = ?",
+        (property_id, key),
+    ).fetchone()
+    current, tagged, body, etag, last_modified = row
+    if body is not None and tagged == current:
+        return Entry(body, etag, last_modified), current
+    return None, current
+
+
+def put(key: str, property_id: int, version: int, entry: Entry) -> None:
+    """Store `entry` tagged with the version the caller saw before reading the database."""
+    global _puts
+    conn = _conn()
+    conn.execute(
+        "INSERT OR REPLACE INTO entry (key, property_id, version, body, etag, last_modified) VALUES (?, ?, ?, ?, ?, ?)",
+        (key, property_id, version, entry.body, entry.etag, entry.last_modified),
+    )
+    _puts += 1
+    if _puts % _EVICT_EVERY == 0:
+        # REPLACE gives a new rowid, so the lowest rowids are the least recently written
+        conn.execute(
+            "DELETE FROM entry WHERE rowid <= (SELECT max(rowid) FROM entry) - ?", (settings.SHARED_CACHE_MAX_ENTRIES,)
+        )
+
+
+def bump(property_ids: Iterable[int]) -> None:
+    conn = _conn()
+    conn.executemany(
+        "INSERT INTO version (property_id, version) VALUES (?, 1)"
+        " ON CONFLICT (property_id) DO UPDATE SET version = version + 1",
+        [(property_id,) for property_id in property_ids],
+    )
+
+
+def touch(session, *property_ids: int) -> None:
+    """Mark properties whose briefs or sources this session changed; their version bumps on commit."""
+    if enabled():
+        session.info.setdefault(_TOUCHED, set()).update(property_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(session) -> None:
+    touched = session.info.pop(_TOUCHED, None)
+    if touched and enabled():
+        try:
+            bump(touched)
+        except sqlite3.Error:
+            logger.exception("shared cache version bump failed; dropping the cache file's entries")
+            _clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session) -> None:
+    session.info.pop(_TOUCHED, None)
+
+
+def _clear() -> None:
+    try:
+        _conn().execute("DELETE FROM entry")
+    except sqlite3.Error:
+        logger.exception("shared cache clear failed")
@@ -0,0 +1,179 @@
+# app/singleflight.py
+"""
+Single-flight coalescing of duplicate ingests and refreshes.
+
+Concurrent callers with the same key (a normalized address or a property id)
+share one execution. Within a process, the first caller runs the work and
+the others block on its Future and get the same result or exception. Across
+workers, the leader also holds a row in the `lease` table for the key. A
+worker that finds the lease taken waits until it is released or expires.
+Then it asks `shared()` for the result the other worker persisted, and runs
+the work itself only if there is none.
+
+    result = coalesce(session, f"property:{pid}", lambda: do_work(), lambda: read_result())
+"""
+import asyncio
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert
+
+from .config import settings
+from .metrics import SINGLEFLIGHT_CALLS
+from .models import Lease
+
+_OWNER_PREFIX = f"{socket.gethostname()}:{os.getpid()}"
+
+
+class SingleFlight:
+    """In-process coalescing for code running on threadpool threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = Future()
+        if not leader:
+            SINGLEFLIGHT_CALLS.inc(result="shared")
+            return call.result()
+
+        SINGLEFLIGHT_CALLS.inc(result="leader")
+        try:
+            result = fn()
+        except BaseException as e:
+            call.set_exception(e)
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class AsyncSingleFlight:
+    """In-process coalescing for coroutines on one event loop (ASYNC_MODE)."""
+
+    def __init__(self):
+        self._calls: Dict[str, asyncio.Future] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        call = self._calls.get(key)
+        if call is not None:
+            SINGLEFLIGHT_CALLS.inc(result="shared")
+            # shield: a cancelled follower must not cancel the leader's result.
+            return await asyncio.shield(call)
+
+        SINGLEFLIGHT_CALLS.inc(result="leader")
+        call = self._calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await fn()
+        except BaseException as e:
+            call.set_exception(e)
+            # Mark retrieved so a leader failure with no followers doesn't log "never retrieved".
+            call.exception()
+            raise
+        else:
+            call.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+
+flights = SingleFlight()
+async_flights = AsyncSingleFlight()
+
+
+# Cross-worker leases
+
+def try_acquire_lease(session, key: str, owner: str) -> bool:
+    """Take the lease for `key` unless another owner holds an unexpired one. Commits."""
+    now = time.time()
+    stmt = insert(Lease.__table__).values(key=key, owner=owner, expires_at=now + settings.LEASE_TTL_S)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["key"],
+        set_={"owner": stmt.excluded.owner, "expires_at": stmt.excluded.expires_at},
+        where=Lease.__table__.c.expires_at < now,
+    )
+    acquired = session.exec(stmt).rowcount == 1
+    session.commit()
+    return acquired
+
+
+def lease_held(session, key: str) -> bool:
+    expires_at = session.exec(select(Lease.__table__.c.expires_at).where(Lease.__table__.c.key == key)).scalar()
+    session.commit()  # end the read transaction so the next poll sees the other worker's release
+    return expires_at is not None and expires_at >= time.time()
+
+
+def release_lease(session, key: str, owner: str) -> None:
+    session.rollback()  # the leader's work may have left a failed transaction behind
+    table = Lease.__table__
+    session.exec(delete(table).where(table.c.key == key, table.c.owner == owner))
+    session.commit()
+
+
+def new_owner() -> str:
+    return f"{_OWNER_PREFIX}:{uuid.uuid4().hex[:8]}"
+
+
+def _deadline() -> float:
+    return time.monotonic() + settings.LEASE_TTL_S
+
+
+def coalesce(session, key: str, fn: Callable[[], Any], shared: Callable[[], Optional[Any]]) -> Any:
+    """Run `fn` at most once at a time per key across threads and workers.
+
+    `shared` reads the result another worker persisted (None if unusable) and
+    is only called after waiting out that worker's lease.
+    """
+    def run():
+        owner = new_owner()
+        if not try_acquire_lease(session, key, owner):
+            SINGLEFLIGHT_CALLS.inc(result="lease_wait")
+            deadline = _deadline()
+            while lease_held(session, key) and time.monotonic() < deadline:
+                time.sleep(settings.LEASE_POLL_MS / 1000)
+            result = shared()
+            if result is not None:
+                return result
+            # The other worker failed or expired; do the work ourselves without the lease.
+            return fn()
+        try:
+            return fn()
+        finally:
+            release_lease(session, key, owner)
+
+    return flights.do(key, run)
+
+
+async def acoalesce(session, key: str, fn: Callable[[], Awaitable[Any]], shared: Callable[[], Awaitable[Optional[Any]]]) -> Any:
+    """coalesce() for AsyncSession callers; the lease SQL runs through run_sync."""
+    async def run():
+        owner = new_owner()
+        if not await session.run_sync(lambda s: try_acquire_lease(s, key, owner)):
+            SINGLEFLIGHT_CALLS.inc(result="lease_wait")
+            deadline = _deadline()
+            while await session.run_sync(lambda s: lease_held(s, key)) and time.monotonic() < deadline:
+                await asyncio.sleep(settings.LEASE_POLL_MS / 1000)
+            result = await shared()
+            if result is not None:
+                return result
+            return await fn()
+        try:
+            return await fn()
+        finally:
+            await session.run_sync(lambda s: release_lease(s, key, owner))
+
+    return await async_flights.do(key, run)
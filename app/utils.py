@@ -1,7 +1,31 @@
+import json
+import math
 import re
-import requests
+import time
+import logging
 from datetime import datetime, timezone
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from .metrics import timed, MERGE_SECONDS, COMPLETENESS_SECONDS, LLM_REQUEST_SECONDS, LLM_TOKENS
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+# Compiled once at import: bulk loads normalize millions of addresses.
+_ADDRESS_REPLACEMENTS = [(re.compile(pattern), replacement) for pattern, replacement in {
+    r'\bst\b': 'street',
+    r'\bave\b': 'avenue',
+    r'\bblvd\b': 'boulevard',
+    r'\bdr\b': 'drive',
+    r'\brd\b': 'road',
+    r'\bln\b': 'lane',
+    r'\bct\b': 'court',
+    r'\bpl\b': 'place',
+    r'\bapt\b': 'apartment',
+    r'\bunit\b': '#',
+    r'\b#\s*': '#',
+    r'\.': '',  # Remove periods
+    r',': '',   # Remove commas
+}.items()]
 
 def normalize_address(address: str) -> str:
     """
@@ -15,50 +39,60 @@ def normalize_address(address: str) -> str:
     normalized = address.lower().strip()
     
     # Remove extra whitespace
-    normalized = re.sub(r'\s+', ' ', normalized)
+    normalized = _WHITESPACE_RE.sub(' ', normalized)
     
     # Standardize common abbreviations
-    replacements = {
-        r'\bst\b': 'street',
-        r'\bave\b': 'avenue',
-        r'\bblvd\b': 'boulevard',
-        r'\bdr\b': 'drive',
-        r'\brd\b': 'road',
-        r'\bln\b': 'lane',
-        r'\bct\b': 'court',
-        r'\bpl\b': 'place',
-        r'\bapt\b': 'apartment',
-        r'\bunit\b': '#',
-        r'\b#\s*': '#',
-        r'\.': '',  # Remove periods
-        r',': '',   # Remove commas
-    }
-    
-    for pattern, replacement in replacements.items():
-        normalized = re.sub(pattern, replacement, normalized)
+    for pattern, replacement in _ADDRESS_REPLACEMENTS:
+        normalized = pattern.sub(replacement, normalized)
     
     return normalized.strip()
 
+# Plain decimal numbers only: no leading zeros (ZIP codes, parcel ids), no nan/inf, no "1_000"
+_INT_RE = re.compile(r"-?(?:0|[1-9][0-9]*)")
+_FLOAT_RE = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][-+]?[0-9]+)?")
+
+def parse_scalar(value: Any) -> Any:
+    """Turn numeric strings back into int/float; empty strings become None, anything else is unchanged.
+
+    Strings with leading zeros stay strings, and so does anything that
+    would parse to a non-finite float (it could not be stored as JSON).
+    """
+    if not isinstance(value, str):
+        return value
+    if value == "":
+        return None
+    if _INT_RE.fullmatch(value):
+        return int(value)
+    if _FLOAT_RE.fullmatch(value):
+        number = float(value)
+        return number if math.isfinite(number) else value
+    return value
+
 def now_utc() -> datetime:
     """Get current UTC datetime."""
     return datetime.now(timezone.utc)
 
-def merge_source_data(sources: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+# Source priority for merges (higher number = higher priority)
+SOURCE_PRIORITY = {
+    'contribution': 4,  # accepted user contributions, see app/moderation.py
+    'listing': 3,
+    'county': 2,
+    'hoa': 1
+}
+
+@timed(MERGE_SECONDS)
+def merge_source_data(sources: Dict[str, Dict[str, Any]], address: Optional[str] = None) -> Dict[str, Any]:
     """
     Merge data from multiple sources with conflict resolution.
-    Priority: freshness > listing > county > hoa
+    Each source contributes its latest stored payload; per field the highest
+    SOURCE_PRIORITY wins: contribution > listing > county > hoa.
     For disputes >5% in square footage, mark as conflicting.
+    `address` (the property's raw address) fills in the address when no
+    source payload carries one, e.g. bulk-loaded rows (app/loader.py).
     """
     if not sources:
         return {}
     
-    # Define source priority (higher number = higher priority)
-    source_priority = {
-        'listing': 3,
-        'county': 2, 
-        'hoa': 1
-    }
-    
     merged = {}
     provenance = {}
     conflicts = []
@@ -106,10 +140,14 @@ def merge_source_data(sources: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
                     pass
         
         # Choose value based on source priority
-        best_source = max(field_values.keys(), key=lambda x: source_priority.get(x, 0))
+        best_source = max(field_values.keys(), key=lambda x: SOURCE_PRIORITY.get(x, 0))
         merged[field] = field_values[best_source]
         provenance[field] = best_source
     
+    if address and 'address' not in merged:
+        merged['address'] = address
+        provenance['address'] = 'property'
+    
     # Add metadata
     merged['_metadata'] = {
         'provenance': provenance,
@@ -120,6 +158,7 @@ def merge_source_data(sources: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
     
     return merged
 
+@timed(COMPLETENESS_SECONDS)
 def calculate_completeness_score(brief_data: Dict[str, Any]) -> int:
     """
     Calculate completeness score (0-100) based on available fields.
@@ -135,16 +174,28 @@ def calculate_completeness_score(brief_data: Dict[str, Any]) -> int:
     score = (available_core * 15) + (available_optional * 5)
     return min(score, 100)
 
-def budget(messages, want_max_tokens=2500):
-    """Calculate max_tokens based on message content length"""
-    # Simple token estimation: ~4 characters per token
-    total_chars = sum(len(msg.get('content', '')) for msg in messages)
-    estimated_tokens = total_chars // 4
-    
-    # Return the smaller of estimated tokens or desired max tokens
-    return min(estimated_tokens, want_max_tokens)
+OPENAI_CHAT_URL = "https://api.openai.com/v1/chat/completions"
 
-def call_llm_topics(prompt: str) -> str:
+class LLMRequestError(Exception):
+    """The LLM provider could not be reached or answered with an HTTP error.
+
+    Raised by call_llm_topics and acall_llm_topics in place of the HTTP client's
+    own exceptions, so callers need not import requests or httpx to catch it.
+    """
+    def __init__(self, message: str, status_code: Optional[int] = None, response_text: Optional[str] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response_text = response_text
+
+    @classmethod
+    def wrap(cls, exc: Exception) -> "LLMRequestError":
+        response = getattr(exc, "response", None)
+        return cls(str(exc), getattr(response, "status_code", None), getattr(response, "text", None))
+
+LLM_SYSTEM_PROMPT = "You are a helpful real estate property brief summarizer. You receive property facts merged from county, listing and HOA sources, one per line, and write a brief for potential buyers. User contributions may follow; treat pending ones with a grain of salt, especially if they are negative."
+
+def _llm_request(prompt: str):
+    """Build (headers, body) for a chat completion; shared by the sync and async clients."""
     from .config import settings
     
     if not settings.OPENAI_API_KEY:
@@ -153,10 +204,11 @@ def call_llm_topics(prompt: str) -> str:
     OPENAI_API_HEADERS = {"Authorization": f"Bearer {settings.OPENAI_API_KEY}", "Content-Type": "application/json"}
 
     messages = [
-        {"role":"system","content":"You are a helpful real estate property brief summarizer, which takes in the property brief json (which is aggregation of several sources: hoa, listing, county data), and generates a brief for potential buyers. Also included are some contributions of the property which have been added by other users who have seen the property, so in your output, mention these contributions with a grain of salt, especially if they are negative."},
+        {"role":"system","content": LLM_SYSTEM_PROMPT},
         {"role":"user","content": prompt}
     ]
-    max_tokens = budget(messages, want_max_tokens=2500)
+    # Output length is a product decision, not a function of how long the input was
+    max_tokens = settings.SUMMARY_MAX_OUTPUT_TOKENS
 
     body = {
         "model": "gpt-4o-mini",
@@ -165,41 +217,103 @@ def call_llm_topics(prompt: str) -> str:
         "top_p": 0.9,
         "max_tokens": max_tokens
     }
+    logger.debug("Making OpenAI API call with %s max tokens", max_tokens)
+    return OPENAI_API_HEADERS, body
+
+def _llm_content(response_data: Dict[str, Any]) -> str:
+    """Pull the completion text out of a chat completion response."""
+    _record_token_usage(response_data.get("usage"))
+    
+    if "choices" not in response_data:
+        raise KeyError(f"'choices' not found in response. Available keys: {list(response_data.keys())}")
+    
+    if not response_data["choices"]:
+        raise KeyError("'choices' array is empty")
+    
+    choice = response_data["choices"][0]
+    if "message" not in choice:
+        raise KeyError(f"'message' not found in choice. Available keys: {list(choice.keys())}")
     
+    if "content" not in choice["message"]:
+        raise KeyError(f"'content' not found in message. Available keys: {list(choice['message'].keys())}")
+    
+    return choice["message"]["content"]
+
+def call_llm_topics(prompt: str) -> str:
+    import requests  # imported on first use; it costs ~70ms of every cold start otherwise
+    headers, body = _llm_request(prompt)
+    
+    start = time.perf_counter()
+    outcome = "error"
     try:
-        print(f"Making OpenAI API call with {max_tokens} max tokens...")
-        r = requests.post("https://api.openai.com/v1/chat/completions", json=body, headers=OPENAI_API_HEADERS, timeout=60)
-        
-        print(f"Response status: {r.status_code}")
+        r = requests.post(OPENAI_CHAT_URL, json=body, headers=headers, timeout=60)
         
         if r.status_code != 200:
-            print(f"Error response text: {r.text}")
+            logger.warning("OpenAI API returned %s: %s", r.status_code, r.text)
             r.raise_for_status()
         
-        response_data = r.json()
-        print(f"Response keys: {list(response_data.keys())}")
-        
-        if "choices" not in response_data:
-            raise KeyError(f"'choices' not found in response. Available keys: {list(response_data.keys())}")
+        content = _llm_content(r.json())
+        outcome = "ok"
+        return content
         
-        if not response_data["choices"]:
-            raise KeyError("'choices' array is empty")
-        
-        choice = response_data["choices"][0]
-        if "message" not in choice:
-            raise KeyError(f"'message' not found in choice. Available keys: {list(choice.keys())}")
+    except json.JSONDecodeError as e:  # before RequestException: requests' variant subclasses both
+        logger.warning("OpenAI response is not JSON: %s", e)
+        raise
+    except requests.exceptions.RequestException as e:
+        logger.warning("OpenAI request failed: %s", e)
+        raise LLMRequestError.wrap(e) from e
+    except KeyError as e:
+        logger.warning("Unexpected OpenAI response shape: %s", e)
+        raise
+    except Exception as e:
+        logger.exception("Unexpected error calling OpenAI: %s", e)
+        raise
+    finally:
+        LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, outcome=outcome)
+
+_async_llm_client = None
+
+async def acall_llm_topics(prompt: str) -> str:
+    """Async call_llm_topics over a shared httpx.AsyncClient, for ASYNC_MODE."""
+    import httpx
+    global _async_llm_client
+    
+    headers, body = _llm_request(prompt)
+    if _async_llm_client is None:
+        _async_llm_client = httpx.AsyncClient(timeout=60)
+    
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        r = await _async_llm_client.post(OPENAI_CHAT_URL, json=body, headers=headers)
         
-        if "content" not in choice["message"]:
-            raise KeyError(f"'content' not found in message. Available keys: {list(choice['message'].keys())}")
+        if r.status_code != 200:
+            logger.warning("OpenAI API returned %s: %s", r.status_code, r.text)
+            r.raise_for_status()
         
-        return choice["message"]["content"]
+        content = _llm_content(r.json())
+        outcome = "ok"
+        return content
         
-    except requests.exceptions.RequestException as e:
-        print(f"Request exception: {e}")
+    except json.JSONDecodeError as e:
+        logger.warning("OpenAI response is not JSON: %s", e)
         raise
+    except httpx.HTTPError as e:
+        logger.warning("OpenAI request failed: %s", e)
+        raise LLMRequestError.wrap(e) from e
     except KeyError as e:
-        print(f"Key error: {e}")
+        logger.warning("Unexpected OpenAI response shape: %s", e)
         raise
     except Exception as e:
-        print(f"Unexpected error: {e}")
+        logger.exception("Unexpected error calling OpenAI: %s", e)
         raise
+    finally:
+        LLM_REQUEST_SECONDS.observe(time.perf_counter() - start, outcome=outcome)
+
+def _record_token_usage(usage) -> None:
+    """Add the provider-reported prompt/completion token counts to the metrics."""
+    if not isinstance(usage, dict):
+        return
+    for kind in ("prompt_tokens", "completion_tokens"):
+        if isinstance(usage.get(kind), int):
+            LLM_TOKENS.inc(usage[kind], kind=kind.replace("_tokens", ""))
@@ -0,0 +1,62 @@
+"""
+Shared test setup: one temporary database for the whole session and the app's TestClient.
+
+DATABASE_URL is set here, at import, because app.deps builds its engine when a
+test module first imports the app. Nothing from `app` is imported at module level.
+"""
+import os
+import shutil
+import tempfile
+
+import pytest
+
+_DB_DIR = tempfile.mkdtemp(prefix="homekey-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+# The profiling middleware and admin routes are only mounted when an admin token is configured at startup
+os.environ.setdefault("ADMIN_TOKEN", "test-admin")
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_DB_DIR, ignore_errors=True)
+
+
+@pytest.fixture(scope="module")
+def client():
+    """The app with its lifespan running; modules that need other settings at startup override this."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def shards(monkeypatch, tmp_path):
+    """SHARD_COUNT=2 on fresh shard files, with an empty catalog so no placement points at another test's shards."""
+    from sqlmodel import Session, delete
+    from app import sharding
+    from app.config import settings
+    from app.deps import engine
+    from app.migrate import migrate
+    from app.models import ContributionShard, PropertyShard
+
+    def clear_catalog():
+        with Session(engine) as session:
+            session.exec(delete(PropertyShard))
+            session.exec(delete(ContributionShard))
+            session.commit()
+
+    monkeypatch.setattr(settings, "SHARD_COUNT", 2)
+    monkeypatch.setattr(settings, "SHARD_URL_TEMPLATE", f"sqlite:///{tmp_path}/shard{{n}}.db")
+    monkeypatch.setattr(sharding, "_engines", [])
+    migrate()
+    clear_catalog()
+    yield
+    clear_catalog()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def fresh_admission_buckets():
+    # Every module's TestClient is the same peer; don't let one module's ingests rate-limit the next
+    from app.admission import controller
+    controller.buckets.clear()
+    yield
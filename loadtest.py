@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Load test comparing the sync and async (ASYNC_MODE) execution modes.
+
+Starts one uvicorn worker per mode on a scratch database with simulated
+provider latency, fires concurrent ingests and brief reads, and prints
+throughput and latency percentiles for each mode.
+
+    python loadtest.py --requests 2000 --concurrency 500 --adapter-latency-ms 200
+
+With --fixture, the adapters answer from a generated fixture file (see
+app/adapters/fixtures.py) and requests spread over --addresses distinct
+properties instead of the three built-in samples.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+from app.adapters.fixtures import iter_addresses
+
+SAMPLE_ADDRESSES = ["123 Main Street", "456 Oak Avenue", "789 Pine Drive"]
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(async_mode: bool, adapter_latency_ms: float, db_dir: str, fixture: str = ""):
+    port = _free_port()
+    env = dict(
+        os.environ,
+        ASYNC_MODE=str(async_mode),
+        DATABASE_URL=f"sqlite:///{db_dir}/{'async' if async_mode else 'sync'}.db",
+        MOCK_ADAPTER_LATENCY_MS=str(adapter_latency_ms),
+        ADAPTER_FIXTURE_PATH=fixture,
+        QUERY_STATS_HEADERS="false",
+        ADMISSION_ENABLED="false",  # measure raw throughput, not the per-client rate limits
+    )
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            httpx.get(f"{base_url}/health")
+            return proc, base_url
+        except httpx.TransportError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError("server did not start")
+
+
+async def _run(base_url: str, total: int, concurrency: int, addresses):
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        async def seed(address: str) -> int:
+            async with semaphore:
+                return (await client.post("/properties/ingest", json={"address": address})).json()["id"]
+
+        ids = await asyncio.gather(*(seed(address) for address in addresses))
+
+        async def one(i: int):
+            nonlocal errors
+            async with semaphore:
+                start = time.perf_counter()
+                if i % 2:
+                    r = await client.post("/properties/ingest", json={"address": addresses[i % len(addresses)]})
+                else:
+                    r = await client.get(f"/properties/{ids[i % len(ids)]}/brief")
+                latencies.append(time.perf_counter() - start)
+                if r.status_code >= 400:
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--adapter-latency-ms", type=float, default=100.0)
+    parser.add_argument("--fixture", default="", help="fixture file generated by app.adapters.fixtures")
+    parser.add_argument("--addresses", type=int, default=1000, help="distinct fixture addresses to use")
+    args = parser.parse_args()
+    addresses = list(iter_addresses(args.addresses)) if args.fixture else SAMPLE_ADDRESSES
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        for async_mode in (False, True):
+            proc, base_url = _start_server(async_mode, args.adapter_latency_ms, db_dir, os.path.abspath(args.fixture) if args.fixture else "")
+            try:
+                result = asyncio.run(_run(base_url, args.requests, args.concurrency, addresses))
+            finally:
+                proc.terminate()
+                proc.wait()
+            mode = "async" if async_mode else "sync"
+            print(f"{mode:>5}: {result['rps']:8.1f} req/s  p50 {result['p50_ms']:8.1f} ms  "
+                  f"p99 {result['p99_ms']:8.1f} ms  errors {result['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,11 @@
-from sqlmodel import SQLModel, Session, select
+from sqlmodel import Session, select
 from sqlalchemy import func
 from app.deps import engine
+from app.migrate import migrate
 from app.models import Item
 
 def run():
-    SQLModel.metadata.create_all(engine)
+    migrate()
     with Session(engine) as s:
         total = s.exec(select(func.count()).select_from(Item)).one()
         if total == 0:
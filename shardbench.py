@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Write-throughput benchmark for sharded storage (SHARD_COUNT).
+
+For each shard count, registers a set of properties in a scratch catalog,
+then has several writer processes refresh them concurrently: one
+transaction per write, storing a source payload and re-writing the brief
+(with its change-log entry), as a refresh does. SQLite allows one writer
+per file, so with one shard the processes queue on a single lock. With N
+shards they spread over N files.
+
+    python shardbench.py --shards 1 2 4 --writers 8 --writes 400
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+
+def _configure(shard_count: int, db_dir: str) -> None:
+    # Settings are read at import time, so this must run before anything imports app.
+    os.environ.update(
+        DATABASE_URL=f"sqlite:///{db_dir}/catalog.db",
+        SHARD_COUNT=str(shard_count),
+        SHARD_URL_TEMPLATE=f"sqlite:///{db_dir}/shard{{n}}.db",
+        METRICS_ENABLED="false",
+        SLOW_QUERY_MS="1e9",
+    )
+
+
+def _writer(shard_count, db_dir, placements, writes, barrier, results):
+    _configure(shard_count, db_dir)
+    from sqlmodel import Session
+    from app import sharding
+    from app.crud import create_or_update_brief, upsert_source_datum
+
+    barrier.wait()  # time the writes, not process start-up and imports
+    start = time.time()
+    for i in range(writes):
+        property_id, shard = placements[i % len(placements)]
+        payload = {"address": f"{property_id} bench street", "square_feet": 1000 + i, "bedrooms": 3}
+        with Session(sharding.engine_for_shard(shard)) as session:
+            upsert_source_datum(session, property_id, "county", payload, commit=False)
+            create_or_update_brief(session, property_id, payload, 50)
+    results.put((start, time.time()))
+
+
+def _setup(args):
+    shard_count, db_dir, properties = args
+    _configure(shard_count, db_dir)
+    from sqlmodel import Session
+    from app import sharding
+    from app.crud import create_or_update_property
+
+    sharding.create_all()
+    addresses = [f"{n} bench street" for n in range(properties)]
+    placements = sharding.assign_properties(addresses)
+    for address, (property_id, shard) in placements.items():
+        with Session(sharding.engine_for_shard(shard)) as session:
+            create_or_update_property(session, address, address, property_id)
+    return list(placements.values())
+
+
+def run(shard_count: int, writers: int, writes: int, properties: int) -> float:
+    db_dir = tempfile.mkdtemp(prefix=f"shardbench{shard_count}-")
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Pool(1) as pool:
+        placements = pool.apply(_setup, ((shard_count, db_dir, properties),))
+
+    # Each writer gets its own slice of properties, as independent requests would
+    slices = [placements[w::writers] for w in range(writers)]
+    barrier, results = ctx.Barrier(writers), ctx.Queue()
+    procs = [
+        ctx.Process(target=_writer, args=(shard_count, db_dir, s, writes, barrier, results))
+        for s in slices
+    ]
+    for proc in procs:
+        proc.start()
+    spans = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+    elapsed = max(end for _, end in spans) - min(start for start, _ in spans)
+    return writers * writes / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--writers", type=int, default=8, help="concurrent writer processes")
+    parser.add_argument("--writes", type=int, default=400, help="transactions per writer")
+    parser.add_argument("--properties", type=int, default=1000)
+    args = parser.parse_args()
+
+    baseline = None
+    print(f"{'shards':>6} {'writes/s':>10} {'speedup':>8}")
+    for shard_count in args.shards:
+        rate = run(shard_count, args.writers, args.writes, args.properties)
+        baseline = baseline or rate
+        print(f"{shard_count:>6} {rate:>10.0f} {rate / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark: what a new worker pays before serving its first request.
+
+Each run starts a fresh interpreter, like an autoscaled worker, and times
+importing app.main (which builds the app and mounts the enabled routers), then
+running the app's lifespan startup. By default startup runs with
+AUTO_MIGRATE off, as in a deploy that runs `python -m app.migrate`
+separately. The probe also reports any module that should only load on first
+use (LAZY_MODULES), and whether the adapter thread pool was created.
+
+    python startupbench.py --runs 10
+    python startupbench.py --runs 10 --auto-migrate
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Loaded on first use (LLM call, adapter fetch, Parquet export, ASYNC_MODE), never by a cold start
+LAZY_MODULES = (
+    "requests", "httpx", "pyarrow", "aiosqlite",
+    "app.adapters.county", "app.adapters.listing", "app.adapters.hoa", "app.adapters.fixtures",
+)
+
+PROBE = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+async def startup():
+    async with app.main.app.router.lifespan_context(app.main.app):
+        pass
+
+asyncio.run(startup())
+started = time.perf_counter()
+adapters = sys.modules.get("app.adapters")
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "startup_ms": (started - imported) * 1000,
+    "lazy_loaded": [m for m in %r if m in sys.modules],
+    "loaded": sorted(m for m in sys.modules if m.startswith("app.")),
+    "adapter_pool": adapters is not None and adapters._pool is not None,
+}))
+""" % (LAZY_MODULES,)
+
+
+def measure(auto_migrate: bool = False, **settings_env: str) -> dict:
+    """One cold start in a fresh interpreter against a scratch database; `settings_env` overrides settings."""
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{tempfile.mkdtemp()}/startup.db",
+        AUTO_MIGRATE=str(auto_migrate).lower(),
+        ASYNC_MODE="false",
+        SHARD_COUNT="0",
+        **settings_env,
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE], env=env, check=True, capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--auto-migrate", action="store_true", help="run schema setup during startup")
+    args = parser.parse_args()
+
+    runs = [measure(args.auto_migrate) for _ in range(args.runs)]
+    for key in ("import_ms", "startup_ms"):
+        values = [run[key] for run in runs]
+        print(f"{key:>10}: median {statistics.median(values):7.1f}  min {min(values):7.1f}  max {max(values):7.1f}")
+    leaked = sorted({m for run in runs for m in run["lazy_loaded"]})
+    print(f"lazy modules loaded at start: {', '.join(leaked) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Admission control: per-client token buckets (429) and per-route-class
+concurrency caps (503), both with Retry-After.
+"""
+import pytest
+from app.admission import TokenBucket, client_key, controller
+from app.config import settings
+from app.metrics import ADMISSION_REQUESTS
+
+
+@pytest.fixture(autouse=True)
+def fresh_buckets():
+    # Buckets keep the capacity they were created with; don't hand small ones to later modules
+    controller.buckets.clear()
+    yield
+    controller.buckets.clear()
+
+
+def test_token_bucket_refills_at_rate():
+    bucket = TokenBucket(rate=2.0, capacity=2, now=0.0)
+    assert bucket.take(0.0) == 0
+    assert bucket.take(0.0) == 0
+    assert bucket.take(0.0) == pytest.approx(0.5)
+    assert bucket.take(0.5) == 0
+
+
+def test_rate_limit_per_api_key(client, monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_BURST", 2)
+    monkeypatch.setattr(settings, "ADMISSION_API_KEYS", "test-rate-limit,other")
+    headers = {"X-API-Key": "test-rate-limit"}
+    before = ADMISSION_REQUESTS.value(route_class="ingest", result="rate_limited")
+
+    for _ in range(2):
+        assert client.post("/properties/ingest", json={"address": "1 Admission Way"}, headers=headers).status_code == 201
+    response = client.post("/properties/ingest", json={"address": "1 Admission Way"}, headers=headers)
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    assert ADMISSION_REQUESTS.value(route_class="ingest", result="rate_limited") == before + 1
+
+    # Another key has its own bucket.
+    other = client.post("/properties/ingest", json={"address": "1 Admission Way"}, headers={"X-API-Key": "other"})
+    assert other.status_code == 201
+
+
+def test_concurrency_cap_returns_503(client, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_CONCURRENT_INGEST", 1)
+    assert controller.acquire("ingest")
+    try:
+        response = client.post("/properties/ingest", json={"address": "2 Admission Way"}, headers={"X-API-Key": "busy"})
+    finally:
+        controller.release("ingest")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+def test_unknown_keys_share_the_peer_bucket(client, monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_BURST", 2)
+    monkeypatch.setattr(settings, "ADMISSION_API_KEYS", "known")
+    statuses = [
+        client.post("/properties/ingest", json={"address": "3 Admission Way"}, headers={"X-API-Key": f"random-{n}"}).status_code
+        for n in range(3)
+    ]
+    assert statuses == [201, 201, 429]
+
+
+def test_overloaded_request_keeps_its_rate_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_BURST", 1)
+    monkeypatch.setattr(settings, "MAX_CONCURRENT_INGEST", 1)
+    assert controller.acquire("ingest")
+    try:
+        assert client.post("/properties/ingest", json={"address": "4 Admission Way"}).status_code == 503
+    finally:
+        controller.release("ingest")
+    assert client.post("/properties/ingest", json={"address": "4 Admission Way"}).status_code == 201
+
+
+def test_client_key_trusts_forwarded_for_only_from_configured_proxies(monkeypatch):
+    def scope(peer, forwarded=None):
+        headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+        return {"client": (peer, 50000), "headers": headers}
+
+    # Default: the peer, whatever the header claims
+    assert client_key(scope("10.0.0.5", "203.0.113.7")) == "ip:10.0.0.5"
+
+    monkeypatch.setattr(settings, "ADMISSION_TRUSTED_PROXIES", "10.0.0.0/24, 192.0.2.1")
+    assert client_key(scope("10.0.0.5", "203.0.113.7")) == "ip:203.0.113.7"
+    # Hops are read right to left through trusted proxies; a client-supplied leftmost entry is ignored
+    assert client_key(scope("10.0.0.5", "198.51.100.1, 203.0.113.7, 192.0.2.1")) == "ip:203.0.113.7"
+    # Untrusted peers cannot pick their bucket
+    assert client_key(scope("198.51.100.9", "203.0.113.7")) == "ip:198.51.100.9"
+    assert client_key(scope("10.0.0.5")) == "ip:10.0.0.5"
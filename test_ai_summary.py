@@ -0,0 +1,52 @@
+"""
+AI summary fallback: LLM transport failures surface as LLMRequestError from both clients.
+"""
+import asyncio
+
+import httpx
+import pytest
+import requests
+from app import utils
+from app.config import settings
+from app.utils import LLMRequestError, acall_llm_topics
+
+
+@pytest.fixture
+def api_key(monkeypatch):
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(settings, "ADMISSION_ENABLED", False)  # keep the shared ingest bucket for later modules
+
+
+class _Response:
+    status_code = 503
+    text = "upstream overloaded"
+
+    def raise_for_status(self):
+        raise requests.exceptions.HTTPError("503 Server Error", response=self)
+
+
+def test_transport_failures_fall_back_with_details(client, api_key, monkeypatch):
+    property_id = client.post("/properties/ingest", json={"address": "123 Main Street"}).json()["id"]
+
+    monkeypatch.setattr(requests, "post", lambda *args, **kwargs: _Response())
+    body = client.post(f"/properties/{property_id}/ai_summary", json={}).json()
+    assert body["source"] == "rule_based_fallback"
+    assert body["error_details"]["error_type"] == "request_exception"
+    assert body["error_details"]["status_code"] == 503
+    assert body["error_details"]["response_text"] == "upstream overloaded"
+
+    def refuse(*args, **kwargs):
+        raise requests.exceptions.ConnectionError("connection refused")
+    monkeypatch.setattr(requests, "post", refuse)
+    body = client.post(f"/properties/{property_id}/ai_summary", json={}).json()
+    assert body["error_details"]["error_type"] == "request_exception"
+    assert body["error_details"]["status_code"] is None
+
+
+def test_async_client_raises_llm_request_error(api_key, monkeypatch):
+    transport = httpx.MockTransport(lambda request: httpx.Response(429, text="slow down"))
+    monkeypatch.setattr(utils, "_async_llm_client", httpx.AsyncClient(transport=transport))
+    with pytest.raises(LLMRequestError) as raised:
+        asyncio.run(acall_llm_topics("prompt"))
+    assert (raised.value.status_code, raised.value.response_text) == (429, "slow down")
+    assert isinstance(raised.value.__cause__, httpx.HTTPStatusError)
@@ -0,0 +1,44 @@
+"""
+Brief change feed: one sequenced entry per brief write that changed fields.
+"""
+import uuid
+
+from sqlmodel import Session
+from app.brief import merge_sources_for_property
+from app.crud import create_or_update_property, upsert_source_datum
+from app.deps import engine
+from app.querystats import assert_max_queries
+
+
+def _changes(client, after):
+    body = client.get("/briefs/changes", params={"after": after}).json()
+    return body["data"], body["next_after"]
+
+
+def test_changes_are_sequenced_and_only_written_on_change(client):
+    _, start = _changes(client, 0)
+    while True:  # skip entries left by other test modules sharing the database
+        page, nxt = _changes(client, start)
+        if not page:
+            break
+        start = nxt
+
+    address = f"{uuid.uuid4().hex[:8]} Change Court"  # new to the shared database, so its first merge is a change
+    with Session(engine) as session:
+        property_id = create_or_update_property(session, address.lower(), address).id
+        upsert_source_datum(session, property_id, "county", {"square_feet": 1200, "bedrooms": 2})
+        merge_sources_for_property(session, property_id)
+    page, after = _changes(client, start)
+    assert [c["property_id"] for c in page] == [property_id]
+    assert "square_feet" in page[0]["changed_fields"]
+    assert after == page[0]["seq"] > start
+
+    # Same source data again: brief rewritten, but nothing for consumers to sync.
+    with Session(engine) as session:
+        merge_sources_for_property(session, property_id)
+    assert _changes(client, after) == ([], after)
+
+
+def test_changes_query_budget(client):
+    with assert_max_queries(1):
+        assert client.get("/briefs/changes", params={"after": 0, "limit": 50}).status_code == 200
@@ -0,0 +1,69 @@
+"""
+Brief history: per-field deltas plus periodic snapshots answer as_of reads and field timelines.
+"""
+import uuid
+
+from sqlmodel import Session, delete, func, select, update
+from app.config import settings
+from app.crud import bulk_upsert_briefs, create_or_update_brief, create_or_update_property
+from app.deps import engine
+from app.models import Brief, BriefHistory
+from app.utils import now_utc
+
+
+def _property():
+    address = f"{uuid.uuid4().int % 100000} History Lane"
+    with Session(engine) as session:
+        return create_or_update_property(session, address.lower(), address).id
+
+
+def test_as_of_rebuilds_every_version_from_bounded_deltas(client, monkeypatch):
+    monkeypatch.setattr(settings, "BRIEF_SNAPSHOT_EVERY", 3)
+    property_id = _property()
+    versions = []  # (moment just after the write, fields then)
+    with Session(engine) as session:
+        before = now_utc()
+        for n in range(8):
+            data = {"address": "1 History Lane", "square_feet": 1000 + n, "_metadata": {"n": n}}
+            if n % 3:
+                data["zoning"] = f"R-{n}"  # dropped again on every third write
+            if n < 4:
+                create_or_update_brief(session, property_id, data, 50)
+            else:
+                bulk_upsert_briefs(session, {property_id: (data, 50)})
+                session.commit()
+            versions.append((now_utc(), {k: v for k, v in data.items() if k != "_metadata"}))
+        snapshots = session.exec(select(func.count()).where(
+            BriefHistory.property_id == property_id, BriefHistory.snapshot.is_not(None))).one()
+    assert snapshots == 3  # writes 1, 4 and 7
+
+    for moment, expected in versions:
+        body = client.get(f"/properties/{property_id}/brief", params={"as_of": moment.isoformat()}).json()
+        assert body["data"] == expected
+    resp = client.get(f"/properties/{property_id}/brief", params={"as_of": versions[2][0].isoformat(), "fields": "zoning"})
+    assert resp.json()["data"] == {"zoning": "R-2"}
+    assert client.get(f"/properties/{property_id}/brief", params={"as_of": before.isoformat()}).status_code == 404
+
+    body = client.get(f"/properties/{property_id}/brief/history", params={"field": "zoning", "limit": 4}).json()
+    assert [(e["changes"], e["removed"]) for e in body["data"]] == [
+        ({"zoning": "R-1"}, []), ({"zoning": "R-2"}, []), ({}, ["zoning"]), ({"zoning": "R-4"}, [])
+    ]
+    rest = client.get(f"/properties/{property_id}/brief/history",
+                      params={"field": "zoning", "after": body["next_after"]}).json()["data"]
+    assert [e["version"] for e in rest] == [6, 7, 8]
+
+
+def test_brief_without_history_gets_a_baseline_snapshot(client):
+    property_id = _property()
+    with Session(engine) as session:
+        create_or_update_brief(session, property_id, {"square_feet": 900}, 50)
+        # As written before history existed
+        session.exec(delete(BriefHistory).where(BriefHistory.property_id == property_id))
+        session.exec(update(Brief).where(Brief.property_id == property_id).values(history_deltas=None))
+        session.commit()
+        between = now_utc()
+        create_or_update_brief(session, property_id, {"square_feet": 950}, 50)
+
+    resp = client.get(f"/properties/{property_id}/brief", params={"as_of": between.isoformat()})
+    assert resp.json()["data"] == {"square_feet": 900}
+    assert client.get(f"/properties/{property_id}/brief").json()["data"] == {"square_feet": 950}
@@ -0,0 +1,70 @@
+"""
+Brief cards and fallback summary text: built on brief writes, served in bulk by GET /properties/cards.
+"""
+import uuid
+
+from sqlmodel import Session, update
+from app.brief import merge_sources_for_property
+from app.config import settings
+from app.crud import bulk_upsert_briefs, create_or_update_brief, create_or_update_property, upsert_source_datum
+from app.deps import engine
+from app.metrics import BRIEF_MATERIALIZATIONS
+from app.models import Brief
+from app.querystats import assert_max_queries
+
+DATA = {
+    "address": "1 Card Court", "property_type": "Condo", "square_feet": 1800, "bedrooms": 2, "bathrooms": 2,
+    "listing_price": 345000, "hoa_fee": 250,
+    "_metadata": {"conflicts": [{"field": "square_feet", "values": {"county": 1750, "listing": 1800}}]},
+}
+
+
+def _property(session):
+    address = f"{uuid.uuid4().int % 100000} Card Court"
+    return create_or_update_property(session, address.lower(), address).id
+
+
+def test_cards_are_stored_on_write_and_served_in_one_query(client):
+    with Session(engine) as session:
+        first, second, unbuilt = (_property(session) for _ in range(3))
+        create_or_update_brief(session, first, DATA, 90)
+        bulk_upsert_briefs(session, {second: ({**DATA, "_metadata": {}}, 80), unbuilt: (DATA, 70)})
+        # As written before cards existed
+        session.exec(update(Brief).where(Brief.property_id == unbuilt).values(card=None, fallback_summary=None))
+        session.commit()
+
+    with assert_max_queries(2):  # cards, plus the one brief without a stored card
+        body = client.get("/properties/cards", params={"ids": f"{second},999999,{first},{unbuilt}"}).json()
+    assert [card["property_id"] for card in body["data"]] == [second, first, unbuilt]
+    assert body["missing"] == [999999]
+    assert body["data"][1] == {
+        "property_id": first, "address": "1 Card Court", "bedrooms": 2, "bathrooms": 2, "square_feet": 1800,
+        "hoa_fee": 250, "price": 345000, "completeness_score": 90, "dispute_count": 1,
+    }
+    assert body["data"][0]["dispute_count"] == 0
+    assert body["data"][2]["completeness_score"] == 70
+
+    # No OPENAI_API_KEY here, so the rule-based summary answers, from stored text or rebuilt
+    for property_id in (first, unbuilt):
+        summary = client.post(f"/properties/{property_id}/ai_summary", json={}).json()
+        assert summary["source"] == "rule_based_fallback"
+        assert summary["summary"] == (
+            "This Condo at 1 Card Court. features 1800 sq ft with 2 bedrooms and 2 bathrooms. with $250 monthly HOA fee."
+        )
+
+
+def test_stale_briefs_are_merged_before_their_cards_are_served(client, monkeypatch):
+    monkeypatch.setattr(settings, "LAZY_BRIEFS", True)
+    with Session(engine) as session:
+        property_id = _property(session)
+        upsert_source_datum(session, property_id, "county", {"square_feet": 1500, "bedrooms": 2})
+        merge_sources_for_property(session, property_id)
+        # A lazy source write: stored, not merged
+        upsert_source_datum(session, property_id, "listing", {"square_feet": 1500, "listing_price": 410000})
+
+    before = BRIEF_MATERIALIZATIONS.value(trigger="read")
+    card = client.get("/properties/cards", params={"ids": property_id}).json()["data"][0]
+    assert card["price"] == 410000
+    assert BRIEF_MATERIALIZATIONS.value(trigger="read") == before + 1
+    client.get("/properties/cards", params={"ids": property_id})
+    assert BRIEF_MATERIALIZATIONS.value(trigger="read") == before + 1
@@ -0,0 +1,68 @@
+"""
+Response compression: negotiated per Accept-Encoding, with weak ETags and Vary on compressed representations.
+"""
+import pytest
+from fastapi.testclient import TestClient
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import StreamingResponse
+from starlette.routing import Route
+from app.compression import CompressionMiddleware, choose_encoding
+from app.config import settings
+
+
+@pytest.fixture(scope="module")
+def property_id(client):
+    return client.post("/properties/ingest", json={"address": "123 Main Street"}).json()["id"]
+
+
+def test_choose_encoding():
+    assert choose_encoding("gzip;q=0.5, identity") == "gzip"
+    assert choose_encoding("gzip;q=0, br;q=0") is None
+    assert choose_encoding("") is None
+
+
+def test_compressed_brief_has_weak_etag_and_revalidates(client, property_id, monkeypatch):
+    monkeypatch.setattr(settings, "COMPRESSION_MIN_SIZE", 100)
+    url = f"/properties/{property_id}/brief"
+    plain = client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["vary"] == "Accept-Encoding"
+    strong = plain.headers["etag"]
+    assert not strong.startswith("W/")
+
+    gzipped = client.get(url, headers={"Accept-Encoding": "gzip"})
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.headers["etag"] == f"W/{strong}"
+    assert gzipped.headers["vary"] == "Accept-Encoding"
+    assert gzipped.json() == plain.json()
+
+    revalidated = client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == f"W/{strong}"
+    assert revalidated.headers["vary"] == "Accept-Encoding"
+
+    identity = client.get(url, headers={"Accept-Encoding": "identity", "If-None-Match": strong})
+    assert identity.status_code == 304
+    assert identity.headers["etag"] == strong
+    assert identity.headers["vary"] == "Accept-Encoding"
+
+
+def test_small_responses_are_not_compressed(client, property_id):
+    resp = client.get(f"/properties/{property_id}/brief", params={"fields": "address"},
+                      headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in resp.headers
+    assert not resp.headers["etag"].startswith("W/")
+
+
+def test_streamed_body_is_compressed_chunk_by_chunk():
+    def stream(request):
+        chunks = (b"x" * 2000 + b"\n" for _ in range(3))
+        return StreamingResponse(chunks, media_type="application/x-ndjson", headers={"ETag": '"v1"'})
+
+    streaming = Starlette(routes=[Route("/", stream)], middleware=[Middleware(CompressionMiddleware)])
+    resp = TestClient(streaming).get("/", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert "content-length" not in resp.headers
+    assert resp.headers["etag"] == 'W/"v1"'
+    assert resp.text == ("x" * 2000 + "\n") * 3
@@ -0,0 +1,89 @@
+"""
+Contribution review: accept re-merges the brief, reject, the keyset review queue and ContributionStats counters.
+"""
+import uuid
+
+import pytest
+from sqlmodel import Session
+from app.brief import merge_sources_for_property
+from app.config import settings
+from app.crud import create_or_update_property, get_brief, upsert_source_datum
+from app.deps import engine
+from app.metrics import BRIEF_MATERIALIZATIONS
+from app.models import Contribution
+from app.moderation import InvalidTransition, reject_contribution
+
+ADMIN = {"X-Admin-Token": "reviewer"}
+
+
+@pytest.fixture(autouse=True)
+def reviewer(monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "reviewer")
+
+
+def _property():
+    address = f"{uuid.uuid4().hex[:8]} review road"
+    with Session(engine) as session:
+        property_id = create_or_update_property(session, address, address).id
+        upsert_source_datum(session, property_id, "county", {"address": address, "square_feet": 2000, "bedrooms": 3})
+        merge_sources_for_property(session, property_id)
+    return property_id
+
+
+def _contribute(client, property_id, field, value):
+    body = {"field": field, "proposed_value": value, "reason": "recent renovation", "contributor": "owner"}
+    return client.post(f"/properties/{property_id}/contributions", json=body).json()["id"]
+
+
+def _summary(client, property_id):
+    rows = client.get(f"/properties/{property_id}/contributions/summary").json()
+    return {row["field"]: (row["pending"], row["accepted"], row["rejected"]) for row in rows}
+
+
+def test_accept_merges_into_the_brief_and_reject_does_not(client):
+    property_id = _property()
+    accepted = _contribute(client, property_id, "square_feet", "2450")
+    rejected = _contribute(client, property_id, "square_feet", "9999")
+    assert _summary(client, property_id) == {"square_feet": (2, 0, 0)}
+
+    assert client.post(f"/contributions/{accepted}/accept").status_code == 403
+    assert client.post(f"/contributions/{accepted}/accept", headers=ADMIN).json()["status"] == "accepted"
+    assert client.post(f"/contributions/{rejected}/reject", headers=ADMIN).json()["status"] == "rejected"
+    assert client.post(f"/contributions/{accepted}/reject", headers=ADMIN).status_code == 409
+    assert _summary(client, property_id) == {"square_feet": (0, 1, 1)}
+
+    # The accepted value is merged and stamped, so the read serves it without another merge
+    before = BRIEF_MATERIALIZATIONS.value(trigger="read")
+    data = client.get(f"/properties/{property_id}/brief").json()["data"]
+    assert BRIEF_MATERIALIZATIONS.value(trigger="read") == before
+    assert data["square_feet"] == 2450 and data["bedrooms"] == 3
+    assert data["_metadata"]["provenance"]["square_feet"] == "contribution"
+    with Session(engine) as session:
+        assert get_brief(session, property_id).version == 2
+
+
+def test_review_queue_keyset_pagination(client):
+    property_id = _property()
+    ids = [_contribute(client, property_id, "bedrooms", str(n)) for n in range(5)]
+    seen, cursor = [], None
+    while True:
+        params = {"status": "pending", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        body = client.get("/contributions", params=params).json()
+        seen += [c["id"] for c in body["data"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+    assert [i for i in seen if i in ids] == ids and len(seen) == len(set(seen))
+    assert client.get("/contributions", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_review_of_a_stale_pending_row_loses_to_the_first(client):
+    property_id = _property()
+    contribution_id = _contribute(client, property_id, "bedrooms", "4")
+    with Session(engine) as session:
+        stale = session.get(Contribution, contribution_id)  # loaded while still pending
+        assert client.post(f"/contributions/{contribution_id}/accept", headers=ADMIN).status_code == 200
+        with pytest.raises(InvalidTransition):
+            reject_contribution(session, stale)
+        assert stale.status == "accepted"
+    assert _summary(client, property_id) == {"bedrooms": (0, 1, 0)}
@@ -0,0 +1,79 @@
+"""
+Field dispute store: brief merges open, resolve and reopen FieldIssue rows and keep the counters in step.
+"""
+import uuid
+
+from sqlmodel import Session, text
+from app.brief import merge_properties, merge_sources_for_property
+from app.crud import create_or_update_property, upsert_source_datum
+from app.deps import engine
+
+
+def _property(session, county_sqft, listing_sqft):
+    address = f"{uuid.uuid4().hex[:8]} dispute lane"
+    property_id = create_or_update_property(session, address, address).id
+    upsert_source_datum(session, property_id, "county", {"square_feet": county_sqft})
+    upsert_source_datum(session, property_id, "listing", {"square_feet": listing_sqft})
+    return property_id
+
+
+def _counts(client):
+    rows = client.get("/disputes/counts", params={"field": "square_feet", "source": "listing"}).json()["data"]
+    row = next((r for r in rows if r["sources"] == ["county", "listing"]), {"open": 0, "total": 0})
+    return row["open"], row["total"]
+
+
+def _issues(client, property_id, status="open"):
+    data = client.get("/disputes", params={"field": "square_feet", "status": status, "limit": 500}).json()["data"]
+    return [issue for issue in data if issue["property_id"] == property_id]
+
+
+def test_merges_open_resolve_and_reopen_issues(client):
+    open_before, total_before = _counts(client)
+    with Session(engine) as session:
+        property_id = _property(session, 2000, 2400)
+        merge_sources_for_property(session, property_id)
+    [issue] = _issues(client, property_id)
+    assert issue["values"] == {"county": 2000, "listing": 2400}
+    assert _counts(client) == (open_before + 1, total_before + 1)
+
+    with Session(engine) as session:
+        upsert_source_datum(session, property_id, "listing", {"square_feet": 2050})
+        merge_sources_for_property(session, property_id)
+    assert _issues(client, property_id) == []
+    assert [i["id"] for i in _issues(client, property_id, "resolved")] == [issue["id"]]
+    assert _counts(client) == (open_before, total_before + 1)
+
+    # The bulk merge path reopens the same row
+    with Session(engine) as session:
+        upsert_source_datum(session, property_id, "listing", {"square_feet": 3000})
+        merge_properties(session, [property_id])
+        session.commit()
+    [reopened] = _issues(client, property_id)
+    assert reopened["id"] == issue["id"] and reopened["values"]["listing"] == 3000
+    assert _counts(client) == (open_before + 1, total_before + 2)
+
+
+def test_disputes_keyset_pagination(client):
+    with Session(engine) as session:
+        ids = [_property(session, 1000, 2000) for _ in range(3)]
+        merge_properties(session, ids)
+        session.commit()
+    seen, after = [], 0
+    while True:
+        body = client.get("/disputes", params={"source": "county", "after": after, "limit": 2}).json()
+        if not body["data"]:
+            break
+        seen += [issue["property_id"] for issue in body["data"]]
+        after = body["next_after"]
+    assert set(ids) <= set(seen) and len(seen) == len(set(seen))
+
+
+def test_source_only_listing_walks_the_status_index():
+    with Session(engine) as session:
+        plan = session.exec(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM fieldissue WHERE status = 'open' AND id > 0 "
+            "AND sources LIKE '%,county,%' ORDER BY id LIMIT 50"
+        )).all()
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_fieldissue_status_id" in details and "TEMP B-TREE" not in details
@@ -0,0 +1,35 @@
+"""
+Fixture-backed adapters: generated data files answer adapter lookups by normalized address.
+"""
+import os
+import tempfile
+
+from app.adapters import county, listing, neighborhood
+from app.adapters.fixtures import FixtureStore, generate, iter_addresses
+from app.config import settings
+from app.crud import field_conflicts
+from app.utils import merge_source_data, normalize_address
+
+
+def test_generated_fixture_lookups_and_conflicts(monkeypatch):
+    path = os.path.join(tempfile.mkdtemp(), "fixtures.hkfx")
+    stats = generate(path, 2000, seed=1, listing_rate=1.0, conflict_rate=0.25)
+    assert stats["listing"] == 2000
+    assert 400 < stats["conflicts"] < 600
+
+    store = FixtureStore(path)
+    conflicts = 0
+    for address in iter_addresses(2000):
+        normalized = normalize_address(address)
+        county_data, listing_data = store.get("county", normalized), store.get("listing", normalized)
+        assert county_data["address"] == address
+        merged = merge_source_data({"county": county_data, "listing": listing_data})
+        conflicts += bool(field_conflicts(merged))
+    assert conflicts == stats["conflicts"]
+    assert store.get("county", "1 nowhere street") is None
+
+    monkeypatch.setattr(settings, "ADAPTER_FIXTURE_PATH", path)
+    assert county.get_county_data("2 main street")["address"] == "2 Main Street"
+    assert listing.get_listing_data("2 main street") == store.get("listing", "2 main street")
+    assert neighborhood.fetch("2 main street") is not None
+    assert county.get_county_data("123 main street")["address"] == "123 Main Street"  # generated, not the sample
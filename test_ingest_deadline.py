@@ -0,0 +1,21 @@
+"""
+Deadline-bound ingest: slow adapters are reported as pending and merged later.
+"""
+from app.config import settings
+
+
+def test_slow_adapters_are_pending_then_merged(client, monkeypatch):
+    monkeypatch.setattr(settings, "MOCK_ADAPTER_LATENCY_MS", 200.0)
+    response = client.post("/properties/ingest", json={"address": "789 Pine Drive"}, headers={"X-Deadline-Ms": "20"})
+    assert response.status_code == 201
+    assert response.json()["pending_sources"] == ["county", "hoa", "listing"]
+
+    # TestClient runs background tasks before returning, so the stragglers are merged by now.
+    brief = client.get(f"/properties/{response.json()['id']}/brief").json()
+    assert brief["data"]["address"] == "789 Pine Drive"
+    assert "pending_sources" not in brief["data"]["_metadata"]
+
+
+def test_no_pending_sources_within_deadline(client):
+    response = client.post("/properties/ingest", json={"address": "789 Pine Drive"}, headers={"X-Deadline-Ms": "5000"})
+    assert response.json()["pending_sources"] == []
@@ -0,0 +1,77 @@
+"""
+Item search: FTS5 index kept in step by triggers, bm25 ranking and keyset pagination.
+"""
+import uuid
+from datetime import datetime, timedelta
+
+from sqlmodel import Session, update
+from app.config import settings
+from app.deps import engine
+from app.models import Item
+
+
+def _pages(client, **params):
+    ids, cursor = [], None
+    while True:
+        query = dict(params, limit=2, **({"cursor": cursor} if cursor else {}))
+        body = client.get("/items", params=query).json()
+        ids += [item["id"] for item in body["data"]]
+        cursor = body["meta"]["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_search_ranks_title_hits_and_pages_by_cursor(client):
+    word = "zq" + uuid.uuid4().hex[:6]
+    body_hit = client.post("/items", json={"title": "notes", "body": f"mentions {word} once"}).json()["id"]
+    title_hit = client.post("/items", json={"title": f"{word} report", "body": ""}).json()["id"]
+    others = [client.post("/items", json={"title": f"{word} {n}", "body": f"{word}"}).json()["id"] for n in range(3)]
+    client.post("/items", json={"title": "unrelated", "body": "nothing here"})
+
+    ranked = _pages(client, q=word)
+    assert sorted(ranked) == sorted([body_hit, title_hit, *others])
+    assert ranked.index(title_hit) < ranked.index(body_hit)
+    assert _pages(client, q=word, sort="recent") == sorted(ranked, reverse=True)
+    assert _pages(client, q=word[:-2])[:1] != []  # last word matches as a prefix
+
+    resp = client.get("/items", params={"q": word, "count": "true"}).json()
+    assert resp["meta"]["total"] == 5
+    assert client.get("/items", params={"q": word}).json()["meta"]["total"] is None
+
+
+def test_matches_older_than_the_rank_window_follow_it(client, monkeypatch):
+    monkeypatch.setattr(settings, "SEARCH_RANK_WINDOW", 3)
+    word = "zq" + uuid.uuid4().hex[:6]
+    ids = [client.post("/items", json={"title": f"{word} {n}", "body": word * (n % 2)}).json()["id"] for n in range(6)]
+
+    paged = _pages(client, q=word)
+    assert sorted(paged[:3]) == ids[3:]  # the window, ranked
+    assert paged[3:] == ids[2::-1]  # then the rest, newest first
+    assert client.get("/items", params={"q": word, "count": "true"}).json()["meta"]["total"] == len(paged)
+
+
+def test_index_follows_updates_and_deletes(client):
+    word, renamed = "zq" + uuid.uuid4().hex[:6], "zq" + uuid.uuid4().hex[:6]
+    item_id = client.post("/items", json={"title": word}).json()["id"]
+    client.put(f"/items/{item_id}", json={"title": renamed, "body": ""})
+    assert _pages(client, q=word) == []
+    assert _pages(client, q=renamed) == [item_id]
+    client.delete(f"/items/{item_id}")
+    assert _pages(client, q=renamed) == []
+
+
+def test_items_without_q_page_newest_first_by_created_at(client):
+    first, second, third = (client.post("/items", json={"title": f"dated {n}"}).json()["id"] for n in range(3))
+    later = datetime.utcnow() + timedelta(days=365)
+    with Session(engine) as session:
+        # An older row created later (e.g. imported), and a created_at tie broken by id
+        session.exec(update(Item).where(Item.id == first).values(created_at=later + timedelta(seconds=1)))
+        session.exec(update(Item).where(Item.id.in_([second, third])).values(created_at=later))
+        session.commit()
+    assert _pages(client)[:3] == [first, third, second]
+    assert client.get("/items", params={"cursor": "bogus"}).status_code == 400
+
+
+def test_query_syntax_is_treated_as_text(client):
+    assert client.get("/items", params={"q": 'a" OR NEAR( *'}).status_code == 200
+    assert client.get("/items", params={"q": "x", "cursor": "bogus"}).status_code == 400
@@ -0,0 +1,88 @@
+"""
+Lazy brief materialization: source writes leave the brief stale; reads and the compactor rebuild it.
+"""
+import threading
+
+from sqlmodel import Session
+from app import brief
+from app.config import settings
+from app.crud import get_brief, upsert_source_datum
+from app.deps import engine
+from app.materialize import Compactor, record_read, stale_properties
+from app.metrics import BRIEF_MATERIALIZATIONS
+from app.routers.webhooks import _refresh_in_background
+
+HEADERS = {"X-API-Key": "test-lazy-briefs"}
+
+
+def _write_source(property_id, zoning):
+    with Session(engine) as session:
+        upsert_source_datum(session, property_id, "county", {"address": "123 Main Street", "zoning": zoning})
+        return get_brief(session, property_id).version
+
+
+def test_source_write_marks_brief_stale_and_read_rebuilds(client, monkeypatch):
+    monkeypatch.setattr(settings, "LAZY_BRIEFS", True)
+    monkeypatch.setattr(settings, "ADMISSION_API_KEYS", HEADERS["X-API-Key"])
+    property_id = client.post("/properties/ingest", json={"address": "123 Main Street"}, headers=HEADERS).json()["id"]
+    first = client.get(f"/properties/{property_id}/brief")
+    etag = first.headers["etag"]
+
+    stored_version = _write_source(property_id, "R-2")
+    with Session(engine) as session:
+        assert property_id in stale_properties(session, [property_id])
+        assert get_brief(session, property_id).version == stored_version  # nothing merged on write
+
+    # The old ETag no longer matches: the stale brief is rebuilt before answering
+    before = BRIEF_MATERIALIZATIONS.value(trigger="read")
+    resp = client.get(f"/properties/{property_id}/brief", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["data"]["zoning"] == "R-2"
+    assert BRIEF_MATERIALIZATIONS.value(trigger="read") == before + 1
+
+    client.get(f"/properties/{property_id}/brief")
+    assert BRIEF_MATERIALIZATIONS.value(trigger="read") == before + 1
+
+
+def test_compactor_materializes_hot_stale_briefs(client, monkeypatch):
+    monkeypatch.setattr(settings, "LAZY_BRIEFS", True)
+    monkeypatch.setattr(settings, "ADMISSION_API_KEYS", HEADERS["X-API-Key"])
+    property_id = client.post("/properties/ingest", json={"address": "123 Main Street"}, headers=HEADERS).json()["id"]
+    record_read(property_id)
+    _write_source(property_id, "C-1")
+
+    before = BRIEF_MATERIALIZATIONS.value(trigger="compactor")
+    assert Compactor(interval=0).run_once() == 1
+    assert BRIEF_MATERIALIZATIONS.value(trigger="compactor") == before + 1
+
+    reads_before = BRIEF_MATERIALIZATIONS.value(trigger="read")
+    assert client.get(f"/properties/{property_id}/brief").json()["data"]["zoning"] == "C-1"
+    assert BRIEF_MATERIALIZATIONS.value(trigger="read") == reads_before
+
+
+def test_refresh_during_lazy_webhook_job_merges_itself(client, monkeypatch):
+    monkeypatch.setattr(settings, "LAZY_BRIEFS", True)
+    monkeypatch.setattr(settings, "ADMISSION_API_KEYS", HEADERS["X-API-Key"])
+    property_id = client.post("/properties/ingest", json={"address": "123 Main Street"}, headers=HEADERS).json()["id"]
+
+    fetching, release = threading.Event(), threading.Event()
+    fetch_source = brief.fetch_source
+
+    def slow_in_job(name, adapter, normalized):
+        if threading.current_thread() is job:
+            fetching.set()
+            release.wait(5)
+        return fetch_source(name, adapter, normalized)
+
+    monkeypatch.setattr(brief, "fetch_source", slow_in_job)
+    job = threading.Thread(target=_refresh_in_background, args=(property_id,))
+    job.start()
+    try:
+        assert fetching.wait(5)
+        resp = client.post(f"/properties/{property_id}/refresh", headers=HEADERS)
+        assert job.is_alive()  # the webhook job still holds its flight
+    finally:
+        release.set()
+        job.join(5)
+    assert resp.status_code == 200
+    assert resp.json()["completeness"] > 0
@@ -0,0 +1,60 @@
+"""
+Observability: /metrics exposition after real requests, and per-request query-count headers.
+"""
+import pytest
+from app.config import settings
+from app.querystats import assert_max_queries
+
+BRIEF_ROUTE = 'method="GET",route="/properties/{property_id}/brief",status="200"'
+
+
+@pytest.fixture(scope="module")
+def property_id(client):
+    return client.post("/properties/ingest", json={"address": "123 Main Street"}).json()["id"]
+
+
+def _samples(client):
+    """{'name{labels}': value} for every sample line in a /metrics scrape."""
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain")
+    samples = {}
+    for line in resp.text.splitlines():
+        if line and not line.startswith("#"):
+            name, _, value = line.rpartition(" ")
+            samples[name] = float(value)
+    return samples, resp.text
+
+
+def test_metrics_scrape_reports_request_histogram_and_counters(client):
+    before, _ = _samples(client)
+    property_id = client.post("/properties/ingest", json={"address": "456 Oak Avenue"}).json()["id"]
+    assert client.get(f"/properties/{property_id}/brief").status_code == 200
+    after, text = _samples(client)
+
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert "# TYPE admission_requests_total counter" in text
+    count = f"http_request_duration_seconds_count{{{BRIEF_ROUTE}}}"
+    inf_bucket = f'http_request_duration_seconds_bucket{{{BRIEF_ROUTE},le="+Inf"}}'
+    assert after[count] == before.get(count, 0) + 1
+    assert after[inf_bucket] == after[count]
+    assert after[f"http_request_duration_seconds_sum{{{BRIEF_ROUTE}}}"] > 0
+    buckets = [v for k, v in after.items() if k.startswith(f"http_request_duration_seconds_bucket{{{BRIEF_ROUTE},")]
+    assert buckets == sorted(buckets)  # cumulative
+
+    admitted = [k for k in after if k.startswith("admission_requests_total{") and 'result="admitted"' in k]
+    assert sum(after[k] for k in admitted) > sum(before.get(k, 0) for k in admitted)
+
+
+def test_query_count_headers_match_captured_queries(client, property_id, monkeypatch):
+    with assert_max_queries(2) as stats:
+        resp = client.get(f"/properties/{property_id}/brief")
+    assert int(resp.headers["x-db-query-count"]) == stats.count > 0
+    assert float(resp.headers["x-db-query-time-ms"]) >= 0
+
+    with pytest.raises(AssertionError, match="expected at most 0 queries"):
+        with assert_max_queries(0):
+            client.get(f"/properties/{property_id}/brief")
+
+    monkeypatch.setattr(settings, "QUERY_STATS_HEADERS", False)
+    assert "x-db-query-count" not in client.get(f"/properties/{property_id}/brief").headers
@@ -0,0 +1,70 @@
+"""
+Opt-in profiling: off unless an admin token or sample rate enables it, and capped at PROFILE_MAX_SECONDS.
+"""
+import os
+import pstats
+import tempfile
+import time
+
+import pytest
+from sqlmodel import Session, select
+from app.config import settings
+from app.deps import engine
+from app.profiling import profile_block, profile_path
+
+ADMIN = {"X-Profile": "pstats", "X-Admin-Token": "secret"}
+
+
+@pytest.fixture
+def profile_dir(monkeypatch):
+    path = tempfile.mkdtemp()
+    monkeypatch.setattr(settings, "PROFILE_DIR", path)
+    return path
+
+
+@pytest.fixture(scope="module")
+def property_id(client):
+    return client.post("/properties/ingest", json={"address": "123 Main Street"}).json()["id"]
+
+
+def test_profiling_is_off_unless_enabled(client, property_id, profile_dir, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "")
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 0.0)
+    resp = client.get(f"/properties/{property_id}/brief", headers=ADMIN)
+    assert resp.status_code == 200
+    assert "x-profile-id" not in resp.headers
+
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "other")
+    assert "x-profile-id" not in client.get(f"/properties/{property_id}/brief", headers=ADMIN).headers
+    assert os.listdir(profile_dir) == []
+
+
+def test_admin_request_stores_a_pstats_profile(client, property_id, profile_dir, monkeypatch):
+    monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+    resp = client.get(f"/properties/{property_id}/brief", headers=ADMIN)
+    assert resp.status_code == 200
+    assert resp.headers["x-profile-format"] == "pstats"
+    profile_id = resp.headers["x-profile-id"]
+
+    listed = client.get("/admin/profiles", headers={"X-Admin-Token": "secret"}).json()
+    assert [p["id"] for p in listed] == [profile_id]
+    stats = pstats.Stats(profile_path(profile_id, "pstats"))
+    assert any(name == "get_property_brief" for _, _, name in stats.stats)
+
+
+def test_pstats_profile_stops_at_max_seconds(profile_dir, monkeypatch):
+    monkeypatch.setattr(settings, "PROFILE_MAX_SECONDS", 0.05)
+
+    def tick(session):
+        return session.exec(select(1)).one()  # every statement is a checkpoint
+
+    calls = 0
+    with Session(engine) as session, profile_block("pstats", "capped") as profile_id:
+        end = time.perf_counter() + 0.3
+        while time.perf_counter() < end:
+            tick(session)
+            calls += 1
+    stats = pstats.Stats(profile_path(profile_id, "pstats"))
+    profiled_calls = next(s[1] for (_, _, name), s in stats.stats.items() if name == "tick")
+    # Only the first 0.05s of the 0.3s loop was recorded
+    assert 0 < profiled_calls < calls / 2
@@ -0,0 +1,63 @@
+"""
+Pinned ai_summary prompt sizes. A change that makes prompts larger should
+show up here, and the pins should only be raised on purpose.
+"""
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from app.adapters.county import get_county_data
+from app.adapters.listing import get_listing_data
+from app.adapters.hoa import get_hoa_data
+from app.config import settings
+from app.prompts import build_summary_prompt, estimate_tokens, rank_contributions
+from app.utils import merge_source_data, _llm_request
+
+
+def _brief(address):
+    sources = {"county": get_county_data(address), "listing": get_listing_data(address), "hoa": get_hoa_data(address)}
+    return merge_source_data({name: data for name, data in sources.items() if data})
+
+
+def _contribution(i, status="pending", field="square_feet", reason="measured during renovation"):
+    return SimpleNamespace(
+        field=field, proposed_value=str(2700 + i), reason=reason, contributor=f"user{i}",
+        status=status, created_at=datetime(2025, 1, 1) + timedelta(hours=i),
+    )
+
+
+@pytest.mark.parametrize("address, max_tokens", [
+    ("123 main street", 140),
+    ("456 oak avenue", 185),
+    ("789 pine drive", 175),
+])
+def test_brief_prompt_size(address, max_tokens):
+    brief = _brief(address)
+    prompt = build_summary_prompt(brief)
+    assert estimate_tokens(prompt) <= max_tokens
+    # The old indent=2 JSON dump was more than twice as large.
+    assert estimate_tokens(prompt) * 2 < estimate_tokens(json.dumps(brief, indent=2))
+    assert "provenance" not in prompt and "merged_at" not in prompt
+
+
+def test_contributions_are_ranked_and_truncated_to_budget():
+    contributions = [_contribution(i, reason="x" * 500) for i in range(50)] + [_contribution(99, status="accepted")]
+    prompt = build_summary_prompt(_brief("123 main street"), contributions, max_tokens=300)
+    assert estimate_tokens(prompt) <= 300
+    lines = [line for line in prompt.splitlines() if line.startswith("- [")]
+    assert lines[0].startswith("- [accepted]")
+    assert 1 < len(lines) < 51
+    assert all(len(line) < 200 for line in lines)
+
+
+def test_duplicate_contributions_are_dropped():
+    same = [_contribution(0), _contribution(0)]
+    assert len(rank_contributions(same)) == 1
+
+
+def test_output_budget_is_independent_of_input(monkeypatch):
+    monkeypatch.setattr(settings, "OPENAI_API_KEY", "test")
+    _, short = _llm_request("tiny")
+    _, long = _llm_request("x" * 20000)
+    assert short["max_tokens"] == long["max_tokens"] == settings.SUMMARY_MAX_OUTPUT_TOKENS
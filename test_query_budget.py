@@ -0,0 +1,67 @@
+"""
+Query-count budgets per endpoint. Fails when a change adds queries to a hot
+path (e.g. an accidental N+1), so raise a budget only deliberately.
+"""
+import pytest
+from app.querystats import assert_max_queries
+
+
+@pytest.fixture(scope="module")
+def property_id(client):
+    property_id = client.post("/properties/ingest", json={"address": "123 Main Street"}).json()["id"]
+    client.post(f"/properties/{property_id}/contributions", json={
+        "field": "square_feet", "proposed_value": "2700", "reason": "renovation", "contributor": "budget"
+    })
+    return property_id
+
+
+def test_brief_query_budget(client, property_id):
+    with assert_max_queries(2):
+        assert client.get(f"/properties/{property_id}/brief").status_code == 200
+
+
+def test_sources_query_budget(client, property_id):
+    with assert_max_queries(2):
+        assert client.get(f"/properties/{property_id}/sources").status_code == 200
+
+
+def test_contributions_query_budget(client, property_id):
+    with assert_max_queries(2):
+        assert client.get(f"/properties/{property_id}/contributions").status_code == 200
+
+
+def test_ai_summary_query_budget(client, property_id):
+    with assert_max_queries(4):
+        assert client.post(f"/properties/{property_id}/ai_summary", json={}).status_code == 200
+
+
+def test_ingest_query_budget(client, property_id):
+    with assert_max_queries(22):
+        assert client.post("/properties/ingest", json={"address": "123 Main Street"}).status_code == 201
+
+
+def test_query_headers(client, property_id):
+    response = client.get(f"/properties/{property_id}/brief")
+    assert response.headers["x-db-query-count"] == "2"
+    assert float(response.headers["x-db-query-time-ms"]) >= 0
+
+
+def test_conditional_brief_is_answered_from_version_lookup(client, property_id):
+    etag = client.get(f"/properties/{property_id}/brief").headers["etag"]
+    with assert_max_queries(1):
+        response = client.get(f"/properties/{property_id}/brief", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+def test_conditional_sources_is_answered_from_version_lookup(client, property_id):
+    last_modified = client.get(f"/properties/{property_id}/sources").headers["last-modified"]
+    with assert_max_queries(1):
+        response = client.get(f"/properties/{property_id}/sources", headers={"If-Modified-Since": last_modified})
+    assert response.status_code == 304
+
+
+def test_sparse_brief_query_budget(client, property_id):
+    with assert_max_queries(2):
+        response = client.get(f"/properties/{property_id}/brief", params={"fields": "address,bedrooms"})
+    assert response.json()["data"] == {"address": "123 Main Street", "bedrooms": 3}
@@ -0,0 +1,73 @@
+"""
+Shared read cache: any worker serves stored responses until a committed write bumps the property's version.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+from app import sharedcache
+from app.brief import merge_sources_for_property
+from app.config import settings
+from app.crud import create_or_update_property, upsert_source_datum
+from app.deps import engine
+from app.main import app
+from app.metrics import CACHE_REQUESTS
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "SHARED_CACHE_PATH", os.path.join(tempfile.mkdtemp(), "cache.db"))
+    with TestClient(app) as c:
+        yield c
+
+
+def _property():
+    address = f"{uuid.uuid4().hex[:8]} cache court"
+    with Session(engine) as session:
+        property_id = create_or_update_property(session, address, address).id
+        upsert_source_datum(session, property_id, "county", {"address": address, "bedrooms": 3})
+        merge_sources_for_property(session, property_id)
+    return property_id
+
+
+def test_hits_until_a_committed_write_bumps_the_version(client):
+    property_id = _property()
+    first = client.get(f"/properties/{property_id}/brief")
+    hits = CACHE_REQUESTS.value(cache="brief", result="hit")
+    second = client.get(f"/properties/{property_id}/brief")
+    assert CACHE_REQUESTS.value(cache="brief", result="hit") == hits + 1
+    assert second.content == first.content and second.headers["etag"] == first.headers["etag"]
+    assert client.get(f"/properties/{property_id}/brief", headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+
+    # An uncommitted write changes nothing; the commit invalidates every cached variant
+    with Session(engine) as session:
+        upsert_source_datum(session, property_id, "county", {"bedrooms": 3, "zoning": "R-4"}, commit=False)
+        assert sharedcache.lookup(f"brief:{property_id}", property_id)[0] is not None
+        session.commit()
+    assert sharedcache.lookup(f"brief:{property_id}", property_id)[0] is None
+    assert "R-4" in client.get(f"/properties/{property_id}/sources").text
+    assert client.get(f"/properties/{property_id}/brief").json()["data"]["zoning"] == "R-4"
+
+
+def test_other_processes_share_entries_and_invalidation(client):
+    property_id = _property()
+    body = client.get(f"/properties/{property_id}/brief").content
+
+    # Another worker on the host reads the entry, then bumps the version as its own write would
+    script = (
+        "from app import sharedcache;"
+        f"entry, _ = sharedcache.lookup('brief:{property_id}', {property_id});"
+        f"assert entry.body == {body!r};"
+        f"sharedcache.bump([{property_id}])"
+    )
+    env = dict(os.environ, SHARED_CACHE_PATH=settings.SHARED_CACHE_PATH)
+    subprocess.run([sys.executable, "-c", script], env=env, check=True)
+
+    misses = CACHE_REQUESTS.value(cache="brief", result="miss")
+    assert client.get(f"/properties/{property_id}/brief").content == body
+    assert CACHE_REQUESTS.value(cache="brief", result="miss") == misses + 1
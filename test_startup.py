@@ -0,0 +1,27 @@
+"""
+Cold start budget: importing and building the app, then starting it, in a fresh interpreter.
+
+The budgets are loose enough for a slow CI machine (override with
+STARTUP_IMPORT_BUDGET_MS / STARTUP_BUDGET_MS); the lazy-module check is exact.
+"""
+import os
+
+from startupbench import measure
+
+IMPORT_BUDGET_MS = float(os.environ.get("STARTUP_IMPORT_BUDGET_MS", 2500))
+STARTUP_BUDGET_MS = float(os.environ.get("STARTUP_BUDGET_MS", 250))
+
+
+def test_cold_start_within_budget_and_lazy():
+    run = min((measure() for _ in range(2)), key=lambda r: r["import_ms"])
+    assert run["lazy_loaded"] == []
+    assert not run["adapter_pool"]
+    assert run["import_ms"] < IMPORT_BUDGET_MS, run
+    assert run["startup_ms"] < STARTUP_BUDGET_MS, run
+
+
+def test_disabled_features_are_not_imported():
+    run = measure(ADMIN_TOKEN="", PROFILE_SAMPLE_RATE="0", COMPRESSION_ENABLED="false", METRICS_ENABLED="false")
+    for module in ("app.routers.admin", "app.routers.metrics", "app.compression"):
+        assert module not in run["loaded"]
+    assert "app.routers.admin" in measure(ADMIN_TOKEN="secret")["loaded"]
@@ -0,0 +1,61 @@
+"""
+Batch push webhook: signed arrays of inline source payloads, upserted in one transaction and merged once.
+"""
+import hashlib
+import hmac
+import json
+import uuid
+
+from sqlmodel import Session
+from app.config import settings
+from app.crud import create_or_update_property
+from app.deps import engine
+from app.routers.webhooks import WEBHOOK_SECRET
+
+
+def _post(client, updates, secret=WEBHOOK_SECRET):
+    raw = json.dumps(updates).encode()
+    signature = hmac.new(secret, raw, hashlib.sha256).hexdigest()
+    return client.post("/webhooks/source-batch", content=raw, headers={"X-Signature": signature})
+
+
+def test_batch_upserts_payloads_and_merges_affected_properties(client):
+    known = f"{uuid.uuid4().hex[:8]} Push Street"
+    with Session(engine) as session:
+        property_id = create_or_update_property(session, known.lower(), known).id
+    new_address = f"{uuid.uuid4().hex[:8]} Push Street"
+
+    resp = _post(client, [
+        {"property_id": property_id, "source_name": "county", "payload": {"square_feet": 1000, "bedrooms": 2}},
+        {"property_id": property_id, "source_name": "listing", "payload": {"square_feet": 1500}},
+        {"property_id": property_id, "source_name": "county", "payload": {"square_feet": 1000, "bedrooms": 3}},
+        {"address": new_address, "source_name": "hoa", "payload": {"hoa_fee": 120}},
+        {"property_id": 10 ** 9, "source_name": "county", "payload": {}},
+    ])
+    assert resp.status_code == 200
+    assert resp.json() == {"status": "applied", "updates": 3, "properties": 2, "unknown_property_ids": [10 ** 9]}
+
+    brief = client.get(f"/properties/{property_id}/brief").json()["data"]
+    assert brief["bedrooms"] == 3 and brief["square_feet"] == 1500  # last county payload wins; listing outranks county
+    assert [c["field"] for c in brief["_metadata"]["conflicts"]] == ["square_feet"]
+
+    new_id = client.post("/properties/ingest", json={"address": new_address}).json()["id"]
+    assert client.get(f"/properties/{new_id}/sources").json()[0]["data"] == {"hoa_fee": 120}
+
+
+def test_batch_rejects_bad_signatures_and_bodies(client):
+    update = {"property_id": 1, "source_name": "county", "payload": {}}
+    assert _post(client, [update], secret=b"wrong").status_code == 401
+    assert _post(client, [dict(update, source_name="contribution")]).status_code == 422
+    assert _post(client, [{"source_name": "county", "payload": {}}]).status_code == 422
+    assert _post(client, {"not": "a list"}).status_code == 422
+
+
+def test_batch_refuses_oversized_bodies_before_reading_them(client, monkeypatch):
+    monkeypatch.setattr(settings, "WEBHOOK_MAX_BYTES", 100)
+    updates = [{"property_id": 1, "source_name": "county", "payload": {"note": "x" * 200}}]
+    assert _post(client, updates).status_code == 413
+    # Chunked, with no Content-Length to check up front; refused while streaming, before the signature check
+    chunks = iter([b"[" + b" " * 60, b" " * 60 + b"]"])
+    assert client.post("/webhooks/source-batch", content=chunks, headers={"X-Signature": "bad"}).status_code == 413
+    assert _post(client, [{"property_id": 1, "source_name": "county", "payload": {}}]).status_code == 200